@@ -0,0 +1,43 @@
+"""Lexical and syntax analyzer for a small teaching language.
+
+    import analizador
+    result = analizador.analyze_source(text)
+
+Submodules are imported the first time one of their names is used, so importing the package is cheap.
+"""
+import importlib
+
+# funciones y clases principales de cada módulo, que se pueden usar desde el paquete (analizador.Parser); lo demás
+# se usa desde su módulo (analizador.lexer.scan_source). El paquete no importa nada al inicio: analizador.Parser
+# importa parser (y lo que este necesita) la primera vez que se pide, y el resto de los módulos (asyncio, sqlite3, el
+# grupo de procesos) no se cargan
+exports = {
+    'tokens': ('token_specs',),
+    'lexer': ('lexic_analyzer', 'iter_tokens', 'TokenTable', 'mmap_lexic_analyzer'),
+    'parallel': ('parallel_lexic_analyzer',),
+    'parser': ('Parser', 'analyze_source', 'analyze_stream', 'profile_source'),
+    'serial': ('dump', 'load', 'TokenFile', 'export_jsonl'),
+    'vm': ('CompileError', 'ExecutionError', 'compile_program', 'run_bytecode', 'optimize', 'run_source'),
+    'semantic': ('check_program', 'check_source'),
+    'incremental': ('IncrementalDocument',),
+    'cache': ('AnalysisCache',),
+    'batch': ('run_batch',),
+    'server': ('AnalysisServer', 'AnalysisService'),
+    'cli': ('main',),
+}
+export_modules = {name: module for module, names in exports.items() for name in names}
+__all__ = list(export_modules)
+
+def __getattr__(name):
+    # analizador.lexer, analizador.parser, etc. también se importan al pedirlos
+    if name in exports:
+        return importlib.import_module(f'.{name}', __name__)
+    module = export_modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(export_modules))
@@ -0,0 +1,121 @@
+"""Batch analysis of many files with a process pool."""
+import fnmatch
+import glob
+import os
+import sys
+import time
+
+from .parser import analyze_source
+
+# ANÁLISIS POR LOTES
+# analiza un grupo de archivos dentro de un proceso trabajador y devuelve un resumen de cada uno
+def analyze_files(file_paths, cache_path=None):
+    """Analyze a chunk of files, returning one summary dict per file"""
+    # el caché (sqlite3) y el grupo de procesos sólo se importan cuando se usan, así analizar un archivo desde un hook no
+    # los carga
+    if cache_path:
+        from .cache import AnalysisCache
+    cache = AnalysisCache(cache_path) if cache_path else None
+    summaries = []
+    try:
+        for file_path in file_paths:
+            summary = {'path': file_path, 'bytes': 0, 'tokens': 0, 'errors': [], 'syntax_errors': [],
+                       'parsed': False, 'read_error': None}
+            try:
+                with open(file_path, 'rb') as file:
+                    content = file.read()
+            except OSError as e:
+                summary['read_error'] = str(e)
+                summaries.append(summary)
+                continue
+            if cache:
+                result = cache.analyze(content)
+            else:
+                result = analyze_source(content.decode('utf-8', errors='replace'))
+            summary['bytes'] = len(content)
+            summary['tokens'] = len(result.get('tokens', ()))
+            summary['errors'] = result.get('errors', [])
+            summary['syntax_errors'] = result['syntax_errors']
+            summary['parsed'] = result['parsed']
+            summaries.append(summary)
+    finally:
+        if cache:
+            cache.close()
+    return summaries
+
+# convierte los argumentos (archivos, directorios o patrones glob) en la lista de archivos a analizar, sin repetidos
+def expand_paths(paths, pattern='*.txt'):
+    """Expand files, directories (recursively, filtered by pattern) and globs"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, subdirectories, files in os.walk(path):
+                subdirectories.sort()
+                found.extend(os.path.join(directory, name) for name in sorted(files) if fnmatch.fnmatch(name, pattern))
+        elif glob.has_magic(path):
+            found.extend(sorted(match for match in glob.glob(path, recursive=True) if os.path.isfile(match)))
+        else:
+            found.append(path)
+    return list(dict.fromkeys(found))
+
+# imprime el resultado de un archivo, devuelve verdadero si no tuvo errores
+def report_file(summary, quiet=False):
+    if summary['read_error']:
+        print(f"{summary['path']}: cannot read file: {summary['read_error']}")
+        return False
+    if summary['errors']:
+        print(f"{summary['path']}: lexical errors found")
+        for error in summary['errors']:
+            print(f"  Line {error['line']}: {error['error']}")
+    if summary['syntax_errors'] or not (summary['parsed'] or summary['errors']):
+        print(f"{summary['path']}: syntax errors found")
+        for error in summary['syntax_errors'] or ['Syntax error: invalid statement']:
+            print(f"  {error}")
+    if not summary['parsed']:
+        return False
+    if not quiet:
+        print(f"{summary['path']}: ok ({summary['tokens']} tokens)")
+    return True
+
+# análisis de muchos archivos en paralelo: se reparten en grupos entre procesos trabajadores y los resultados se muestran
+# conforme van terminando
+def run_batch(paths, jobs=None, chunksize=None, pattern='*.txt', cache_path=None, quiet=False):
+    """Analyze files in a process pool; returns the exit code (0 when every file is valid)"""
+    file_paths = expand_paths(paths, pattern)
+    if not file_paths:
+        print("No files to analyze.", file=sys.stderr)
+        return 2
+
+    jobs = jobs or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, min(64, len(file_paths) // (jobs * 4)))
+    chunks = [file_paths[index:index + chunksize] for index in range(0, len(file_paths), chunksize)]
+
+    start = time.perf_counter()
+    failed = 0
+    total_tokens = 0
+    total_bytes = 0
+
+    def collect(summaries):
+        nonlocal failed, total_tokens, total_bytes
+        for summary in summaries:
+            if not report_file(summary, quiet):
+                failed += 1
+            total_tokens += summary['tokens']
+            total_bytes += summary['bytes']
+
+    if jobs == 1 or len(chunks) == 1:
+        for chunk in chunks:
+            collect(analyze_files(chunk, cache_path))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(analyze_files, chunk, cache_path) for chunk in chunks]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"{len(file_paths)} files, {failed} with errors, {total_tokens} tokens, {total_bytes / 1e6:.2f} MB "
+          f"in {elapsed:.2f}s ({len(file_paths) / elapsed:.1f} files/s, {total_tokens / elapsed:.0f} tokens/s)",
+          file=sys.stderr)
+    return 1 if failed else 0
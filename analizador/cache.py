@@ -0,0 +1,148 @@
+"""On-disk cache of analysis results keyed by content hash."""
+import hashlib
+import inspect
+import json
+import sqlite3
+import time
+import zlib
+
+from . import lexer, parser, tokens
+from .parser import analyze_source
+from .tokens import token_codes, token_types
+
+# versión del formato en que se guardan los resultados en el caché
+cache_format_version = 3
+
+# módulos de los que depende un resultado: token_specs, los escáneres y el parser con sus funciones auxiliares
+analyzer_modules = (tokens, lexer, parser)
+
+# huella del analizador: el hash del código fuente de los módulos de los que depende un resultado, así cualquier cambio en
+# ellos invalida el caché
+def analyzer_fingerprint():
+    """Hash of the source of the tokens, lexer and parser modules"""
+    digest = hashlib.sha256(f"format {cache_format_version}".encode())
+    for module in analyzer_modules:
+        source = inspect.getsource(module).encode('utf-8')
+        digest.update(f"{module.__name__}\0{len(source)}\0".encode())
+        digest.update(source)
+    return digest.hexdigest()
+
+# Caché persistente de resultados. La llave es el hash del contenido del archivo, así los archivos que no cambiaron se
+# responden sin analizarlos de nuevo. Los resultados se guardan comprimidos en una base de datos SQLite y, cuando se supera
+# el tamaño máximo, se eliminan los que llevan más tiempo sin usarse
+class AnalysisCache:
+    """On-disk, size-bounded LRU cache of analysis results keyed by content hash"""
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.fingerprint = analyzer_fingerprint()
+        self.hits = 0
+        self.misses = 0
+        # llaves leídas desde la última escritura y cuándo se leyeron: last_used se actualiza junto con la siguiente
+        # escritura (o al cerrar), así una lectura no abre una transacción ni bloquea a los demás procesos
+        self.used = {}
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, data BLOB NOT NULL, "
+            "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        # los resultados de otra versión de token_patterns o del parser ya no son válidos
+        self.connection.execute("DELETE FROM results WHERE fingerprint != ?", (self.fingerprint,))
+        self.connection.commit()
+
+    def key(self, content):
+        return hashlib.sha256(content).hexdigest()
+
+    # convierte un resultado a bytes: los tokens se guardan como columnas (líneas, tipos, valores) y todo se comprime
+    def encode(self, result):
+        record = {key: value for key, value in result.items() if key != 'tokens'}
+        if 'tokens' in result:
+            tokens = result['tokens']
+            record['lines'] = [token['line'] for token in tokens]
+            record['kinds'] = [token_codes[token['type']] for token in tokens]
+            record['values'] = [token['value'] for token in tokens]
+        return zlib.compress(json.dumps(record, separators=(',', ':')).encode('utf-8'))
+
+    def decode(self, data):
+        record = json.loads(zlib.decompress(data).decode('utf-8'))
+        if 'kinds' in record:
+            record['tokens'] = [
+                {'line': line, 'type': token_types[kind], 'value': value}
+                for line, kind, value in zip(record.pop('lines'), record.pop('kinds'), record.pop('values'))
+            ]
+        return record
+
+    def get(self, content):
+        """Cached result for content (bytes), or None"""
+        key = self.key(content)
+        row = self.connection.execute("SELECT data FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used[key] = time.time()
+        return self.decode(row[0])
+
+    def put(self, content, result):
+        data = self.encode(result)
+        self.touch()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results (key, fingerprint, data, size, last_used) VALUES (?, ?, ?, ?, ?)",
+            (self.key(content), self.fingerprint, data, len(data), time.time())
+        )
+        self.evict()
+        self.connection.commit()
+
+    # escribe el last_used de las llaves leídas desde la última escritura
+    def touch(self):
+        if self.used:
+            self.connection.executemany(
+                "UPDATE results SET last_used = ? WHERE key = ?", [(used, key) for key, used in self.used.items()]
+            )
+            self.used.clear()
+
+    # tamaño de todos los resultados guardados; se calcula de la base de datos porque otros procesos pueden escribir en ella
+    def total_bytes(self):
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    # elimina los resultados usados hace más tiempo hasta respetar el tamaño máximo
+    def evict(self):
+        total = self.total_bytes()
+        while total > self.max_bytes:
+            rows = self.connection.execute(
+                "SELECT key, size FROM results ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self.connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                total -= size
+
+    def analyze(self, content):
+        """Analyze content (bytes), serving it from the cache when possible"""
+        result = self.get(content)
+        if result is None:
+            result = analyze_source(content.decode('utf-8', errors='replace'))
+            self.put(content, result)
+        return result
+
+    def analyze_file(self, file_path):
+        with open(file_path, 'rb') as file:
+            return self.analyze(file.read())
+
+    def close(self):
+        if self.used:
+            self.touch()
+            self.connection.commit()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
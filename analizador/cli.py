@@ -0,0 +1,235 @@
+"""Command line interface."""
+import argparse
+import sys
+
+from .lexer import dfa_tables_path, getfromfile, lexic_analyzer
+from .parser import Parser
+
+# modo interactivo original: pide la ruta de un archivo, muestra la tabla de tokens y el resultado del análisis
+def interactive():
+    while True:  #Permite ejecutar todo una y otra vez sin volver a iniciar el programa
+        print("\n" + "="*50)
+        print("Language Processor - Enter file path or 'exit' to quit")
+        print("="*50)
+        
+        file_path = input("\nEnter the path to your code file: ").strip()
+        
+        # Para que el usuario indique si quiere salir del programa
+        if file_path.lower() == 'exit':
+            print("Exiting program...")
+            break
+        
+        # Lee el archivo a analizar y lo prepara para el análisis léxico
+        code_to_compile = getfromfile(file_path)
+        if not code_to_compile:
+            print("No code to analyze or file not found.")
+            continue
+        
+        # ANÁLISIS LÉXICO
+        # El lexer analiza el código
+        # con partial=True también se obtienen los tokens válidos cuando hay errores léxicos
+        lex_result = lexic_analyzer(code_to_compile, partial=True)
+        
+        # si hay errores los muestra, pero continúa con el análisis sintáctico de los tokens válidos
+        if 'errors' in lex_result:
+            print("\nLexical errors found:")
+            for error in lex_result['errors']:
+                print(f"Line {error['line']}: {error['error']}")
+        
+        # imprime la tabla de tokens
+        print("\nToken table:")
+        for token in lex_result['tokens']:
+            print(f"Line {token['line']}: {token['type']:20} -> {token['value']}")
+        
+        # ANÁLISIS SINTÁCTICO
+        print("\nStarting syntax analysis...")
+        # crea objeto de tipo parser y lo inicializa con la tabla de tokens obtenida del lexer; con recover=True el parser
+        # no se detiene en la primera sentencia inválida y reporta todos los errores
+        parser = Parser(lex_result['tokens'], recover=True)
+
+        # si la función parse() retorna verdadero, significa que no se encontró error alguno en el código
+        if parser.parse():
+            print("Syntax analysis completed successfully, no errors found")
+        else:
+            # de lo contrario, muestra los errores sintácticos que se encontraron
+            print("\nSyntax errors found:")
+            for error in parser.errors:
+                print(error)
+        
+        continues = input("\nPress enter to continue ")
+
+# error de un archivo que un comando no pudo leer o escribir: se muestra sin el traceback y el comando termina con código 1
+def file_error(error, path):
+    print(f"error: {error.filename or path}: {error.strerror or error}", file=sys.stderr)
+    return 1
+
+# punto de entrada: sin argumentos se usa el modo interactivo, con el comando batch se analizan muchos archivos a la vez.
+# Cada comando importa sólo los módulos que usa, así una invocación corta (un hook, un editor) no carga asyncio, sqlite3 o
+# el grupo de procesos cuando no los necesita
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(description="Lexical and syntax analyzer")
+    commands = argument_parser.add_subparsers(dest='command')
+    batch_command = commands.add_parser('batch', help="analyze many files without prompting")
+    batch_command.add_argument('paths', nargs='+', help="files, directories or glob patterns")
+    batch_command.add_argument('-j', '--jobs', type=int, default=None, help="worker processes (default: CPU count)")
+    batch_command.add_argument('--chunksize', type=int, default=None, help="files per task sent to a worker")
+    batch_command.add_argument('--pattern', default='*.txt', help="file name pattern used inside directories")
+    batch_command.add_argument('--cache', default=None, help="path of the on-disk result cache")
+    batch_command.add_argument('-q', '--quiet', action='store_true', help="only report files with errors")
+    profile_command = commands.add_parser('profile', help="show lexer and parser counters and timings for a file")
+    profile_command.add_argument('path', help="file to analyze")
+    profile_command.add_argument('--json', action='store_true', help="print the counters as JSON")
+    dump_command = commands.add_parser('dump', help="analyze a file and save the result in the binary format")
+    dump_command.add_argument('source', help="file to analyze")
+    dump_command.add_argument('output', help="path of the binary file")
+    dump_command.add_argument('--ast', action='store_true', help="also save the syntax tree")
+    jsonl_command = commands.add_parser('jsonl', help="export a binary result file as JSON Lines")
+    jsonl_command.add_argument('path', help="file written by the dump command")
+    serve_command = commands.add_parser('serve', help="answer JSON-RPC requests on stdin/stdout or a Unix socket")
+    serve_command.add_argument('--socket', default=None, help="path of a Unix socket to listen on instead of stdio")
+    serve_command.add_argument('--cache-size', type=int, default=128, help="analysis results kept in memory")
+    run_command = commands.add_parser('run', help="compile a valid program to bytecode and execute it")
+    run_command.add_argument('path', help="file to run")
+    run_command.add_argument('--disassemble', action='store_true', help="print the bytecode instead of running it")
+    run_command.add_argument('--max-instructions', type=int, default=None, help="stop runaway loops after N instructions")
+    run_command.add_argument('--no-optimize', action='store_true', help="compile the tree without the optimization pass")
+    optimize_command = commands.add_parser('optimize', help="list what the optimization pass changes in a file")
+    optimize_command.add_argument('path', help="file to analyze")
+    check_command = commands.add_parser('check', help="report undeclared names and type errors in a file")
+    check_command.add_argument('path', help="file to analyze")
+    check_command.add_argument('--symbols', action='store_true', help="also list every declared name and its slot")
+    service_command = commands.add_parser('service', help="asyncio analysis service backed by a process pool")
+    service_command.add_argument('--host', default='127.0.0.1', help="TCP address to listen on")
+    service_command.add_argument('--port', type=int, default=8765, help="TCP port to listen on")
+    service_command.add_argument('--socket', default=None, help="path of a Unix socket to listen on instead of TCP")
+    service_command.add_argument('-j', '--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    service_command.add_argument('--queue-size', type=int, default=64, help="analyses waiting for a worker")
+    service_command.add_argument('--timeout', type=float, default=30.0, help="default seconds allowed per request")
+    dfa_command = commands.add_parser('build-dfa', help="generate the DFA lexer tables from token_specs")
+    dfa_command.add_argument('--output', default=dfa_tables_path, help="path of the generated module")
+    arguments = argument_parser.parse_args(argv)
+
+    if arguments.command == 'batch':
+        from .batch import run_batch
+        return run_batch(arguments.paths, arguments.jobs, arguments.chunksize, arguments.pattern,
+                         arguments.cache, arguments.quiet)
+    if arguments.command == 'profile':
+        from .parser import profile_source
+        try:
+            with open(arguments.path, 'r', encoding='utf-8', errors='replace') as file:
+                text = file.read()
+        except OSError as e:
+            return file_error(e, arguments.path)
+        profile = profile_source(text)
+        print(profile.to_json() if arguments.json else profile.table())
+        return 0
+    if arguments.command == 'dump':
+        from .serial import dump
+        try:
+            with open(arguments.source, 'rb') as file:
+                content = file.read()
+        except OSError as e:
+            return file_error(e, arguments.source)
+        text = content.decode('utf-8', errors='replace')
+        result = lexic_analyzer(text, 'table', partial=True)
+        parser = Parser(result['tokens'], build_ast=arguments.ast, recover=True)
+        result['parsed'] = parser.parse() and 'errors' not in result
+        result['syntax_errors'] = parser.errors
+        result['ast'] = parser.ast
+        try:
+            dump(arguments.output, result, content)
+        except OSError as e:
+            return file_error(e, arguments.output)
+        return 0
+    if arguments.command == 'jsonl':
+        from .serial import export_jsonl
+        try:
+            export_jsonl(arguments.path, sys.stdout)
+        except OSError as e:
+            return file_error(e, arguments.path)
+        return 0
+    if arguments.command == 'serve':
+        from .server import AnalysisServer
+        server = AnalysisServer(arguments.cache_size)
+        if arguments.socket:
+            server.serve_unix(arguments.socket)
+        else:
+            server.serve_stream(sys.stdin, sys.stdout)
+        return 0
+    if arguments.command == 'run':
+        from .vm import compile_program, optimize, run_source
+        try:
+            with open(arguments.path, 'r', encoding='utf-8', errors='replace') as file:
+                text = file.read()
+        except OSError as e:
+            return file_error(e, arguments.path)
+        if arguments.disassemble:
+            result = lexic_analyzer(text, 'table', partial=True)
+            parser = Parser(result['tokens'], build_ast=True)
+            if 'errors' in result or not parser.parse():
+                print(f"{arguments.path}: the program has errors, run it without --disassemble to see them")
+                return 1
+            tree = parser.ast if arguments.no_optimize else optimize(parser.ast, result['tokens'])[0]
+            print(compile_program(tree, result['tokens']).disassemble())
+            return 0
+        result = run_source(text, max_instructions=arguments.max_instructions, optimize_tree=not arguments.no_optimize)
+        for error in result.get('errors', []):
+            print(f"Line {error['line']}: {error['error']}", file=sys.stderr)
+        for error in result['syntax_errors']:
+            print(error, file=sys.stderr)
+        if 'runtime_error' in result:
+            print(result['runtime_error'], file=sys.stderr)
+        return 0 if result['executed'] else 1
+    if arguments.command == 'optimize':
+        from .vm import optimize
+        try:
+            with open(arguments.path, 'r', encoding='utf-8', errors='replace') as file:
+                text = file.read()
+        except OSError as e:
+            return file_error(e, arguments.path)
+        result = lexic_analyzer(text, 'table', partial=True)
+        parser = Parser(result['tokens'], build_ast=True)
+        if 'errors' in result or not parser.parse():
+            print(f"{arguments.path}: the program has errors, it cannot be optimized")
+            return 1
+        _, changes = optimize(parser.ast, result['tokens'])
+        for change in changes:
+            print(f"Line {change['line']}: {change['change']}")
+        print(f"{len(changes)} change(s)")
+        return 0
+    if arguments.command == 'check':
+        from .semantic import check_source
+        try:
+            with open(arguments.path, 'r', encoding='utf-8', errors='replace') as file:
+                text = file.read()
+        except OSError as e:
+            return file_error(e, arguments.path)
+        result = check_source(text)
+        for error in result.get('errors', []):
+            print(f"Line {error['line']}: {error['error']}")
+        for error in result['syntax_errors'] + result['semantic_errors']:
+            print(error)
+        if arguments.symbols and result['parsed']:
+            for symbol in result['symbols']:
+                frame = 'global' if symbol.frame < 0 else result['names'][result['symbols'][symbol.frame].name]
+                print(f"Line {symbol.line}: {result['names'][symbol.name]:20} {symbol.kind:10} {symbol.type:7} "
+                      f"{frame} slot {symbol.slot}")
+        return 0 if result['checked'] else 1
+    if arguments.command == 'service':
+        import asyncio
+        from .server import AnalysisService
+        service = AnalysisService(arguments.workers, arguments.queue_size, arguments.timeout)
+        try:
+            asyncio.run(service.serve(arguments.host, arguments.port, arguments.socket))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if arguments.command == 'build-dfa':
+        from .lexer import build_dfa, write_dfa_module
+        from .tokens import token_specs
+        tables = build_dfa(token_specs)
+        write_dfa_module(tables, arguments.output)
+        print(f"{arguments.output}: {len(tables['rows'])} states, {len(tables['rows'][0])} character classes")
+        return 0
+    interactive()
+    return 0
@@ -0,0 +1,343 @@
+"""Incremental re-analysis of a document after small edits."""
+import re
+
+from .lexer import lexical_error, scan_source
+from .parser import Parser
+
+# tokens que marcan los límites de las sentencias para el análisis incremental
+semicolon_token = ('delimiter', ';')
+start_token = ('palabra_clave', 'start')
+end_token = ('palabra_clave', 'end')
+case_token = ('palabra_clave', 'case')
+# después de un 'end' la sentencia continúa si le sigue un elif o un else
+continuation_tokens = (('palabra_clave', 'elif'), ('palabra_clave', 'else'))
+# palabras clave que abren un bloque start ... end
+block_keywords = ('if', 'elif', 'else', 'while', 'range', 'define', 'choose', 'case')
+syntax_error_regex = re.compile(r'Syntax error at line (\S+): (.*)')
+
+# Documento para análisis incremental (por ejemplo, detrás de un editor). El lexer trabaja línea por línea, así que los tokens
+# se guardan por línea y sólo se vuelven a analizar las líneas editadas. Para la sintaxis se busca la secuencia de sentencias
+# más pequeña que contiene la edición (dentro del bloque start ... end que la encierra) y sólo esa se vuelve a analizar
+class IncrementalDocument:
+    """Keep lexical and syntax results of a document up to date after small edits"""
+
+    def __init__(self, code):
+        self.lines = code.split('\n') if isinstance(code, str) else list(code)
+        # tokens de cada línea como tuplas (tipo, valor) y errores léxicos de cada línea
+        self.line_tokens = []
+        self.line_errors = []
+        self.lex_error_count = 0
+        # errores de sintaxis como tuplas (línea, mensaje, posición del primer token de la sentencia que lo produjo)
+        self.syntax_errors = []
+        self.line_tokens, self.line_errors = self.lex_lines(self.lines, 1)
+        self.reparse_all()
+
+    # analiza léxicamente un grupo de líneas y devuelve sus tokens y errores, línea por línea
+    def lex_lines(self, lines, first_line):
+        line_tokens = []
+        line_errors = []
+        for offset, line in enumerate(lines):
+            tokens = []
+            errors = []
+            for _, token_type, start, end in scan_source(line, first_line + offset):
+                if token_type is None:
+                    errors.append(lexical_error(first_line + offset, line[start:end])['error'])
+                else:
+                    tokens.append((token_type, line[start:end]))
+            line_tokens.append(tokens)
+            line_errors.append(errors)
+            self.lex_error_count += len(errors)
+        return line_tokens, line_errors
+
+    # reemplaza las líneas first_line..last_line (incluidas, empezando en 1) por new_text; para insertar sin reemplazar
+    # se usa last_line = first_line - 1, y new_text=None borra las líneas
+    def apply_edit(self, first_line, last_line, new_text):
+        """Apply an edit and update the diagnostics, re-analyzing only what it touched"""
+        new_lines = [] if new_text is None else new_text.split('\n')
+        first_index = first_line - 1
+        old_tokens = self.line_tokens[first_index:last_line]
+        new_tokens, new_errors = self.lex_lines(new_lines, first_line)
+        self.lex_error_count -= sum(len(errors) for errors in self.line_errors[first_index:last_line])
+
+        self.lines[first_index:last_line] = new_lines
+        self.line_tokens[first_index:last_line] = new_tokens
+        self.line_errors[first_index:last_line] = new_errors
+
+        # mientras haya errores de sintaxis se vuelve a analizar la sentencia de nivel superior completa, porque lo que
+        # seguía al error dentro de ella nunca se validó
+        climb = bool(self.syntax_errors)
+
+        # los errores de sintaxis después de la edición se recorren tantas líneas como cambió el documento
+        delta = len(new_lines) - (last_line - first_index)
+        self.syntax_errors = [
+            (line + delta, message, (anchor[0] + delta, anchor[1])) if anchor[0] >= last_line else (line, message, anchor)
+            for line, message, anchor in self.syntax_errors
+            if not first_index <= anchor[0] < last_line
+        ]
+
+        # si la edición agrega o quita start/end (o elif/else, que deciden dónde termina un if) cambia la estructura de bloques
+        # y se analiza todo el documento
+        structural = (start_token, end_token) + continuation_tokens
+        following = next(self.tokens_forward(first_index + len(new_lines), 0), (None, None))[1]
+        if (following in continuation_tokens or
+                any(token in structural for tokens in old_tokens + new_tokens for token in tokens)):
+            self.reparse_all()
+            return self.diagnostics()
+
+        back_from = (first_index, 0)
+        fwd_from = (first_index + len(new_lines), 0)
+        region = self.find_region(back_from, fwd_from, climb)
+        if region is None:
+            self.reparse_all()
+            return self.diagnostics()
+        # si la región nueva tiene errores, se analiza la sentencia de nivel superior completa, que sólo reporta el primer
+        # error de cada sentencia igual que un análisis completo del documento
+        if not self.reparse(*region) and not climb:
+            region = self.find_region(back_from, fwd_from, climb=True)
+            if region is None:
+                self.reparse_all()
+            else:
+                self.reparse(*region)
+        return self.diagnostics()
+
+    # recorre los tokens hacia atrás a partir de una posición (línea, token), sin incluirla
+    def tokens_backward(self, line_index, token_index):
+        if line_index < len(self.line_tokens):
+            tokens = self.line_tokens[line_index]
+            for index in range(min(token_index, len(tokens)) - 1, -1, -1):
+                yield (line_index, index), tokens[index]
+        for current_line in range(min(line_index, len(self.line_tokens)) - 1, -1, -1):
+            tokens = self.line_tokens[current_line]
+            for index in range(len(tokens) - 1, -1, -1):
+                yield (current_line, index), tokens[index]
+
+    # recorre los tokens hacia adelante a partir de una posición (línea, token), incluyéndola
+    def tokens_forward(self, line_index, token_index):
+        for current_line in range(line_index, len(self.line_tokens)):
+            tokens = self.line_tokens[current_line]
+            for index in range(token_index if current_line == line_index else 0, len(tokens)):
+                yield (current_line, index), tokens[index]
+
+    # busca la secuencia de sentencias más pequeña que contiene la edición, devuelve las posiciones (inicio, fin) con el fin
+    # excluido, o None si la estructura de bloques no está completa. Con climb=True sube hasta el nivel superior del documento
+    def find_region(self, back_from, fwd_from, climb=False):
+        if climb:
+            start, levels = self.scan_back_to_top(back_from)
+            end, enclosing_end = self.scan_forward(fwd_from, levels)
+            return None if enclosing_end is not None else (start, end)
+
+        closed = None
+        while True:
+            start, enclosing_start = self.scan_back(back_from)
+            end, enclosing_end = (closed, None) if closed else self.scan_forward(fwd_from)
+            # los cuerpos de choose sólo contienen casos, así que se vuelve a analizar el choose completo
+            if not self.needs_widening(start, end, enclosing_start):
+                return start, end
+            if enclosing_start is None:
+                enclosing_start = self.find_enclosing(start, backward=True)
+            if enclosing_end is None:
+                enclosing_end = self.find_enclosing(end, backward=False)
+            if enclosing_start is None or enclosing_end is None:
+                return None
+            back_from = enclosing_start
+            fwd_from = (enclosing_end[0], enclosing_end[1] + 1)
+            closed = None
+            after = next(self.tokens_forward(*fwd_from), (None, None))[1]
+            if after not in continuation_tokens:
+                closed = fwd_from
+
+    # busca hacia atrás el inicio de la sentencia; si antes encuentra el 'start' del bloque que la encierra, lo devuelve también
+    def scan_back(self, back_from):
+        after = next(self.tokens_forward(*back_from), (None, None))[1]
+        depth = 0
+        for position, token in self.tokens_backward(*back_from):
+            following = (position[0], position[1] + 1)
+            if token == semicolon_token and depth == 0:
+                return following, None
+            if token == end_token:
+                if depth == 0 and after not in continuation_tokens:
+                    return following, None
+                depth += 1
+            elif token == start_token:
+                if depth == 0:
+                    return following, position
+                depth -= 1
+            after = token
+        return (0, 0), None
+
+    # busca hacia atrás el inicio de la sentencia de nivel superior que contiene la posición, devuelve también cuántos
+    # bloques hubo que salir para llegar a ella
+    def scan_back_to_top(self, back_from):
+        after = next(self.tokens_forward(*back_from), (None, None))[1]
+        depth = 0
+        level = 0
+        nearest = {}
+        for position, token in self.tokens_backward(*back_from):
+            following = (position[0], position[1] + 1)
+            if token == semicolon_token and depth == 0:
+                nearest.setdefault(level, following)
+            elif token == end_token:
+                if depth == 0 and after not in continuation_tokens:
+                    nearest.setdefault(level, following)
+                depth += 1
+            elif token == start_token:
+                if depth == 0:
+                    level += 1
+                else:
+                    depth -= 1
+            after = token
+        return nearest.get(level, (0, 0)), level
+
+    # busca hacia adelante el fin de la sentencia, saliendo antes de 'levels' bloques; si encuentra el 'end' del bloque que
+    # la encierra, lo devuelve también
+    def scan_forward(self, fwd_from, levels=0):
+        depth = 0
+        pending = None
+        for position, token in self.tokens_forward(*fwd_from):
+            # un 'end' cierra la sentencia salvo que le siga elif o else
+            if pending is not None:
+                if token not in continuation_tokens:
+                    return pending, None
+                pending = None
+            if token == semicolon_token and depth == 0 and levels == 0:
+                return (position[0], position[1] + 1), None
+            if token == start_token:
+                depth += 1
+            elif token == end_token:
+                if depth > 0:
+                    depth -= 1
+                    if depth == 0 and levels == 0:
+                        pending = (position[0], position[1] + 1)
+                elif levels > 0:
+                    levels -= 1
+                    if levels == 0:
+                        pending = (position[0], position[1] + 1)
+                else:
+                    return position, position
+        if pending is not None:
+            return pending, None
+        return (len(self.line_tokens), 0), None
+
+    # busca la posición del 'start' (hacia atrás) o del 'end' (hacia adelante) del bloque que encierra una posición
+    def find_enclosing(self, position, backward):
+        opening, closing = (start_token, end_token) if backward else (end_token, start_token)
+        tokens = self.tokens_backward(*position) if backward else self.tokens_forward(*position)
+        depth = 0
+        for current, token in tokens:
+            if token == closing:
+                depth += 1
+            elif token == opening:
+                if depth == 0:
+                    return current
+                depth -= 1
+        return None
+
+    # indica si la secuencia encontrada está dentro de un choose (o de un case) y hay que analizar el bloque que la contiene
+    def needs_widening(self, start, end, enclosing_start):
+        if enclosing_start is not None:
+            for _, token in self.tokens_backward(*enclosing_start):
+                if token[0] == 'palabra_clave' and token[1] in block_keywords:
+                    if token[1] in ('choose', 'case'):
+                        return True
+                    break
+                if token in (semicolon_token, start_token, end_token):
+                    break
+        depth = 0
+        for position, token in self.tokens_forward(*start):
+            if position >= end:
+                break
+            if token == start_token:
+                depth += 1
+            elif token == end_token:
+                depth -= 1
+            elif token == case_token and depth == 0:
+                return True
+        return False
+
+    def reparse_all(self):
+        self.syntax_errors = []
+        self.reparse((0, 0), (len(self.line_tokens), 0))
+
+    # vuelve a analizar la sintaxis de las sentencias entre start y end, reemplazando los errores que éstas habían producido;
+    # devuelve verdadero si no encontró errores
+    def reparse(self, start, end):
+        tokens = []
+        positions = []
+        for position, (token_type, value) in self.tokens_forward(*start):
+            if position >= end:
+                break
+            tokens.append({'line': position[0] + 1, 'type': token_type, 'value': value})
+            positions.append(position)
+
+        self.syntax_errors = [error for error in self.syntax_errors if not start <= error[2] < end]
+        # si una sentencia se queda sin tokens, el error se reporta en la línea del token que le sigue en el documento
+        following = next(self.tokens_forward(*end), None)
+        following_line = following[0][0] + 1 if following else None
+
+        valid = True
+        for first, last in self.split_statements(tokens):
+            unit = tokens[first:last]
+            anchor = positions[first]
+            parser = Parser(unit)
+            if parser.parse():
+                continue
+            valid = False
+            if last < len(tokens):
+                next_line = tokens[last]['line']
+            else:
+                next_line = following_line or unit[-1]['line']
+            if not parser.errors:
+                failed_line = parser.current_token['line'] if parser.current_token else next_line
+                self.syntax_errors.append((failed_line, "Invalid statement", anchor))
+            for error in parser.errors:
+                match = syntax_error_regex.match(error)
+                line = match.group(1)
+                line = int(line) if line.isdigit() else next_line
+                self.syntax_errors.append((line, match.group(2), anchor))
+        return valid
+
+    # divide una lista de tokens en sentencias completas (como rangos de índices), para que un error en una no impida
+    # revisar las demás
+    def split_statements(self, tokens):
+        depth = 0
+        unit_start = 0
+        for index, token in enumerate(tokens):
+            key = (token['type'], token['value'])
+            closes = False
+            if key == semicolon_token and depth == 0:
+                closes = True
+            elif key == start_token:
+                depth += 1
+            elif key == end_token:
+                depth -= 1
+                if depth <= 0:
+                    depth = 0
+                    following = tokens[index + 1] if index + 1 < len(tokens) else None
+                    closes = not (following and (following['type'], following['value']) in continuation_tokens)
+            if closes:
+                yield unit_start, index + 1
+                unit_start = index + 1
+        if unit_start < len(tokens):
+            yield unit_start, len(tokens)
+
+    # resultado actual del análisis: errores léxicos y de sintaxis con el mismo formato que el resto del programa
+    def diagnostics(self):
+        """Current lexical and syntax errors of the document"""
+        lexical = []
+        if self.lex_error_count:
+            for index, errors in enumerate(self.line_errors):
+                lexical.extend({'line': index + 1, 'error': error} for error in errors)
+        return {
+            'errors': lexical,
+            'syntax_errors': [
+                f"Syntax error at line {line}: {message}" for line, message, _ in sorted(self.syntax_errors)
+            ]
+        }
+
+    def tokens(self):
+        """Materialize the classic token table of the whole document"""
+        return [
+            {'line': index + 1, 'type': token_type, 'value': value}
+            for index, tokens in enumerate(self.line_tokens)
+            for token_type, value in tokens
+        ]
@@ -0,0 +1,1136 @@
+"""Lexer engines: the original slicing lexer, the single-pass scanner, token tables, mmap and DFA scanning."""
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_right
+
+from .tokens import token_codes, token_specs, token_types
+
+# Función para leer un archivo
+def getfromfile(file_path): #requiere la ruta del archivo
+    try:
+        with open(file_path, 'r') as file:
+            return file.read().split('\n') #separa el texto usando los saltos de línea (\n) y lo devuelve como arreglo 
+    except FileNotFoundError:
+        # manejo de excepciones al no encontrar el archivo o abrirlo
+        print(f"Error: File '{file_path}' not found.")
+        return []
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return []
+
+#función para el análisis léxico original, recibe como parámetro el código dividido en líneas
+# se conserva como motor 'legacy' para poder comparar resultados y rendimiento con el escáner nuevo
+def legacy_lexic_analyzer(code, partial=False):
+    """Perform lexical analysis on the code (original slicing engine)"""
+    # definir los arreglos para la tabla de tokens y la lista de errores (lexemas no reconocidos)
+    token_table = []
+    errors = []
+    
+    # Esta expresión regular es especial, pues es para identificar la declaración de variables sin el @ al inicio y así mandar
+    # un mensaje de error especial
+    missing_at_regex = re.compile(r'^\b[a-zA-Z]+[a-zA-Z0-9_]*\b')
+    
+    # aquí empieza el análisis, se itera a través de cada línea del arreglo del código a analizar, se enumera cada línea
+    for line_num, original_line in enumerate(code, 1):
+        # la función strip se deshace de espacios al inicio y al final de la línea
+        stripped_line = original_line.strip()
+        # si a la línea no se le pudo aplicar strip, significa que es una línea en blanco y se salta completamente, empezando el
+        # ciclo con una línea nueva
+        if not stripped_line: 
+            continue
+
+        # se trabaja con la línea cortada, sin los espacios al inicio y al final
+        current_line = stripped_line
+        
+        # se empieza a analizar la línea para encontrar coincidencias, se va analizando desde el inicio de la línea
+        # se analizará la línea hasta agotarla
+        while current_line:
+            # si el primer caracter de la línea es un espacio, este se salta y se avanza al siguiente caracter
+            if current_line[0].isspace():
+                current_line = current_line[1:]
+                continue
+                
+            # variable que nos dice si se encontró una coincidencia, se inicializa a falso porque aún no se ha encontrado nada
+            matched = False
+            
+            """aquí se analiza token por token buscando una coincidencia
+            pattern: expersión regular
+            token_type: nombre del token
+            token_patterns: tabla de expresiones regulares compiladas a partir de token_specs """
+
+            for pattern, token_type in compiled('token_patterns'):
+                # función match de la librería re, busca el patrón de la expresión regular en la línea de código (current_line)
+                match = pattern.match(current_line)
+                if match:
+                    # si se encuentra una coincidencia la variable match es puesta a true
+                    matched = True
+                    # se añade la coincidencia (value) a la tabla de tokens junto al nombre del token (token_type) y la línea de código
+                    value = match.group()
+                    token_table.append({
+                        'line': line_num,
+                        'type': token_type,
+                        'value': value
+                    })
+                    # se remueve la parte del código que coincidió para no ser analizada de nuevo
+                    current_line = current_line[match.end():]
+                    # se sale del ciclo for pues ya se encontró una coincidencia
+                    # se devuelve al inicio del ciclo while para seguir analizando la línea hasta agotarla
+                    break
+                # si no se encuentra una coincidencia, se continua con la siguiente expresión regular hasta agotarlas todas
+                    
+            # si no se encontró ninguna coincidencia
+            if not matched:
+                # encontrar el siguiente espacio o salto de línea para delimitar el lexema no reconocido
+                next_space = len(current_line)
+                for i, char in enumerate(current_line):
+                    if char.isspace():
+                        next_space = i
+                        break
+                
+                # una cadena sin cerrar abarca el resto de la línea
+                if current_line[0] in quote_characters:
+                    next_space = len(current_line)
+
+                # variable de error que almacena el lexema no reconocido
+                error_part = current_line[:next_space]
+                
+                # Se analiza si el lexema luce como una variable sin el símbolo @ al inicio
+                missing_at_match = missing_at_regex.match(error_part)
+                if error_part[0] in quote_characters:
+                    errors.append(lexical_error(line_num, error_part))
+                elif missing_at_match:
+                    # de ser cierto entonces se crea el error con una corrección especial
+                    suggested_correction = f"@{error_part}"
+                    # los errores se añaden al arreglo de errores
+                    errors.append({
+                        'line': line_num,
+                        'error': f"Unrecognized token: '{error_part}' - did you mean '{suggested_correction}'?"
+                    })
+                else:
+                    # si no entonces se crea un mensaje de error genérico
+                    errors.append({
+                        'line': line_num,
+                        'error': f"Unrecognized token: '{error_part}'"
+                    })
+                
+                current_line = current_line[next_space:]
+        # se continua analizando el texto aunque haya errores
+                
+    # se devuelve la tabla de errores o la tabla de tokens, sea el caso (o ambas si se pidió un resultado parcial)
+    if errors and partial:
+        return {'tokens': token_table, 'errors': errors}
+    if errors:
+        return {'errors': errors}
+    else:
+        return {'tokens': token_table}
+
+# Expresión regular para detectar variables sin el @ al inicio (la misma que usa el analizador original)
+missing_at_regex = re.compile(r'^\b[a-zA-Z]+[a-zA-Z0-9_]*\b')
+
+# Expresión para eliminar los \b iniciales de cada alternativa. El analizador original recortaba la línea antes de buscar
+# cada token, y al inicio de una cadena recortada ese \b siempre se cumple si el token empieza con una letra; al buscar con
+# una posición dentro del texto completo, el \b miraría el caracter anterior y cambiaría el resultado
+leading_boundary_regex = re.compile(r'(?<![^(|])\\b')
+
+# función que une todas las expresiones de token_specs en una sola expresión con grupos nombrados
+def build_master_pattern(patterns, as_bytes=False):
+    """Combine (pattern, token_name) pairs into one named-group regex keeping their priority order"""
+    # la alternancia de una expresión regular se prueba de izquierda a derecha, así que el orden de prioridad se mantiene
+    alternatives = []
+    for source, token_type in patterns:
+        source = leading_boundary_regex.sub('', source)
+        alternatives.append(f"(?P<{token_type}>{source})")
+    master = '|'.join(alternatives)
+    # la versión en bytes se usa para analizar archivos mapeados en memoria sin decodificarlos
+    return re.compile(master.encode('utf-8') if as_bytes else master)
+
+# Las expresiones de los tokens se compilan la primera vez que se usan y no al importar el módulo, así un programa que sólo
+# necesita una parte del paquete (o el motor DFA, que usa sus tablas ya generadas) no paga la compilación. Dentro del módulo
+# se piden con compiled(nombre); desde fuera también se pueden leer como atributos (lexer.master_pattern)
+lazy_patterns = {
+    'token_patterns': lambda: [(re.compile(source), token_type) for source, token_type in token_specs],
+    'master_pattern': lambda: build_master_pattern(token_specs),
+    'bytes_master_pattern': lambda: build_master_pattern(token_specs, as_bytes=True),
+}
+
+def compiled(name):
+    """Pattern registered in lazy_patterns, compiled on first use"""
+    pattern = globals().get(name)
+    if pattern is None:
+        pattern = globals()[name] = lazy_patterns[name]()
+    return pattern
+
+def __getattr__(name):
+    if name in lazy_patterns:
+        return compiled(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+whitespace_regex = re.compile(r'\s+')
+lexeme_regex = re.compile(r'\S+')
+
+# CADENAS Y COMENTARIOS
+# Las cadenas que cierran en la misma línea las reconoce el patrón de texto de token_specs. Lo que ese patrón no reconoce lo
+# resuelve scan_literal con una sola pasada hacia adelante: una cadena sin cerrar se reporta como tal (el error abarca el
+# resto de la línea en lugar de cortar el lexema en el siguiente espacio) y, con multiline=True, las cadenas pueden seguir
+# en las líneas siguientes y ?* ... *? es un comentario de bloque. El token queda en la línea donde empieza el literal
+quote_characters = '"\''
+block_comment_open = '?*'
+block_comment_close = '*?'
+string_escapes = {'n': '\n', 't': '\t', '\\': '\\', '"': '"', "'": "'"}
+escape_regex = re.compile(r'\\(.)', re.S)
+# largo máximo del inicio del literal que se muestra en el error de un literal sin cerrar
+literal_excerpt_length = 20
+
+# posición donde termina la cadena o el comentario de bloque que empieza en pos, o -1 si no se cierra antes de end. Cada
+# caracter se revisa una sola vez: se busca la comilla que cierra y sólo las diagonales que haya antes de ella
+def scan_literal(text, pos, end):
+    """End offset of the string or block comment starting at pos, or -1 when it is not closed before end"""
+    if text.startswith(block_comment_open, pos):
+        close = text.find(block_comment_close, pos + len(block_comment_open), end)
+        return -1 if close == -1 else close + len(block_comment_close)
+    quote = text[pos]
+    index = pos + 1
+    close = text.find(quote, index, end)
+    while close != -1:
+        backslash = text.find('\\', index, close)
+        if backslash == -1:
+            return close + 1
+        # el caracter después de la diagonal está escapado; si era la comilla, se busca la siguiente
+        index = backslash + 2
+        if index > close:
+            close = text.find(quote, index, end)
+    return -1
+
+# valor de una cadena: sin las comillas y con los escapes reemplazados (uno desconocido se deja tal cual)
+def string_value(lexeme):
+    """Text of a string literal without its quotes, with escape sequences decoded"""
+    return escape_regex.sub(lambda match: string_escapes.get(match.group(1), match.group(0)), lexeme[1:-1])
+
+# función que recorre el texto una sola vez con un cursor de posición, sin copiar el resto de la línea por cada token
+def scan_source(text, line_num=1, pos=0, endpos=None, multiline=False):
+    """Scan text once with a position cursor.
+
+    Yields (line, token_type, start, end) for every lexeme. token_type is None
+    when the lexeme was not recognized. With multiline=True strings may span
+    lines and ?* ... *? is a block comment.
+    """
+    master_match = compiled('master_pattern').match
+    whitespace_match = whitespace_regex.match
+    lexeme_match = lexeme_regex.match
+    text_end = len(text) if endpos is None else endpos
+    # si la búsqueda del *? que cierra un comentario de bloque ya falló desde una posición, tampoco hay uno después de
+    # ella; así un texto con muchos ?* sin cerrar no se recorre hasta el final por cada uno
+    unclosed_comment = text_end + 1
+
+    while pos <= text_end:
+        # se delimita la línea actual sin cortarla, sólo con posiciones
+        line_end = text.find('\n', pos, text_end)
+        if line_end == -1:
+            line_end = text_end
+        # igual que strip(), los espacios al final de la línea no forman parte de ningún token
+        stop = line_end
+        while stop > pos and text[stop - 1].isspace():
+            stop -= 1
+
+        # un literal de varias líneas termina a la mitad de otra línea; ahí se sigue sin pasar a la siguiente
+        resume = False
+        while True:
+            # se saltan los espacios de una sola vez
+            match = whitespace_match(text, pos, stop)
+            if match:
+                pos = match.end()
+            if pos >= stop:
+                break
+
+            # una sola búsqueda con la expresión maestra; lastgroup es el nombre del token que coincidió
+            match = master_match(text, pos, stop)
+            if match and not (multiline and match.lastgroup == 'comentario' and text.startswith(block_comment_open, pos)):
+                end = match.end()
+                yield line_num, match.lastgroup, pos, end
+            elif multiline and (text[pos] in quote_characters or text.startswith(block_comment_open, pos)):
+                if text[pos] in quote_characters or pos < unclosed_comment:
+                    end = scan_literal(text, pos, text_end)
+                    if end == -1 and text[pos] not in quote_characters:
+                        unclosed_comment = pos
+                else:
+                    end = -1
+                if end == -1:
+                    yield line_num, None, pos, stop
+                    end = stop
+                else:
+                    yield line_num, 'texto' if text[pos] in quote_characters else 'comentario', pos, end
+                    if end > line_end:
+                        line_num += text.count('\n', pos, end)
+                        pos = end
+                        resume = True
+                        break
+            else:
+                # lexema no reconocido, se delimita hasta el siguiente espacio (una cadena sin cerrar, hasta el final de
+                # la línea)
+                end = stop if text[pos] in quote_characters else lexeme_match(text, pos, stop).end()
+                yield line_num, None, pos, end
+            pos = end
+
+        if not resume:
+            pos = line_end + 1
+            line_num += 1
+
+# función que construye el mensaje de error de un lexema no reconocido
+def lexical_error(line_num, error_part):
+    """Build the error entry for an unrecognized lexeme"""
+    if error_part[0] in quote_characters or error_part.startswith(block_comment_open):
+        kind = 'string' if error_part[0] in quote_characters else 'block comment'
+        excerpt = error_part[:literal_excerpt_length] + ('...' if len(error_part) > literal_excerpt_length else '')
+        return {
+            'line': line_num,
+            'error': f"Unterminated {kind}: {excerpt}"
+        }
+    if missing_at_regex.match(error_part):
+        return {
+            'line': line_num,
+            'error': f"Unrecognized token: '{error_part}' - did you mean '@{error_part}'?"
+        }
+    return {
+        'line': line_num,
+        'error': f"Unrecognized token: '{error_part}'"
+    }
+
+# función para el análisis léxico con el escáner de un solo recorrido
+# recibe el código dividido en líneas (como lo devuelve getfromfile) o el texto completo
+def scanner_lexic_analyzer(code, partial=False, multiline=False):
+    """Perform lexical analysis with the single-pass offset scanner"""
+    token_table = []
+    errors = []
+
+    if isinstance(code, str):
+        sources = [(code, 1)]
+    elif multiline:
+        # los literales pueden cruzar líneas, así que se analiza el texto completo
+        sources = [('\n'.join(code), 1)]
+    else:
+        sources = ((line, line_num) for line_num, line in enumerate(code, 1))
+
+    for text, first_line in sources:
+        for line_num, token_type, start, end in scan_source(text, first_line, multiline=multiline):
+            if token_type is None:
+                errors.append(lexical_error(line_num, text[start:end]))
+            else:
+                token_table.append({
+                    'line': line_num,
+                    'type': token_type,
+                    'value': text[start:end]
+                })
+
+    if errors and partial:
+        return {'tokens': token_table, 'errors': errors}
+    if errors:
+        return {'errors': errors}
+    else:
+        return {'tokens': token_table}
+
+# generador de tokens: lee el código línea por línea y entrega cada token en cuanto se encuentra, sin construir la tabla completa
+# recibe la ruta de un archivo o cualquier iterable de líneas (un archivo abierto, una lista, etc.)
+def iter_tokens(file_or_iterable, errors=None):
+    """Yield token dicts lazily while reading lines.
+
+    Lexical errors are appended to ``errors`` when a list is given.
+    """
+    if isinstance(file_or_iterable, (str, os.PathLike)):
+        with open(file_or_iterable, 'r') as file:
+            yield from iter_tokens(file, errors)
+        return
+
+    for line_num, line in enumerate(file_or_iterable, 1):
+        # las líneas leídas de un archivo conservan el salto de línea, se excluye con la posición final en vez de cortarla
+        end = len(line)
+        if line.endswith('\n'):
+            end -= 1
+        for token_line, token_type, start, stop in scan_source(line, line_num, 0, end):
+            if token_type is None:
+                if errors is not None:
+                    errors.append(lexical_error(token_line, line[start:stop]))
+                continue
+            yield {
+                'line': token_line,
+                'type': token_type,
+                'value': line[start:stop]
+            }
+
+# versión en bytes del escáner, para archivos mapeados en memoria (mmap). Las clases \s, \w y \b de las expresiones en
+# bytes sólo reconocen caracteres ASCII, así que las líneas con bytes que el escáner de texto trata de otra forma (los no
+# ASCII y los separadores \x1c-\x1f, que \s toma como espacio sólo en texto) se decodifican y se analizan con scan_source
+bytes_whitespace_regex = re.compile(rb'\s+')
+bytes_unicode_regex = re.compile(rb'[\x1c-\x1f\x80-\xff]')
+bytes_lexeme_regex = re.compile(rb'\S+')
+ascii_whitespace = b' \t\n\r\x0b\x0c'
+quote_bytes = quote_characters.encode('ascii')
+utf8_bom = b'\xef\xbb\xbf'
+
+# función para abrir un archivo sin leerlo: se mapea en memoria y se devuelve junto con la posición donde empieza el código
+# (después de la marca BOM de UTF-8, si la tiene)
+def map_source(file_path):
+    """Memory-map a file read-only, returning (buffer, start_offset)"""
+    with open(file_path, 'rb') as file:
+        # mmap no permite mapear archivos vacíos
+        if os.fstat(file.fileno()).st_size == 0:
+            return b'', 0
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    start = len(utf8_bom) if buffer[:len(utf8_bom)] == utf8_bom else 0
+    return buffer, start
+
+# índice de líneas: guarda la posición donde empieza cada línea, así el número de línea de cualquier posición se obtiene
+# con una búsqueda binaria en lugar de dividir el texto en una lista de líneas
+class LineIndex:
+    """Start offsets of every line of a bytes buffer"""
+
+    def __init__(self, buffer, start=0):
+        offset_code = 'I' if len(buffer) < 2 ** 32 else 'Q'
+        self.starts = array(offset_code, [start])
+        self.end = len(buffer)
+        find = buffer.find
+        newline = find(b'\n', start)
+        while newline != -1:
+            self.starts.append(newline + 1)
+            newline = find(b'\n', newline + 1)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def line_of(self, offset):
+        """Line number (1-based) that contains offset"""
+        return bisect_right(self.starts, offset)
+
+    def line_bounds(self, line_num):
+        """(start, end) offsets of a line, without its newline"""
+        start = self.starts[line_num - 1]
+        end = self.starts[line_num] - 1 if line_num < len(self.starts) else self.end
+        return start, end
+
+# analiza una línea del búfer con scan_source y convierte las posiciones de caracteres a posiciones en bytes. Los bytes que
+# no son UTF-8 válido se decodifican como un caracter cada uno (surrogateescape), así cada caracter ocupa los bytes que
+# tenía en el búfer
+def scan_decoded_line(buffer, line_num, pos, stop):
+    """Scan one buffer line as text; yields (line, token_type, start, end) with byte offsets"""
+    text = buffer[pos:stop].decode('utf-8', errors='surrogateescape')
+    offsets = [pos]
+    for character in text:
+        offsets.append(offsets[-1] + len(character.encode('utf-8', errors='surrogateescape')))
+    for line, token_type, start, end in scan_source(text, line_num):
+        yield line, token_type, offsets[start], offsets[end]
+
+# escáner sobre bytes: igual que scan_source, pero recorre las líneas que indica el índice de líneas
+def scan_bytes(buffer, line_index, first_line=1, last_line=None):
+    """Scan a bytes buffer line by line; yields (line, token_type, start, end)"""
+    master_match = compiled('bytes_master_pattern').match
+    whitespace_match = bytes_whitespace_regex.match
+    lexeme_match = bytes_lexeme_regex.match
+    unicode_search = bytes_unicode_regex.search
+    if last_line is None:
+        last_line = len(line_index)
+
+    for line_num in range(first_line, last_line + 1):
+        pos, stop = line_index.line_bounds(line_num)
+        if unicode_search(buffer, pos, stop):
+            yield from scan_decoded_line(buffer, line_num, pos, stop)
+            continue
+        # los espacios finales, incluido el \r de los saltos de línea CRLF, no forman parte de ningún token
+        while stop > pos and buffer[stop - 1] in ascii_whitespace:
+            stop -= 1
+
+        while True:
+            match = whitespace_match(buffer, pos, stop)
+            if match:
+                pos = match.end()
+            if pos >= stop:
+                break
+            match = master_match(buffer, pos, stop)
+            if match:
+                end = match.end()
+                yield line_num, match.lastgroup, pos, end
+            else:
+                end = stop if buffer[pos] in quote_bytes else lexeme_match(buffer, pos, stop).end()
+                yield line_num, None, pos, end
+            pos = end
+
+# vista de sólo lectura de un token dentro de una TokenTable, se usa igual que los diccionarios de la tabla de tokens
+# (token['line'], token['type'], token['value']) pero no guarda nada aparte del índice
+class TokenView:
+    """Read-only, dict-like view of one token stored in a TokenTable"""
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key):
+        if key == 'type':
+            return token_types[self.table.kinds[self.index]]
+        if key == 'value':
+            return self.table.value(self.index)
+        if key == 'line':
+            return self.table.lines[self.index]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return ('line', 'type', 'value')
+
+    def __eq__(self, other):
+        if isinstance(other, (TokenView, dict)):
+            return all(self[key] == other[key] for key in self.keys())
+        return NotImplemented
+
+    def __repr__(self):
+        return repr({key: self[key] for key in self.keys()})
+
+# tabla de tokens compacta: en lugar de un diccionario por token, cada dato se guarda en un arreglo numérico
+# (tipo en 1 byte, línea e inicio/fin en 4 bytes) y el valor se obtiene cortando el código fuente sólo cuando se pide
+class TokenTable:
+    """Struct-of-arrays token table with lazy values sliced from the source"""
+
+    def __init__(self, source, encoding=None):
+        self.source = source
+        # si el código fuente está en bytes (por ejemplo un archivo mapeado en memoria) los valores se decodifican al leerlos
+        self.encoding = encoding
+        self.line_index = None
+        # los desplazamientos usan 4 bytes salvo que el código fuente no quepa en ese rango
+        offset_code = 'I' if len(source) < 2 ** 32 else 'Q'
+        self.kinds = array('B')
+        self.lines = array('I')
+        self.starts = array(offset_code)
+        self.ends = array(offset_code)
+
+    # construye la tabla a partir del código (lista de líneas o texto completo), devuelve la tabla y los errores léxicos
+    @classmethod
+    def from_code(cls, code, multiline=False):
+        """Lex code into a TokenTable, returning (table, errors)"""
+        source = code if isinstance(code, str) else '\n'.join(code)
+        table = cls(source)
+        errors = table.extend(scan_source(source, multiline=multiline))
+        return table, errors
+
+    # construye la tabla mapeando el archivo en memoria, sin leerlo completo ni dividirlo en líneas
+    @classmethod
+    def from_file(cls, file_path, encoding='utf-8'):
+        """Lex a memory-mapped file into a TokenTable, returning (table, errors)"""
+        buffer, start = map_source(file_path)
+        table = cls(buffer, encoding)
+        table.line_index = LineIndex(buffer, start)
+        errors = table.extend(scan_bytes(buffer, table.line_index))
+        return table, errors
+
+    # agrega a la tabla los tokens que entrega un escáner y devuelve los errores de los lexemas no reconocidos
+    def extend(self, scanned):
+        errors = []
+        kinds_append = self.kinds.append
+        lines_append = self.lines.append
+        starts_append = self.starts.append
+        ends_append = self.ends.append
+        for line_num, token_type, start, end in scanned:
+            if token_type is None:
+                errors.append(lexical_error(line_num, self.slice(start, end)))
+                continue
+            kinds_append(token_codes[token_type])
+            lines_append(line_num)
+            starts_append(start)
+            ends_append(end)
+        return errors
+
+    def slice(self, start, end):
+        text = self.source[start:end]
+        if self.encoding is not None:
+            return text.decode(self.encoding, errors='replace')
+        return text
+
+    # libera el archivo mapeado en memoria, si lo hay
+    def close(self):
+        if isinstance(self.source, mmap.mmap):
+            self.source.close()
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError('token index out of range')
+        return TokenView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield TokenView(self, index)
+
+    def kind(self, index):
+        return self.kinds[index]
+
+    def type(self, index):
+        return token_types[self.kinds[index]]
+
+    def line(self, index):
+        return self.lines[index]
+
+    def value(self, index):
+        return self.slice(self.starts[index], self.ends[index])
+
+    def to_dicts(self):
+        """Materialize the table as the classic list of token dicts"""
+        return [{'line': token['line'], 'type': token['type'], 'value': token['value']} for token in self]
+
+    # memoria ocupada por los arreglos de la tabla (sin contar el código fuente, que ya existía)
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in (self.kinds, self.lines, self.starts, self.ends))
+
+    # exporta las columnas como arreglos de NumPy sin copiarlas, para hacer consultas vectorizadas
+    def to_numpy(self):
+        """Return the columns as NumPy arrays sharing the table memory (requires NumPy)"""
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("NumPy is required for TokenTable.to_numpy()") from None
+        return {
+            name: numpy.frombuffer(column, dtype=f'u{column.itemsize}')
+            for name, column in (('kinds', self.kinds), ('lines', self.lines),
+                                 ('starts', self.starts), ('ends', self.ends))
+        }
+
+    # cantidad de tokens de cada tipo
+    def type_counts(self):
+        """Count tokens per type, vectorized with NumPy when it is installed"""
+        try:
+            import numpy
+        except ImportError:
+            kinds = self.kinds.tobytes()
+            counts = [kinds.count(code) for code in range(len(token_types))]
+        else:
+            counts = numpy.bincount(self.to_numpy()['kinds'], minlength=len(token_types)).tolist()
+        return {token_type: count for token_type, count in zip(token_types, counts) if count}
+
+    # cantidad de tokens por línea, el índice de la lista es el número de línea
+    def line_histogram(self):
+        """Count tokens per line number, vectorized with NumPy when it is installed"""
+        if not self.lines:
+            return []
+        try:
+            import numpy
+        except ImportError:
+            histogram = [0] * (max(self.lines) + 1)
+            for line_num in self.lines:
+                histogram[line_num] += 1
+            return histogram
+        return numpy.bincount(self.to_numpy()['lines']).tolist()
+
+# análisis léxico que devuelve una TokenTable en lugar de la lista de diccionarios
+def table_lexic_analyzer(code, partial=False, multiline=False):
+    """Perform lexical analysis producing a compact TokenTable"""
+    table, errors = TokenTable.from_code(code, multiline)
+    if errors and partial:
+        return {'tokens': table, 'errors': errors}
+    if errors:
+        return {'errors': errors}
+    else:
+        return {'tokens': table}
+
+# análisis léxico de un archivo mapeado en memoria, recibe la ruta del archivo en lugar del código dividido en líneas
+def mmap_lexic_analyzer(file_path):
+    """Perform lexical analysis on a memory-mapped file, producing a TokenTable"""
+    table, errors = TokenTable.from_file(file_path)
+    if errors:
+        return {'errors': errors}
+    else:
+        return {'tokens': table}
+
+# Generador de un autómata finito determinista (DFA) a partir de token_specs. Las expresiones se traducen a un NFA
+# (construcción de Thompson), se convierte en DFA con la construcción de subconjuntos y se minimiza. Las tablas se guardan
+# en un módulo de Python generado (dfa_tables.py) para no reconstruirlas cada vez que se inicia el programa
+dfa_generator_version = 1
+max_code_point = 0x10FFFF
+dfa_tables_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dfa_tables.py')
+
+# Intérprete del subconjunto de expresiones regulares que usa token_specs: alternancia, grupos (incluyendo (?:...)),
+# clases de caracteres con rangos y negación, '.', los cuantificadores * + ?, escapes y \b. Igual que en la expresión
+# maestra, el \b al inicio de una alternativa se ignora; al final de un patrón se convierte en una condición de aceptación
+class RegexSubsetParser:
+    """Parse a token pattern into a small syntax tree of ('set' | 'cat' | 'alt' | 'star' | 'plus' | 'opt' | 'boundary')"""
+
+    def __init__(self, source):
+        self.source = source
+        self.pos = 0
+
+    def fail(self, message):
+        raise ValueError(f"Unsupported token pattern {self.source!r} at {self.pos}: {message}")
+
+    def peek(self):
+        return self.source[self.pos] if self.pos < len(self.source) else None
+
+    def parse(self):
+        node = self.alternation()
+        if self.pos != len(self.source):
+            self.fail("unbalanced ')'")
+        return node
+
+    def alternation(self):
+        options = [self.concatenation()]
+        while self.peek() == '|':
+            self.pos += 1
+            options.append(self.concatenation())
+        return options[0] if len(options) == 1 else ('alt', options)
+
+    def concatenation(self):
+        parts = []
+        while self.peek() not in (None, '|', ')'):
+            if self.source.startswith('\\b', self.pos):
+                self.pos += 2
+                # \b al inicio de una alternativa (después de '(' o '|') se descarta, como en build_master_pattern
+                if self.pos == 2 or self.source[self.pos - 3] in '(|':
+                    continue
+                parts.append(('boundary',))
+                continue
+            parts.append(self.quantified(self.atom()))
+        return parts[0] if len(parts) == 1 else ('cat', parts)
+
+    def quantified(self, node):
+        while self.peek() in ('*', '+', '?'):
+            node = ({'*': 'star', '+': 'plus', '?': 'opt'}[self.peek()], node)
+            self.pos += 1
+            if self.peek() == '?':
+                self.fail("lazy quantifiers are not supported")
+        if self.peek() == '{':
+            self.fail("counted repetition is not supported")
+        return node
+
+    def atom(self):
+        char = self.peek()
+        self.pos += 1
+        if char == '(':
+            if self.source.startswith('?:', self.pos):
+                self.pos += 2
+            elif self.peek() == '?':
+                self.fail("only (?:...) groups are supported")
+            node = self.alternation()
+            if self.peek() != ')':
+                self.fail("missing ')'")
+            self.pos += 1
+            return node
+        if char == '[':
+            return ('set', self.char_class())
+        if char == '.':
+            return ('set', negate_intervals([(10, 10)]))
+        if char == '\\':
+            return ('set', self.escape())
+        if char in '^$*+?{':
+            self.fail(f"'{char}' is not supported here")
+        return ('set', [(ord(char), ord(char))])
+
+    def escape(self):
+        char = self.peek()
+        if char is None:
+            self.fail("trailing backslash")
+        self.pos += 1
+        if char == 'd':
+            return [(48, 57)]
+        if char in 'nrt':
+            return [(ord({'n': '\n', 'r': '\r', 't': '\t'}[char]),) * 2]
+        if char.isalnum():
+            self.fail(f"escape \\{char} is not supported")
+        return [(ord(char), ord(char))]
+
+    def class_char(self):
+        char = self.peek()
+        if char is None:
+            self.fail("missing ']'")
+        self.pos += 1
+        if char == '\\':
+            intervals = self.escape()
+            if len(intervals) != 1 or intervals[0][0] != intervals[0][1]:
+                self.fail("class escapes are not supported inside ranges")
+            return intervals[0][0]
+        return ord(char)
+
+    def char_class(self):
+        negated = self.peek() == '^'
+        if negated:
+            self.pos += 1
+        intervals = []
+        first = True
+        while first or self.peek() != ']':
+            first = False
+            if self.source.startswith('\\d', self.pos):
+                self.pos += 2
+                intervals.append((48, 57))
+                continue
+            low = self.class_char()
+            if self.peek() == '-' and self.source[self.pos + 1:self.pos + 2] not in ('', ']'):
+                self.pos += 1
+                high = self.class_char()
+                if high < low:
+                    self.fail("bad character range")
+                intervals.append((low, high))
+            else:
+                intervals.append((low, low))
+        self.pos += 1
+        intervals = merge_intervals(intervals)
+        return negate_intervals(intervals) if negated else intervals
+
+def merge_intervals(intervals):
+    merged = []
+    for low, high in sorted(intervals):
+        if merged and low <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return merged
+
+def negate_intervals(intervals):
+    result = []
+    next_low = 0
+    for low, high in merge_intervals(intervals):
+        if low > next_low:
+            result.append((next_low, low - 1))
+        next_low = high + 1
+    if next_low <= max_code_point:
+        result.append((next_low, max_code_point))
+    return result
+
+# divide los caracteres en clases: dos caracteres quedan en la misma clase si todas las expresiones los tratan igual, así
+# las tablas tienen una columna por clase en lugar de una por caracter
+def character_classes(char_sets):
+    cuts = {0, max_code_point + 1}
+    for intervals in char_sets:
+        for low, high in intervals:
+            cuts.add(low)
+            cuts.add(high + 1)
+    cuts = sorted(cuts)
+    signatures = {}
+    pieces = []
+    for low, next_low in zip(cuts, cuts[1:]):
+        signature = tuple(any(a <= low <= b for a, b in intervals) for intervals in char_sets)
+        pieces.append((low, next_low - 1, signatures.setdefault(signature, len(signatures))))
+    return pieces, len(signatures)
+
+class NFABuilder:
+    """Thompson construction over class-id sets"""
+
+    def __init__(self):
+        self.edges = []      # por estado: lista de (conjunto de clases, destino)
+        self.epsilons = []   # por estado: lista de (destino, cruza un \b)
+        self.accepts = {}    # estado final de cada patrón -> índice del patrón
+
+    def state(self):
+        self.edges.append([])
+        self.epsilons.append([])
+        return len(self.edges) - 1
+
+    def build(self, node, class_of):
+        kind = node[0]
+        start = self.state()
+        if kind == 'set':
+            end = self.state()
+            self.edges[start].append((class_of(node[1]), end))
+        elif kind == 'boundary':
+            end = self.state()
+            self.epsilons[start].append((end, True))
+        elif kind == 'cat':
+            end = start
+            for part in node[1]:
+                part_start, part_end = self.build(part, class_of)
+                self.epsilons[end].append((part_start, False))
+                end = part_end
+        elif kind == 'alt':
+            end = self.state()
+            for option in node[1]:
+                option_start, option_end = self.build(option, class_of)
+                self.epsilons[start].append((option_start, False))
+                self.epsilons[option_end].append((end, False))
+        else:
+            inner_start, inner_end = self.build(node[1], class_of)
+            end = self.state()
+            self.epsilons[start].append((inner_start, False))
+            self.epsilons[inner_end].append((end, False))
+            if kind in ('star', 'plus'):
+                self.epsilons[inner_end].append((inner_start, False))
+            if kind in ('star', 'opt'):
+                self.epsilons[start].append((end, False))
+        return start, end
+
+    # cerradura épsilon: devuelve los estados alcanzables sin cruzar \b y los patrones que aceptan (sin condición y
+    # condicionados a un límite de palabra). Después de un \b sólo puede terminar el patrón
+    def closure(self, states):
+        plain = set(states)
+        crossed = set()
+        stack = [(state, False) for state in states]
+        while stack:
+            state, boundary = stack.pop()
+            if boundary and self.edges[state]:
+                raise ValueError("\\b is only supported at the start or the end of a token pattern")
+            for target, is_boundary in self.epsilons[state]:
+                target_boundary = boundary or is_boundary
+                seen = crossed if target_boundary else plain
+                if target not in seen:
+                    seen.add(target)
+                    stack.append((target, target_boundary))
+        accept = min((self.accepts[state] for state in plain if state in self.accepts), default=-1)
+        accept_boundary = min((self.accepts[state] for state in crossed if state in self.accepts), default=-1)
+        return frozenset(plain), accept, accept_boundary
+
+def build_dfa(patterns):
+    """Compile (pattern, token_name) pairs into minimized DFA tables (a dict)"""
+    trees = [RegexSubsetParser(source).parse() for source, _ in patterns]
+
+    char_sets = []
+    def collect(node):
+        if node[0] == 'set':
+            char_sets.append(node[1])
+        elif node[0] in ('cat', 'alt'):
+            for child in node[1]:
+                collect(child)
+        elif node[0] != 'boundary':
+            collect(node[1])
+    for tree in trees:
+        collect(tree)
+    pieces, class_count = character_classes(char_sets)
+    # todos los caracteres que no son ASCII deben caer en una sola clase para que la tabla de búsqueda sea pequeña
+    other_classes = {class_id for low, high, class_id in pieces if high >= 128}
+    if len(other_classes) != 1:
+        raise ValueError("token patterns must only distinguish ASCII characters")
+    ascii_classes = [next(class_id for low, high, class_id in pieces if low <= code <= high) for code in range(128)]
+
+    def class_of(intervals):
+        return frozenset(class_id for low, high, class_id in pieces
+                         if any(a <= low and high <= b for a, b in intervals))
+
+    nfa = NFABuilder()
+    start = nfa.state()
+    for index, tree in enumerate(trees):
+        tree_start, tree_end = nfa.build(tree, class_of)
+        nfa.epsilons[start].append((tree_start, False))
+        nfa.accepts[tree_end] = index
+
+    # construcción de subconjuntos
+    first = nfa.closure([start])
+    states = {first[0]: 0}
+    info = [first]
+    rows = []
+    pending = [first[0]]
+    while pending:
+        current = pending.pop(0)
+        row = []
+        for class_id in range(class_count):
+            targets = [target for state in current for classes, target in nfa.edges[state] if class_id in classes]
+            if not targets:
+                row.append(-1)
+                continue
+            closure = nfa.closure(targets)
+            if closure[0] not in states:
+                states[closure[0]] = len(info)
+                info.append(closure)
+                pending.append(closure[0])
+            row.append(states[closure[0]])
+        rows.append(row)
+
+    # minimización por refinamiento de particiones (algoritmo de Moore)
+    accept = [item[1] for item in info]
+    accept_boundary = [item[2] for item in info]
+    blocks = [(accept[state], accept_boundary[state]) for state in range(len(rows))]
+    while True:
+        signatures = {}
+        refined = []
+        for state, row in enumerate(rows):
+            signature = (blocks[state], tuple(blocks[target] if target >= 0 else None for target in row))
+            refined.append(signatures.setdefault(signature, len(signatures)))
+        if len(signatures) == len(set(blocks)):
+            blocks = refined
+            break
+        blocks = refined
+    # se renumeran los bloques para que el estado inicial sea el 0
+    order = {}
+    for state in range(len(rows)):
+        order.setdefault(blocks[state], len(order))
+    minimized_rows = [None] * len(order)
+    minimized_accept = [-1] * len(order)
+    minimized_boundary = [-1] * len(order)
+    for state, row in enumerate(rows):
+        block = order[blocks[state]]
+        minimized_rows[block] = [order[blocks[target]] if target >= 0 else -1 for target in row]
+        minimized_accept[block] = accept[state]
+        minimized_boundary[block] = accept_boundary[state]
+
+    return {
+        'fingerprint': dfa_fingerprint(patterns),
+        'token_types': [token_type for _, token_type in patterns],
+        'ascii_classes': ascii_classes,
+        'other_class': other_classes.pop(),
+        'rows': minimized_rows,
+        'accept': minimized_accept,
+        'accept_boundary': minimized_boundary,
+    }
+
+def dfa_fingerprint(patterns):
+    """Hash identifying the token definitions a set of DFA tables was built from"""
+    # hashlib e importlib.util sólo los usa el DFA, se importan aquí para no cargarlos con los demás motores
+    import hashlib
+    digest = hashlib.sha256(f"dfa {dfa_generator_version}".encode())
+    for source, token_type in patterns:
+        digest.update(f"{token_type}\0{source}\0".encode())
+    return digest.hexdigest()
+
+# escribe las tablas como un módulo de Python
+def write_dfa_module(tables, path=dfa_tables_path):
+    """Write DFA tables to a generated Python module"""
+    lines = [
+        "# Tablas del lexer DFA generadas por 'python -m analizador build-dfa' a partir de token_specs.",
+        "# No editar: se vuelven a generar cuando cambian los patrones.",
+        f"fingerprint = {tables['fingerprint']!r}",
+        f"token_types = {tables['token_types']!r}",
+        f"ascii_classes = {tables['ascii_classes']!r}",
+        f"other_class = {tables['other_class']!r}",
+        f"accept = {tables['accept']!r}",
+        f"accept_boundary = {tables['accept_boundary']!r}",
+        "rows = [",
+    ]
+    lines.extend(f"    {row!r}," for row in tables['rows'])
+    lines.append("]")
+    with open(path, 'w') as file:
+        file.write('\n'.join(lines) + '\n')
+
+dfa_tables = None
+
+# carga las tablas del módulo generado si corresponden a los token_specs actuales; si no existe o está desactualizado,
+# se construyen en memoria
+def load_dfa_tables():
+    """Return the DFA tables for token_specs, from dfa_tables.py when it is up to date"""
+    global dfa_tables
+    if dfa_tables is None:
+        import importlib.util
+        fingerprint = dfa_fingerprint(token_specs)
+        tables = None
+        if os.path.exists(dfa_tables_path):
+            spec = importlib.util.spec_from_file_location('dfa_tables', dfa_tables_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            if getattr(module, 'fingerprint', None) == fingerprint:
+                tables = {name: getattr(module, name) for name in
+                          ('fingerprint', 'token_types', 'ascii_classes', 'other_class', 'rows', 'accept',
+                           'accept_boundary')}
+        dfa_tables = tables or build_dfa(token_specs)
+    return dfa_tables
+
+non_ascii_regex = re.compile(r'[^\x00-\x7f]')
+
+# igual que scan_source, pero cada token se reconoce recorriendo el DFA caracter por caracter. El texto se traduce antes a
+# una cadena de bytes con la clase de cada caracter, así el ciclo sólo indexa tablas. Gana el patrón con mayor prioridad que
+# coincide, y para ese patrón la coincidencia más larga
+def dfa_scan_source(text, line_num=1, pos=0, endpos=None):
+    """Scan text with the table-driven DFA, yielding the same tuples as scan_source"""
+    tables = load_dfa_tables()
+    rows = tables['rows']
+    accept = tables['accept']
+    accept_boundary = tables['accept_boundary']
+    token_types = tables['token_types']
+    translation = {code: class_id for code, class_id in enumerate(tables['ascii_classes'])}
+    # primero se traducen los caracteres ASCII a su clase y después los demás a la clase común
+    classes = non_ascii_regex.sub(chr(tables['other_class']), text.translate(translation)).encode('latin-1')
+    whitespace_match = whitespace_regex.match
+    lexeme_match = lexeme_regex.match
+    text_end = len(text) if endpos is None else endpos
+
+    while pos <= text_end:
+        line_end = text.find('\n', pos, text_end)
+        if line_end == -1:
+            line_end = text_end
+        stop = line_end
+        while stop > pos and text[stop - 1].isspace():
+            stop -= 1
+
+        while True:
+            match = whitespace_match(text, pos, stop)
+            if match:
+                pos = match.end()
+            if pos >= stop:
+                break
+
+            state = 0
+            index = pos
+            best = -1
+            end = pos
+            while index < stop:
+                state = rows[state][classes[index]]
+                if state < 0:
+                    break
+                index += 1
+                found = accept[state]
+                boundary = accept_boundary[state]
+                # \b al final del patrón: el último caracter y el siguiente deben ser uno de palabra y el otro no
+                if boundary >= 0 and (found < 0 or boundary < found):
+                    before = text[index - 1]
+                    after = text[index] if index < stop else ' '
+                    if (before.isalnum() or before == '_') != (after.isalnum() or after == '_'):
+                        found = boundary
+                if found >= 0 and (best < 0 or found <= best):
+                    best = found
+                    end = index
+            if best >= 0:
+                yield line_num, token_types[best], pos, end
+            else:
+                end = stop if text[pos] in quote_characters else lexeme_match(text, pos, stop).end()
+                yield line_num, None, pos, end
+            pos = end
+
+        pos = line_end + 1
+        line_num += 1
+
+# función para el análisis léxico con el DFA generado
+def dfa_lexic_analyzer(code, partial=False):
+    """Perform lexical analysis with the generated table-driven DFA"""
+    token_table = []
+    errors = []
+    text = code if isinstance(code, str) else '\n'.join(code)
+    for line_num, token_type, start, end in dfa_scan_source(text):
+        if token_type is None:
+            errors.append(lexical_error(line_num, text[start:end]))
+        else:
+            token_table.append({
+                'line': line_num,
+                'type': token_type,
+                'value': text[start:end]
+            })
+
+    if errors and partial:
+        return {'tokens': token_table, 'errors': errors}
+    if errors:
+        return {'errors': errors}
+    else:
+        return {'tokens': token_table}
+
+# motores de análisis léxico disponibles, se seleccionan por nombre
+lexer_engines = {
+    'legacy': legacy_lexic_analyzer,
+    'scanner': scanner_lexic_analyzer,
+    'table': table_lexic_analyzer,
+    'dfa': dfa_lexic_analyzer,
+}
+# motores que aceptan cadenas de varias líneas y comentarios de bloque (analizan el texto completo, no línea por línea)
+multiline_engines = ('scanner', 'table')
+
+#función para el análisis léxico, recibe como parámetro el código dividido en líneas
+# con partial=True, si hay errores léxicos también se devuelven los tokens válidos para poder analizarlos sintácticamente
+# con multiline=True las cadenas pueden cruzar líneas y se aceptan comentarios de bloque ?* ... *?
+def lexic_analyzer(code, engine='scanner', partial=False, multiline=False):
+    """Perform lexical analysis on the code"""
+    try:
+        analyzer = lexer_engines[engine]
+    except KeyError:
+        raise ValueError(f"Unknown lexer engine '{engine}', expected one of: {', '.join(lexer_engines)}")
+    if multiline:
+        if engine not in multiline_engines:
+            raise ValueError(f"Lexer engine '{engine}' does not support multiline literals, use one of: "
+                             f"{', '.join(multiline_engines)}")
+        return analyzer(code, partial, multiline)
+    return analyzer(code, partial)
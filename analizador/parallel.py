@@ -0,0 +1,91 @@
+"""Lexing of large inputs on several processes."""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .lexer import lexic_analyzer, lexical_error, scan_source
+from .tokens import token_codes, token_types
+
+# ANÁLISIS LÉXICO EN PARALELO
+# el lexer no guarda estado entre líneas, así que un archivo grande se puede dividir en trozos de líneas completas y
+# analizar cada trozo en otro proceso. Los trozos pequeños no compensan el costo de enviarlos a otro proceso
+parallel_min_chunk_bytes = 1024 * 1024
+
+# analiza un trozo de código dentro de un proceso trabajador; devuelve los tokens en columnas (más baratas de enviar de
+# regreso que una lista de diccionarios) y los errores léxicos
+def lex_chunk(text, first_line):
+    """Lex a chunk of whole lines, returning (kinds, lines, values, errors)"""
+    kinds = array('B')
+    lines = array('I')
+    values = []
+    errors = []
+    for line_num, token_type, start, end in scan_source(text, first_line):
+        if token_type is None:
+            errors.append(lexical_error(line_num, text[start:end]))
+        else:
+            kinds.append(token_codes[token_type])
+            lines.append(line_num)
+            values.append(text[start:end])
+    return kinds.tobytes(), lines, values, errors
+
+# divide el código en trozos de líneas completas, devuelve tuplas (texto, número de la primera línea)
+def split_chunks(code, chunks):
+    if isinstance(code, str):
+        pieces = []
+        start = 0
+        first_line = 1
+        for index in range(1, chunks + 1):
+            if index == chunks:
+                cut = len(code)
+            else:
+                cut = code.find('\n', max(start, len(code) * index // chunks))
+                if cut == -1:
+                    cut = len(code)
+            if cut < start:
+                continue
+            text = code[start:cut]
+            pieces.append((text, first_line))
+            first_line += text.count('\n') + 1
+            start = cut + 1
+            if start > len(code):
+                break
+        return pieces
+    size = -(-len(code) // chunks)
+    return [('\n'.join(code[index:index + size]), index + 1) for index in range(0, len(code), size)]
+
+# análisis léxico en varios procesos, el resultado es idéntico al de lexic_analyzer
+def parallel_lexic_analyzer(code, workers=None, min_chunk_bytes=None, executor=None):
+    """Lex large inputs in line-aligned chunks on several processes"""
+    workers = workers or os.cpu_count() or 1
+    min_chunk_bytes = min_chunk_bytes or parallel_min_chunk_bytes
+    size = len(code) if isinstance(code, str) else sum(len(line) + 1 for line in code)
+    chunks = min(workers, size // min_chunk_bytes)
+    # los archivos pequeños se quedan en un solo proceso
+    if chunks < 2:
+        return lexic_analyzer(code)
+
+    pieces = split_chunks(code, chunks)
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(pieces)))
+    try:
+        futures = [executor.submit(lex_chunk, text, first_line) for text, first_line in pieces]
+        token_table = []
+        errors = []
+        # los trozos se unen en orden; los números de línea ya son globales porque cada trozo sabe en qué línea empieza
+        for future in futures:
+            kinds, lines, values, chunk_errors = future.result()
+            errors.extend(chunk_errors)
+            if not errors:
+                token_table.extend(
+                    {'line': line_num, 'type': token_types[kind], 'value': value}
+                    for kind, line_num, value in zip(kinds, lines, values)
+                )
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    if errors:
+        return {'errors': errors}
+    else:
+        return {'tokens': token_table}
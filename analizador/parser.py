@@ -0,0 +1,1138 @@
+"""Recursive-descent parser, syntax tree nodes and parser profiling."""
+import json
+import time
+from collections import deque
+
+from .lexer import iter_tokens, lexic_analyzer, scanner_lexic_analyzer
+from .tokens import token_types
+
+# precedencia de los operadores binarios en las expresiones, un número mayor se agrupa primero; ^ asocia a la derecha
+operator_precedence = {'or': 1, 'and': 2, '+': 4, '-': 4, '*': 5, '/': 5, '^': 6}
+comparison_precedence = 3
+right_associative = ('^',)
+# tipos de token que pueden ser operandos de una expresión, además de true y false
+operand_types = ('entero', 'decimal', 'negativo', 'negativo_decimal', 'identificador')
+
+# Descripción declarativa del inicio de las sentencias: cada producción (un método de Parser) con su conjunto FIRST, es
+# decir, los tokens con los que puede empezar, y si el parser consume ese primer token antes de llamarla. A partir de esta
+# descripción se generan las tablas de despacho, así statement() salta directo a la producción en lugar de probar cada
+# palabra clave una por una
+variable_types = ('int', 'float', 'string', 'bool')
+statement_grammar = (
+    ('variable_declaration', [('palabra_clave', value) for value in variable_types], False),
+    ('function_declaration', [('palabra_clave', 'define')], True),
+    ('if_statement', [('palabra_clave', 'if')], True),
+    ('while_statement', [('palabra_clave', 'while')], True),
+    ('range_statement', [('palabra_clave', 'range')], True),
+    ('choose_statement', [('palabra_clave', 'choose')], True),
+    ('else_statement', [('palabra_clave', 'else')], True),
+    ('print_statement', [('palabra_clave', 'print')], True),
+    ('return_statement', [('palabra_clave', 'return')], True),
+)
+
+# códigos enteros de los pares (tipo, valor) que aparecen en la gramática; 0 queda para cualquier otro token
+symbol_codes = {}
+
+def intern_symbol(kind, value):
+    """Return the integer code of a (type, value) token pair, assigning a new one if needed"""
+    return symbol_codes.setdefault((kind, value), len(symbol_codes) + 1)
+
+for production, first_set, consume in statement_grammar:
+    for kind, value in first_set:
+        intern_symbol(kind, value)
+# tipos válidos para variables y parámetros, y para el valor de retorno de una función
+variable_type_codes = frozenset(intern_symbol('palabra_clave', value) for value in variable_types)
+return_type_codes = variable_type_codes | {intern_symbol('palabra_clave', 'void')}
+
+def symbol_code(token):
+    """Integer code of a token dict, 0 if the pair is not part of the grammar"""
+    return symbol_codes.get((token['type'], token['value']), 0)
+
+# Nodos del árbol de sintaxis (AST). Para que el árbol ocupe poco, los nodos usan __slots__ y no copian el texto del código:
+# los nombres, literales, tipos y operadores se guardan como el índice del token en la tabla de tokens. Las hojas de las
+# expresiones son directamente ese índice (un int) y los cuerpos de los bloques son listas de sentencias
+class Node:
+    """Base class of the syntax tree nodes"""
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class Program(Node):
+    __slots__ = ('body',)
+
+    def __init__(self, body):
+        self.body = body
+
+class VarDecl(Node):
+    __slots__ = ('type', 'name', 'value')
+
+    def __init__(self, type, name, value):
+        self.type = type
+        self.name = name
+        self.value = value
+
+class Assign(Node):
+    __slots__ = ('name', 'op', 'value')
+
+    def __init__(self, name, op, value):
+        self.name = name
+        self.op = op
+        self.value = value
+
+class ExprStatement(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+class FunctionDef(Node):
+    __slots__ = ('name', 'returns', 'params', 'body')
+
+    def __init__(self, name, returns, params, body):
+        self.name = name
+        self.returns = returns
+        # lista de pares (tipo, nombre)
+        self.params = params
+        self.body = body
+
+class If(Node):
+    __slots__ = ('test', 'body', 'orelse')
+
+    def __init__(self, test, body, orelse):
+        self.test = test
+        self.body = body
+        # None, otro If (para elif) o un Else
+        self.orelse = orelse
+
+class Else(Node):
+    __slots__ = ('body',)
+
+    def __init__(self, body):
+        self.body = body
+
+class While(Node):
+    __slots__ = ('test', 'body')
+
+    def __init__(self, test, body):
+        self.test = test
+        self.body = body
+
+class Range(Node):
+    __slots__ = ('start', 'end', 'step', 'body')
+
+    def __init__(self, start, end, step, body):
+        self.start = start
+        self.end = end
+        self.step = step
+        self.body = body
+
+class Choose(Node):
+    __slots__ = ('subject', 'cases')
+
+    def __init__(self, subject, cases):
+        self.subject = subject
+        self.cases = cases
+
+class Case(Node):
+    __slots__ = ('value', 'body')
+
+    def __init__(self, value, body):
+        self.value = value
+        self.body = body
+
+class Print(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+class Return(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+class BinOp(Node):
+    __slots__ = ('op', 'left', 'right')
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+# nodos que sólo crea optimize(): un valor calculado al optimizar, que no está en la tabla de tokens (se guarda como un
+# token: su tipo, su texto y la línea de donde salió), y un range con un número fijo de vueltas
+class Constant(Node):
+    __slots__ = ('kind', 'text', 'line')
+
+    def __init__(self, kind, text, line):
+        self.kind = kind
+        self.text = text
+        self.line = line
+
+class Repeat(Node):
+    __slots__ = ('count', 'body')
+
+    def __init__(self, count, body):
+        self.count = count
+        self.body = body
+
+# recorre el árbol sin recursión y devuelve todos sus nodos (las hojas, que son índices de tokens, no se incluyen)
+def iter_nodes(root):
+    """Yield every node of a syntax tree in depth-first order"""
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Node):
+            yield item
+            stack.extend(reversed([getattr(item, name) for name in item.__slots__]))
+        elif isinstance(item, (list, tuple)):
+            stack.extend(reversed(item))
+
+# número máximo de errores de sintaxis que se reportan en modo de recuperación
+max_syntax_errors = 100
+
+# Clase parser, encargada del análisis sintáctico
+class Parser:
+    def __init__(self, tokens, build_ast=False, recover=False, max_errors=max_syntax_errors, memoize=False):
+        self.tokens = tokens
+        self.current_token = None
+        self.token_index = -1
+        self.errors = []
+        self.expression_rpn = []
+        # si build_ast es verdadero, parse() deja el árbol de sintaxis en self.ast; cada bloque que se está analizando
+        # tiene su lista de sentencias en la pila self.blocks
+        self.build_ast = build_ast
+        self.ast = None
+        self.blocks = []
+        # en modo de recuperación (panic mode) una sentencia inválida no detiene el análisis: se reporta el error, se descartan
+        # tokens hasta un punto de sincronización y se continúa, hasta juntar max_errors errores
+        self.recover = recover
+        self.max_errors = max_errors
+        # si los tokens no son una tabla (por ejemplo el generador iter_tokens), se leen bajo demanda
+        # y sólo se guardan en un pequeño búfer los tokens que peek() ya leyó por adelantado
+        self.stream = None
+        self.lookahead = deque()
+        # en modo flujo, mientras haya posiciones guardadas con mark() se conservan los tokens leídos desde la más antigua
+        # (history[0] es el token de la posición history_start), así reset() puede devolverlos
+        self.marks = 0
+        self.history = None
+        self.history_start = 0
+        # tabla packrat de attempt(): (producción, posición) -> (resultado, posición final, notación posfija)
+        self.memo = {} if memoize else None
+        self.memo_hits = 0
+        # bloques start ... end abiertos, del más externo al más interno: parse() analiza las sentencias del último y al llegar
+        # a su final continúa la sentencia que lo abrió, así un anidamiento profundo no usa la recursión de Python. Cada
+        # elemento es (tipo, continuación, estado, origen), donde origen es (token, errores, bloques) al empezar la sentencia
+        self.frames = []
+        self.origin = None
+        if not (hasattr(tokens, '__getitem__') and hasattr(tokens, '__len__')):
+            self.stream = iter(tokens)
+        self.advance()
+
+    # función para iterar entre los tokens de la tabla de tokens
+    def advance(self):
+        # empezamos desde la primera fila
+        self.token_index += 1
+        # en modo flujo se toma el siguiente token del búfer o del iterador
+        if self.stream is not None:
+            if self.lookahead:
+                self.current_token = self.lookahead.popleft()
+            else:
+                self.current_token = next(self.stream, None)
+            if self.history is not None:
+                self.history.append(self.current_token)
+            return self.current_token
+        # revismanos que nos encontremos dentro de la matriz de tokens 
+        # asignamos a la variable self.current_token el valor que estamos leyendo actualmente, o ninguno si es que ya hemos acabado
+        if self.token_index < len(self.tokens):
+            self.current_token = self.tokens[self.token_index]
+        else:
+            self.current_token = None
+        return self.current_token
+
+    # función para leer el token siguiente
+    def peek(self):
+        if self.stream is not None:
+            if not self.lookahead:
+                next_token = next(self.stream, None)
+                if next_token is None:
+                    return None
+                self.lookahead.append(next_token)
+            return self.lookahead[0]
+        peek_index = self.token_index + 1
+        if peek_index < len(self.tokens):
+            return self.tokens[peek_index]
+        return None
+
+    # función para saber si el token analizado es igual al patrón con el que se le compara
+    def match(self, expected_type, expected_value=None):
+        # sil el tipo de token es igual al esperado y el valor del token es igual al valor esperado devolver el token en cuestión y avanzar al siguiente token
+        if self.current_token and self.current_token['type'] == expected_type:
+            # a veces no se espera un valor específico, sólo un tipo de tokens, pues pueden tomar cualquier valor (p. ej. variables o números)
+            if expected_value is None or self.current_token['value'] == expected_value:
+                token = self.current_token
+                self.advance()
+                return token
+        # devolver nulo si no se haya una coincidencia
+        return None
+
+    # Posiciones para el análisis especulativo: mark() guarda la posición actual (el token y cuántos errores había), reset()
+    # regresa a ella descartando los tokens leídos y los errores reportados después, y release() indica que ya no se va a
+    # regresar (en modo flujo así se dejan de guardar los tokens leídos)
+    def mark(self):
+        self.marks += 1
+        if self.stream is not None and self.history is None:
+            self.history = [self.current_token]
+            self.history_start = self.token_index
+        return (self.token_index, len(self.errors))
+
+    def reset(self, position):
+        index, error_count = position
+        del self.errors[error_count:]
+        if self.stream is not None:
+            offset = index - self.history_start
+            # los tokens leídos después de la posición vuelven al búfer, antes de los que peek() ya había leído
+            self.lookahead.extendleft(reversed(self.history[offset + 1:]))
+            del self.history[offset + 1:]
+            self.current_token = self.history[offset]
+            self.token_index = index
+        else:
+            self.token_index = index - 1
+            self.advance()
+        self.release(position)
+
+    def release(self, position):
+        self.marks -= 1
+        if not self.marks:
+            self.history = None
+
+    # avanza hasta la posición index (hacia adelante)
+    def seek(self, index):
+        if self.stream is None:
+            self.token_index = index - 1
+            self.advance()
+        while self.token_index < index:
+            self.advance()
+
+    # Prueba una producción de forma especulativa: si falla, regresa a donde empezó sin dejar errores, así quien la llama
+    # puede probar otra alternativa. Con memoize=True el resultado se guarda por (producción, posición) y otro intento en la
+    # misma posición no vuelve a revisar los tokens (packrat); sólo se usa con producciones que no agregan nodos al árbol,
+    # como expression
+    def attempt(self, production):
+        """Run a production speculatively, rewinding on failure; returns its result"""
+        key = (production, self.token_index)
+        if self.memo is not None:
+            entry = self.memo.get(key)
+            if entry is not None:
+                self.memo_hits += 1
+                success, end, rpn = entry
+                if success:
+                    self.seek(end)
+                    self.expression_rpn = rpn
+                return success
+        position = self.mark()
+        success = getattr(self, production)()
+        if success:
+            self.release(position)
+        else:
+            self.reset(position)
+        if self.memo is not None:
+            self.memo[key] = (success, self.token_index, self.expression_rpn)
+        return success
+
+    # valor de print, return o case: un texto o una expresión (que ya incluye los números, las variables, true y false); se
+    # elige por el token actual, así una expresión que empieza con un número o una variable no se toma como un solo token
+    def value(self):
+        if self.match('texto'):
+            return True
+        return self.expression()
+
+    # función para reportar errores al usuario, junto a la línea en la que se encuentra dicho error
+    def error(self, message):
+        line = self.current_token['line'] if self.current_token else 'unknown'
+        self.errors.append(f"Syntax error at line {line}: {message}")
+        return False
+
+    # funciones para construir el árbol: open_block() empieza la lista de sentencias de un bloque, close_block() la devuelve
+    # y add_node() agrega una sentencia al bloque actual. Si no se construye el árbol no hacen nada
+    def open_block(self):
+        if self.build_ast:
+            self.blocks.append([])
+
+    def close_block(self):
+        if self.build_ast:
+            return self.blocks.pop()
+        return None
+
+    def add_node(self, node):
+        self.blocks[-1].append(node)
+        return True
+
+    # árbol de la última expresión analizada, a partir de su notación posfija
+    def expression_tree(self):
+        stack = []
+        for index in self.expression_rpn:
+            if index < 0:
+                right = stack.pop()
+                stack[-1] = BinOp(~index, stack[-1], right)
+            else:
+                stack.append(index)
+        return stack[0]
+
+    # nodo del valor que empieza en el token start: si ocupa un solo token es el índice de ese token, si no es una expresión
+    def value_node(self, start):
+        if self.token_index == start + 1:
+            return start
+        return self.expression_tree()
+
+    # función principal, itera a través de los tokens
+    def parse(self):
+        """Main parsing method"""
+        self.blocks = []
+        self.frames = []
+        self.open_block()
+        while self.current_token or self.frames:
+            if self.frames and self.block_ended(self.frames[-1][0]):
+                # terminó el bloque abierto más interno, se continúa la sentencia que lo abrió
+                _, finish, state, self.origin = self.frames.pop()
+                success = finish(state, self.close_block())
+            elif not self.frames and self.current_token['type'] == 'comentario':
+                # ignora comentarios
+                self.advance()
+                continue
+            else:
+                self.origin = (self.token_index, len(self.errors), len(self.blocks))
+                success = self.statement()
+            # si la función statement retorna falso (encuentra una línea de código no válida), retorna falso
+            # (en modo de recuperación se sincroniza y se continúa con la siguiente sentencia)
+            if not success and not self.recover_statement(*self.origin) and not self.unwind():
+                if not self.recover:
+                    return False
+                break
+        # en modo de recuperación el árbol se construye con las sentencias válidas, aunque haya errores
+        del self.errors[self.max_errors:]
+        if self.build_ast:
+            self.ast = Program(self.blocks[0])
+        # retorna verdadero si no hay errores
+        return len(self.errors) == 0
+
+    # abre el bloque start ... end de la sentencia que se está analizando: parse() analiza sus sentencias y al llegar a su
+    # final llama a finish(state, cuerpo) para terminar la sentencia. kind es 'end' para un bloque, 'case' para el cuerpo de
+    # un case (termina antes del siguiente 'case' o del 'end' del choose) y 'skip' para un bloque que synchronize() analiza
+    def enter_block(self, finish, state, kind='end'):
+        self.open_block()
+        self.frames.append((kind, finish, state, self.origin))
+        return True
+
+    def block_ended(self, kind):
+        if kind == 'case':
+            token = self.current_token
+            return token is not None and token['type'] == 'palabra_clave' and token['value'] in ('case', 'end')
+        return self.match('palabra_clave', 'end') is not None
+
+    # una sentencia falló sin poder recuperarse: se descartan los bloques abiertos hasta el más cercano que synchronize()
+    # estaba analizando, y se sigue sincronizando después de él; si no hay ninguno el análisis termina
+    def unwind(self):
+        while self.frames:
+            kind, finish, state, origin = self.frames.pop()
+            if kind == 'skip':
+                if self.build_ast:
+                    del self.blocks[origin[2] + 1:]
+                self.origin = origin
+                return finish(state, self.close_block())
+        return False
+
+    # se llama cuando falla la sentencia que empezó en el token start. Fuera del modo de recuperación (o si ya se juntaron
+    # max_errors errores, o se acabaron los tokens) devuelve falso para que el error detenga el análisis; si no, se asegura
+    # de que el error quedó reportado, descarta los bloques a medio construir de esa sentencia y sincroniza
+    def recover_statement(self, start, error_count, depth):
+        if not self.recover or len(self.errors) >= self.max_errors:
+            return False
+        if len(self.errors) == error_count:
+            if self.current_token:
+                self.error(f"Unexpected token '{self.current_token['value']}'")
+            else:
+                self.error("Unexpected end of file")
+        if self.build_ast:
+            del self.blocks[depth:]
+        if not self.current_token:
+            return False
+        # si la sentencia no consumió ningún token, se descarta el token que la hizo fallar para no repetir el mismo error
+        if self.token_index == start:
+            self.advance()
+        self.synchronize()
+        return True
+
+    # descarta tokens hasta el final de la sentencia (un ';', que se consume) o el inicio de la siguiente: 'end' o 'case' de
+    # un bloque, o una palabra clave que abre una sentencia. Si se encuentra el 'start' de la sentencia que falló, su bloque
+    # se analiza de todas formas (incluyendo los elif/else que le sigan), así su 'end' no se confunde con el del bloque que
+    # la contiene
+    def synchronize(self):
+        while self.current_token:
+            token = self.current_token
+            if token['type'] == 'delimiter' and token['value'] == ';':
+                self.advance()
+                return
+            if token['type'] == 'palabra_clave':
+                if token['value'] in ('end', 'case'):
+                    return
+                if token['value'] == 'start':
+                    self.advance()
+                    self.enter_block(self.skipped_block, None, 'skip')
+                    return
+                if statement_table[symbol_code(token)] is not None:
+                    return
+            self.advance()
+
+    # al terminar un bloque que analizó synchronize() se sigue descartando si le sigue un elif o un else de la misma sentencia
+    def skipped_block(self, state, body):
+        if (self.current_token and self.current_token['type'] == 'palabra_clave' and
+                self.current_token['value'] in ('elif', 'else')):
+            self.advance()
+            self.synchronize()
+        return True
+
+    # como match(), pero acepta cualquier token cuyo código esté en el conjunto codes
+    def match_set(self, codes):
+        token = self.current_token
+        if token and symbol_codes.get((token['type'], token['value']), 0) in codes:
+            self.advance()
+            return token
+        return None
+
+    # analiza las líneas de código para ver si son válidas, si la línea de código sigue un patrón esperado, retorna verdadero, si no, falso
+    def statement(self):    
+        """Parse a statement"""
+
+        # ignora comentarios
+        skipped_comment = False
+        while self.current_token and self.current_token['type'] == 'comentario':
+                self.advance()
+                skipped_comment = True
+                # si el código sólo contiene comentarios, termina la ejecución
+                if not self.current_token:
+                    return True
+
+        # si después de los comentarios sigue el cierre del bloque (o el siguiente caso), no hay sentencia que analizar y
+        # el bloque que llamó a statement() se encarga de ese token
+        if (skipped_comment and self.current_token['type'] == 'palabra_clave' and
+                self.current_token['value'] in ('end', 'case')):
+            return True
+
+        # si se acabaron los tokens dentro de un bloque (falta su 'end'), se reporta en lugar de fallar
+        if not self.current_token:
+            return self.error("Unexpected end of file, missing 'end'")
+
+        # análisis de patrones, si el token es el inicio de alguna producción de statement_grammar (un tipo de dato o una palabra
+        # reservada), la tabla de despacho da directamente la función que valida la estructura que sigue a dicho token
+        # si estas funciones validan el token, harán que la función statement retorne verdadero, si no, retornará falso
+        entry = self.dispatch_table[symbol_codes.get((self.current_token['type'], self.current_token['value']), 0)]
+        if entry is not None:
+            production, consume = entry
+            if consume:
+                self.advance()
+            return production(self)
+        
+        # si no empieza con una palabra reservada, busca expresiones matemáticas o uso de variables
+        return self.expression_statement()
+
+    """
+    Todas estas son las funciones específicas que son llamadas dependiendo del patrón que se ecnuentre en el token
+    Por ejemplo, si el token analizado es la palabra if, el programa llamará a la función if_statement() la cual validará que la estructura que sigue a dicho if sea
+    correcta.
+    Todas las funciones retornan un verdadero o un falso, porque como ya se mencionó, la función statement (que es de donde se llama a estas otras funciones) devuelve
+    verdadero o falso dependiendo de si se encuentra un patrón definido
+
+    """
+    # analiza la estructura de una declaración de variables
+    def variable_declaration(self):
+        """Parse variable declaration"""
+        # para leer variables, el tipo de dato sólo abre una declaración si adelante hay una variable
+        next_token = self.peek()
+        if not (next_token and next_token['type'] == 'identificador'):
+            return self.error("Expected variable after identifier")
+        type_index = self.token_index
+        self.advance()  # Consume the type
+        
+        if not self.match('identificador'):
+            return self.error("Expected variable name after type")
+        # si lo que sigue al nombre es una expresión falta el '='; se prueba sin dejar tokens consumidos ni errores
+        if self.attempt('expression'):
+           return self.error("Expected = before assingment") 
+        
+        # Optional initialization
+        value = None
+        if self.match('asgm_op', '='):
+            start = self.token_index
+            if not self.value():
+                return self.error("Expected expression or string after '='")
+            if self.build_ast:
+                value = self.value_node(start)
+        
+        if not self.match('delimiter', ';'):
+            return self.error("Expected ';' after declaration")
+        
+        if self.build_ast:
+            return self.add_node(VarDecl(type_index, type_index + 1, value))
+        return True
+
+    # analiza la estructura de una expresión que use variables (para evitar que el programa mande error si se está usando una variable ya declarada y por lo tanto
+    # no lleva un tipo de dato)
+    def expression_statement(self):
+        """Handle expressions that might include variable usage"""
+        # Allow already-declared variables here
+        name = self.token_index
+        if self.match('identificador'):
+            # Could be assignment or usage
+            if self.match('asgm_op'):  # =, +=, etc.
+                if not self.expression():
+                    return self.error("Expected expression after assignment")
+                if not self.match('delimiter', ';'):
+                    return self.error("Expected ';' after statement")
+                if self.build_ast:
+                    return self.add_node(Assign(name, name + 1, self.expression_tree()))
+                return True
+            # Else it's just a variable usage
+            
+            if self.build_ast:
+                return self.add_node(ExprStatement(name))
+            return True
+    
+        if not self.expression():
+            return False
+        if self.build_ast:
+            return self.add_node(ExprStatement(self.expression_tree()))
+        return True
+
+    # analiza la estructura de una declaración de función
+    def function_declaration(self):
+        """Parse function declaration"""
+        name = self.token_index
+        if not self.match('identificador'):
+            return self.error("Expected function name after 'define'")
+        if not self.match('palabra_clave', 'returns'):
+            return self.error("Expected 'returns' in function declaration")
+        returns = self.token_index
+        if not self.match_set(return_type_codes):
+            return self.error("Expected return type after 'returns'")
+        if not self.match('delimiter', '('):
+            return self.error("Expected '(' for parameters")
+        
+        # Parameters
+        params = []
+
+        if not self.match('delimiter', ')'):  # Check if parameter list is not empty
+            while True:
+                # Parse parameter type
+                param_type = self.token_index
+                if not self.match_set(variable_type_codes):
+                    return self.error("Expected parameter type")
+                
+                # Parse parameter name
+                if not self.match('identificador'):
+                    return self.error("Expected parameter name")
+                params.append((param_type, param_type + 1))
+                
+                # Check for closing parenthesis or comma
+                if self.match('delimiter', ')'):
+                    break  # End of parameters
+                if not self.match('delimiter', ','):
+                    return self.error("Expected ',' or ')' after parameter")
+    
+        # After parameter list
+        if not self.match('delimiter', ':'):
+            return self.error("Expected ':' before function body")
+        if not self.match('palabra_clave', 'start'):
+            return self.error("Expected 'start' for function body")
+            
+        # Function body
+        return self.enter_block(self.function_body, (name, returns, params))
+
+    def function_body(self, header, body):
+        if self.build_ast:
+            return self.add_node(FunctionDef(*header, body))
+        return True
+
+    # analiza la estructura de un bloque condicional if
+    def if_statement(self):
+        """Parse if statement"""
+        if not self.match('delimiter', '('):
+            return self.error("Expected '(' after 'if'")
+        if not self.condition():
+            return False
+        test = self.expression_tree() if self.build_ast else None
+        if not self.match('delimiter', ')'):
+            return self.error("Expected ')' after condition")
+        if not self.match('delimiter', ':'):
+            return self.error("Expected ':' after condition")
+        if not self.match('palabra_clave', 'start'):
+            return self.error("Expected 'start' for if body")
+        
+        # If body
+        return self.enter_block(self.if_body, test)
+
+    def if_body(self, test, body):
+        return self.branches([(test, body, [])])
+
+    # Optional elif/else
+    # después del cuerpo de un if o de un elif puede seguir otro elif o un else de la misma sentencia. levels son las ramas
+    # abiertas de la cadena, del if al último elif, como (condición, cuerpo, ramas que le siguen): un elif abre una rama más,
+    # una rama se cierra cuando no le sigue otro elif o después de su else, y entonces la anterior vuelve a buscar un elif o
+    # un else. Las ramas se analizan una tras otra en este ciclo, así una cadena larga de elif no se anida
+    def branches(self, levels):
+        while True:
+            if self.match('palabra_clave', 'elif'):
+                return self.elif_statement(levels)
+            if self.match('palabra_clave', 'else'):
+                return self.else_statement(levels)
+            node = self.close_branch(levels)
+            if not levels:
+                return self.add_node(node) if self.build_ast else True
+
+    # cierra la última rama abierta: su If tiene como orelse la primera rama que le siguió, y se agrega a la rama anterior
+    def close_branch(self, levels):
+        test, body, orelse = levels.pop()
+        if not self.build_ast:
+            return None
+        node = If(test, body, orelse[0] if orelse else None)
+        if levels:
+            levels[-1][2].append(node)
+        return node
+
+    # analiza la estructura de un bloque condicional elif
+    def elif_statement(self, levels):
+        """Parse elif statement"""
+        if not self.match('delimiter', '('):
+            return self.error("Expected '(' after 'elif'")
+        if not self.condition():
+            return False
+        test = self.expression_tree() if self.build_ast else None
+        if not self.match('delimiter', ')'):
+            return self.error("Expected ')' after condition")
+        
+        if not self.match('delimiter', ':'):
+            return self.error("Expected ':' after condition")
+        if not self.match('palabra_clave', 'start'):
+            return self.error("Expected 'start' for elif body")
+        
+        return self.enter_block(self.elif_body, (levels, test))
+
+    def elif_body(self, state, body):
+        levels, test = state
+        levels.append((test, body, []))
+        return self.branches(levels)
+
+    # analiza la estructura de un ciclo while
+    def while_statement(self):
+        """Parse while statement"""
+        if not self.match('delimiter', '('):
+            return self.error("Expected '(' after 'while'")
+        if not self.condition():
+            return False
+        test = self.expression_tree() if self.build_ast else None
+        if not self.match('delimiter', ')'):
+            return self.error("Expected ')' after condition")
+        if not self.match('delimiter', ':'):
+            return self.error("Expected ':' after condition")
+        if not self.match('palabra_clave', 'start'):
+            return self.error("Expected 'start' for while body")
+        
+        return self.enter_block(self.while_body, test)
+
+    def while_body(self, test, body):
+        if self.build_ast:
+            return self.add_node(While(test, body))
+        return True
+    
+    # analiza la estructura de un ciclo range
+    def range_statement(self):
+        """Parse range statement"""
+        if not self.match('delimiter', '('):
+            return self.error("Expected '(' after 'range'")
+        
+        start = self.token_index
+        if not self.expression():
+            return self.error("Expected start value")
+        if self.build_ast:
+            start = self.value_node(start)
+        
+        if not self.match('delimiter', ','):
+            return self.error("Expected comma")
+        
+        end = self.token_index
+        if not self.expression():
+            return self.error("Expected end value")
+        if self.build_ast:
+            end = self.value_node(end)
+        
+        if not self.match('delimiter', ','):
+            return self.error("Expected comma")
+
+        step = self.token_index
+        if not self.expression():
+            return self.error("Expected step value")
+        if self.build_ast:
+            step = self.value_node(step)
+
+        if not self.match('delimiter', ')'):
+            return self.error("Expected ')'")
+        if not self.match('delimiter', ':'):
+            return self.error("Expected ':' after ´)")
+        if not self.match('palabra_clave', 'start'):
+            return self.error("Expected 'start' for range body")
+        
+        return self.enter_block(self.range_body, (start, end, step))
+
+    def range_body(self, bounds, body):
+        if self.build_ast:
+            return self.add_node(Range(*bounds, body))
+        return True
+
+    # analiza la estructura de una instrucción print
+    def print_statement(self):
+        """Parse print statement"""
+        if not self.match('delimiter', '('):
+            return self.error("Expected '(' after 'print'")
+        
+        start = self.token_index
+        if not self.value():
+                return self.error("Missing text to print")
+        value = self.value_node(start) if self.build_ast else None
+        
+        if not self.match('delimiter', ')'):
+            return self.error("Expected ')")
+        
+        if not self.match('delimiter', ';'):
+            return self.error("Missing ;")
+        
+        if self.build_ast:
+            return self.add_node(Print(value))
+        return True
+
+    # analiza la estructura de una condición (usado por algunos bloques condicionales)
+    def condition(self):
+        """Parse a condition"""
+        # las comparaciones y los operadores and/or forman parte de la expresión, con su precedencia
+        return self.expression()
+
+    # analiza la estructura de un bloque choose
+    def choose_statement(self):
+        """Parse choose statement with proper case handling"""
+        if not self.match('delimiter', '('):
+            return self.error("Expected '(' after 'choose'")
+        subject = self.token_index
+        if not self.match('identificador'):
+            return self.error("Expected a variable inside choose statement")
+        if not self.match('delimiter', ')'):
+            return self.error("Expected ')' after variable")
+        if not self.match('delimiter', ':'):
+            return self.error("Expected ':' after choose clause")
+        if not self.match('palabra_clave', 'start'):
+            return self.error("Expected 'start' for choose body")
+
+        # Parse case statements until we hit 'end'
+        self.open_block()
+        return self.choose_cases(subject)
+
+    # sigue el cuerpo de un choose, al empezar y después de cada case
+    def choose_cases(self, subject):
+        # Check for closing 'end' first
+        if self.match('palabra_clave', 'end'):
+            if self.build_ast:
+                return self.add_node(Choose(subject, self.close_block()))
+            return True
+        
+        # Check for unexpected EOF
+        if not self.current_token:
+            return self.error("Missing 'end' for choose statement")
+        
+        # Require 'case' keyword
+        if not self.match('palabra_clave', 'case'):
+            return self.error("Expected 'case' or 'end' in choose block")
+        
+        # Parse the case statement
+        return self.case_statement(subject)
+
+    # analiza la estructura de un bloque else; levels son las ramas de la cadena if/elif a la que pertenece (None para un
+    # else suelto)
+    def else_statement(self, levels=None):       
+        if not self.match('delimiter', ':'):
+            return self.error("Expected ':' after else")
+        if not self.match('palabra_clave', 'start'):
+            return self.error("Expected 'start' for else body")
+        
+        return self.enter_block(self.else_body, levels)
+
+    def else_body(self, levels, body):
+        if levels is None:
+            return self.add_node(Else(body)) if self.build_ast else True
+        if self.build_ast:
+            levels[-1][2].append(Else(body))
+        node = self.close_branch(levels)
+        if not levels:
+            return self.add_node(node) if self.build_ast else True
+        return self.branches(levels)
+
+    # analiza la estructura de un bloque condicional case
+    def case_statement(self, subject):
+        """Parse case statement with proper value and body handling"""
+        # Parse case value (identifier, literal, or expression)
+        start = self.token_index
+        if not self.value():
+            return self.error("Expected value after 'case'")
+        value = self.value_node(start) if self.build_ast else None
+
+        # Require colon after case value
+        if not self.match('delimiter', ':'):
+            return self.error("Expected ':' after case value")
+
+        # Parse case body statements until next case or end
+        return self.enter_block(self.case_body, (subject, value), 'case')
+
+    def case_body(self, state, body):
+        subject, value = state
+        if self.build_ast:
+            self.add_node(Case(value, body))
+        return self.choose_cases(subject)
+
+    # analiza la estructura de una instrucción return
+    def return_statement(self):
+        start = self.token_index
+        if not self.value():
+                 return self.error("Expected variable, number, string or expression after 'return'")
+        value = self.value_node(start) if self.build_ast else None
+        if not self.match('delimiter', ';'):
+            return self.error("Missing ;")
+        
+        if self.build_ast:
+            return self.add_node(Return(value))
+        return True
+
+    # analiza la estructura de una expresión (aritmética, de comparación o lógica) sin recursión: los operandos y operadores
+    # se leen en un ciclo y la precedencia se resuelve con una pila de operadores (algoritmo shunting-yard). El resultado
+    # queda en self.expression_rpn como la lista de índices de tokens en notación posfija; los operadores se guardan como ~índice
+    # (un número negativo) para distinguirlos de los operandos sin volver a leer los tokens
+    def expression(self):
+        """Parse an expression with an explicit-stack precedence climber"""
+        output = []
+        operators = []
+        depth = 0
+        while True:
+            # se espera un operando, antes pueden venir paréntesis que abren
+            while self.is_open_paren(self.current_token):
+                operators.append(None)
+                depth += 1
+                self.advance()
+
+            if not self.is_operand(self.current_token):
+                if operators and operators[-1] is not None:
+                    return self.error("Expected valid expression after operator")
+                if depth:
+                    return self.error("Expected expression after '('")
+                return False
+            output.append(self.token_index)
+            self.advance()
+
+            # después de un operando pueden venir paréntesis que cierran
+            while depth and self.current_token and self.current_token['type'] == 'delimiter' and \
+                    self.current_token['value'] == ')':
+                while operators[-1] is not None:
+                    output.append(~operators.pop()[1])
+                operators.pop()
+                depth -= 1
+                self.advance()
+
+            precedence = self.binary_precedence(self.current_token)
+            if precedence is None:
+                break
+            # se sacan de la pila los operadores que se agrupan antes que el nuevo
+            right = self.current_token['value'] in right_associative
+            while operators and operators[-1] is not None and (
+                    operators[-1][0] > precedence or (operators[-1][0] == precedence and not right)):
+                output.append(~operators.pop()[1])
+            operators.append((precedence, self.token_index))
+            self.advance()
+
+        if self.is_operand(self.current_token) or self.is_open_paren(self.current_token):
+            return self.error("Mssing operator between numbers")
+        if depth:
+            return self.error("Missing closing parenthesis")
+        while operators:
+            output.append(~operators.pop()[1])
+        self.expression_rpn = output
+        return True
+
+    # indica si un token puede ser operando de una expresión (números, variables, true y false)
+    def is_operand(self, token):
+        if token is None:
+            return False
+        if token['type'] == 'palabra_clave':
+            return token['value'] in ('true', 'false')
+        return token['type'] in operand_types
+
+    def is_open_paren(self, token):
+        return token is not None and token['type'] == 'delimiter' and token['value'] == '('
+
+    # precedencia del token si es un operador binario, None si no lo es
+    def binary_precedence(self, token):
+        if token is None:
+            return None
+        if token['type'] == 'cmp_op':
+            return comparison_precedence
+        if token['type'] in ('arit_op', 'bool_op'):
+            return operator_precedence.get(token['value'], operator_precedence['*'])
+        return None
+
+# tabla de despacho de statement(), generada a partir de statement_grammar: para cada código de token, la producción que
+# empieza con él y si consume ese token. Si dos producciones comparten un token de su conjunto FIRST la gramática no se puede
+# analizar con un solo token de anticipación y se reporta al cargar el módulo
+def build_dispatch_table(grammar):
+    """Build a list indexed by symbol code with the (production, consume) entry for each FIRST token"""
+    table = [None] * (len(symbol_codes) + 1)
+    for production, first_set, consume in grammar:
+        for kind, value in first_set:
+            code = symbol_codes[(kind, value)]
+            if table[code] is not None:
+                raise ValueError(f"Grammar conflict: '{value}' starts both {table[code][0].__name__} and {production}")
+            table[code] = (getattr(Parser, production), consume)
+    return table
+
+statement_table = build_dispatch_table(statement_grammar)
+# statement() lee la tabla desde la instancia para que Profile pueda sustituirla en un parser sin tocar los demás
+Parser.dispatch_table = statement_table
+
+# producciones del parser que Profile mide (además de match y match_set, que muestran cuántos intentos fallan)
+profiled_productions = (
+    'statement', 'variable_declaration', 'expression_statement', 'function_declaration', 'if_statement',
+    'elif_statement', 'while_statement', 'range_statement', 'print_statement', 'condition', 'choose_statement',
+    'else_statement', 'case_statement', 'return_statement', 'expression', 'match', 'match_set',
+)
+
+# Instrumentación opcional. No cuesta nada mientras no se usa: el análisis normal no revisa ninguna bandera, Profile cuenta
+# los tokens del resultado del lexer y reemplaza los métodos de un parser en particular por versiones que miden cada llamada
+class Profile:
+    """Per-pattern lexer counters and per-production parser counters and timings"""
+
+    def __init__(self):
+        # por patrón de token_patterns: cuántos tokens reconoció
+        self.pattern_matches = {token_type: 0 for token_type in token_types}
+        self.unrecognized = 0
+        # por producción: [llamadas, segundos acumulados, fallas con error, intentos fallidos sin error (retrocesos)]
+        self.productions = {}
+
+    # análisis léxico contando los tokens por patrón. La expresión maestra prueba las alternativas en el orden de
+    # token_patterns y se queda con la primera que coincide, así que un token del patrón k costó un intento en cada patrón
+    # de 0 a k, y un lexema no reconocido uno en todos; los intentos se calculan a partir de esos conteos
+    def lex(self, code, partial=True):
+        """Run the scanner lexer and count the tokens recognized by each pattern"""
+        result = scanner_lexic_analyzer(code, partial)
+        for token in result.get('tokens', ()):
+            self.pattern_matches[token['type']] += 1
+        self.unrecognized += len(result.get('errors', ()))
+        return result
+
+    def pattern_attempts(self):
+        attempts = {}
+        remaining = self.unrecognized + sum(self.pattern_matches.values())
+        for token_type in token_types:
+            attempts[token_type] = remaining
+            remaining -= self.pattern_matches[token_type]
+        return attempts
+
+    # reemplaza las producciones de un parser por versiones que cuentan las llamadas, el tiempo (incluyendo el de las
+    # producciones que llaman, pero no el de las sentencias de su bloque, que parse() analiza después) y si fallaron
+    # reportando un error o sólo fue un intento que el llamador descarta
+    def attach(self, parser):
+        """Instrument a Parser instance in place and return it"""
+        clock = time.perf_counter
+        errors = parser.errors
+        for name in profiled_productions:
+            method = getattr(parser, name)
+            stats = self.productions.setdefault(name, [0, 0.0, 0, 0])
+
+            def wrapper(*args, method=method, stats=stats):
+                error_count = len(errors)
+                start = clock()
+                result = method(*args)
+                stats[1] += clock() - start
+                stats[0] += 1
+                if not result:
+                    if len(errors) == error_count:
+                        stats[3] += 1
+                    else:
+                        stats[2] += 1
+                return result
+            setattr(parser, name, wrapper)
+        # la tabla de despacho guarda las funciones de la clase, se cambia por una que llama a los métodos medidos
+        parser.dispatch_table = [
+            None if entry is None else (lambda _, wrapped=getattr(parser, entry[0].__name__): wrapped(), entry[1])
+            for entry in statement_table
+        ]
+        return parser
+
+    def to_dict(self):
+        attempts = self.pattern_attempts()
+        return {
+            'lexer': {
+                token_type: {'attempts': attempts[token_type], 'matches': matches}
+                for token_type, matches in self.pattern_matches.items()
+            },
+            'unrecognized': self.unrecognized,
+            'parser': {
+                name: {'calls': calls, 'seconds': seconds, 'failures': failures, 'backtracks': backtracks}
+                for name, (calls, seconds, failures, backtracks) in self.productions.items()
+            },
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    # tabla legible; las producciones se ordenan por tiempo acumulado
+    def table(self):
+        lines = [f"{'pattern':18} {'attempts':>10} {'matches':>10} {'hit %':>7}"]
+        for token_type, counts in self.to_dict()['lexer'].items():
+            rate = counts['matches'] / counts['attempts'] * 100 if counts['attempts'] else 0
+            lines.append(f"{token_type:18} {counts['attempts']:>10} {counts['matches']:>10} {rate:>7.1f}")
+        lines.append(f"{'(unrecognized)':18} {'':>10} {self.unrecognized:>10}")
+        lines.append('')
+        lines.append(f"{'production':22} {'calls':>9} {'cum. ms':>10} {'us/call':>8} {'failures':>9} {'backtracks':>11}")
+        for name, (calls, seconds, failures, backtracks) in sorted(self.productions.items(), key=lambda item: -item[1][1]):
+            if calls:
+                lines.append(f"{name:22} {calls:>9} {seconds * 1e3:>10.2f} {seconds / calls * 1e6:>8.2f} "
+                             f"{failures:>9} {backtracks:>11}")
+        return '\n'.join(lines)
+
+# analiza un texto con la instrumentación activada
+def profile_source(text, recover=True):
+    """Lex and parse text with instrumentation, returning the Profile"""
+    profile = Profile()
+    result = profile.lex(text)
+    parser = profile.attach(Parser(result['tokens'], recover=recover))
+    parser.parse()
+    return profile
+
+# análisis léxico y sintáctico en flujo: el parser pide los tokens al lexer conforme los necesita, así la memoria usada no
+# depende del tamaño del archivo y el primer error de sintaxis aparece sin tener que analizar el resto del archivo
+def analyze_stream(file_or_iterable):
+    """Lex and parse lazily, stopping at the first syntax error"""
+    lex_errors = []
+    parser = Parser(iter_tokens(file_or_iterable, lex_errors))
+    parsed = parser.parse()
+    return {
+        'parsed': parsed and not lex_errors,
+        'errors': lex_errors,
+        'syntax_errors': parser.errors
+    }
+
+# análisis completo de un texto en una sola pasada: análisis léxico y análisis sintáctico con recuperación de errores de los
+# tokens válidos, así se reportan todos los errores léxicos y de sintaxis a la vez
+def analyze_source(text, multiline=False):
+    """Lex and parse source text, returning tokens, every error found and the parse outcome"""
+    result = lexic_analyzer(text, partial=True, multiline=multiline)
+    parser = Parser(result['tokens'], recover=True)
+    result['parsed'] = parser.parse() and 'errors' not in result
+    result['syntax_errors'] = parser.errors
+    return result
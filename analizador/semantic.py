@@ -0,0 +1,369 @@
+"""Semantic analysis: interned identifiers, nested scopes, slot resolution and type checks."""
+from array import array
+
+from .lexer import lexic_analyzer
+from .parser import BinOp, Constant, Parser
+
+# ANÁLISIS SEMÁNTICO
+# Se recorre una sola vez el árbol de Parser(build_ast=True). Cada nombre (@variable o $función) se convierte en un entero
+# la primera vez que aparece, y a partir de ahí las búsquedas comparan enteros. Los ámbitos son el programa principal,
+# el cuerpo de cada define y cada bloque start ... end. En lugar de un diccionario por ámbito se usa una sola tabla de
+# nombre -> pila de declaraciones visibles: declarar agrega a la pila del nombre, cerrar el ámbito quita lo que se declaró
+# en él, y buscar es tomar el último elemento, sin importar cuántos ámbitos haya abiertos.
+# Las ranuras son las que asigna Compiler al árbol sin optimizar: las variables del programa principal (también las de sus
+# bloques) son globales y cada función tiene su propio marco, con sus parámetros en las primeras ranuras. Hay una ranura por
+# nombre en cada marco, así una variable que oculta a otra del mismo marco comparte su ranura.
+# Las funciones son globales y se pueden usar antes de definirse, así que un $nombre que aún no se conoce se resuelve al
+# terminar el recorrido
+
+# tipo del valor de cada tipo de token literal
+literal_types = {'entero': 'int', 'negativo': 'int', 'decimal': 'float', 'negativo_decimal': 'float', 'texto': 'string'}
+numeric_types = ('int', 'float')
+# operadores aritméticos; + también une texto con cualquier valor
+arithmetic_operators = ('+', '-', '*', '/', '^')
+comparison_operators = ('<', '>', '<=', '>=', '<>', '><', '==')
+# marco de las variables del programa principal
+global_frame = -1
+
+class Symbol:
+    """A declared variable, parameter or function"""
+    __slots__ = ('name', 'kind', 'type', 'slot', 'frame', 'depth', 'line')
+
+    def __init__(self, name, kind, type, slot, frame, depth, line):
+        # name es el código del nombre en SemanticAnalyzer.names
+        self.name = name
+        self.kind = kind
+        self.type = type
+        self.slot = slot
+        # global_frame, o el índice del símbolo de la función a la que pertenece
+        self.frame = frame
+        # número de ámbitos abiertos cuando se declaró
+        self.depth = depth
+        self.line = line
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Symbol({fields})"
+
+# un valor de tipo value se puede guardar en una variable de tipo target (un int se convierte a float); None es un tipo
+# desconocido (por un error ya reportado) y se acepta para no repetir errores
+def assignable(target, value):
+    return value is None or target == value or (target == 'float' and value == 'int')
+
+class SemanticAnalyzer:
+    """Resolve names to symbols and check types over a Parser(build_ast=True) tree"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        # nombres internados: texto -> código, y código -> texto
+        self.name_codes = {}
+        self.names = []
+        self.symbols = []
+        # código del nombre -> índices de sus símbolos visibles, el último es el más interno
+        self.bindings = {}
+        # códigos de los nombres declarados en cada ámbito abierto
+        self.scopes = [[]]
+        self.functions = {}
+        # símbolo de cada token identificador resuelto, -1 para el resto de los tokens
+        self.resolved = array('i', [-1]) * len(tokens)
+        # $nombres usados antes de que se defina su función: (índice del token, código del nombre)
+        self.pending = []
+        # errores como (línea, mensaje); analyze() deja en self.errors sólo los mensajes, ordenados por línea
+        self.reported = []
+        self.errors = []
+        self.function = global_frame
+        # ranura de cada nombre en el programa principal y en la función que se está revisando
+        self.global_slots = {}
+        self.local_slots = {}
+        self.has_return = False
+
+    def error(self, line, message):
+        self.reported.append((line, f"Semantic error at line {line}: {message}"))
+
+    def intern(self, text):
+        """Integer code of an identifier, assigned the first time it is seen"""
+        code = self.name_codes.get(text)
+        if code is None:
+            code = self.name_codes[text] = len(self.names)
+            self.names.append(text)
+        return code
+
+    # declaración visible del nombre: la más interna que sea global o del marco actual (las variables locales de una
+    # función no se ven desde una función definida dentro de ella)
+    def lookup(self, code):
+        stack = self.bindings.get(code)
+        if stack:
+            for position in range(len(stack) - 1, -1, -1):
+                symbol = self.symbols[stack[position]]
+                if symbol.frame == global_frame or symbol.frame == self.function:
+                    return stack[position]
+        return -1
+
+    def declare(self, index, kind, variable_type):
+        token = self.tokens[index]
+        code = self.intern(token['value'])
+        stack = self.bindings.setdefault(code, [])
+        if stack:
+            previous = self.symbols[stack[-1]]
+            if previous.depth == len(self.scopes) and previous.frame == self.function:
+                self.error(token['line'], f"variable '{token['value']}' is already declared in this scope "
+                                          f"(line {previous.line})")
+                self.resolved[index] = stack[-1]
+                return stack[-1]
+        slots = self.global_slots if self.function == global_frame else self.local_slots
+        slot = slots.setdefault(code, len(slots))
+        symbol = len(self.symbols)
+        self.symbols.append(Symbol(code, kind, variable_type, slot, self.function, len(self.scopes), token['line']))
+        stack.append(symbol)
+        self.scopes[-1].append(code)
+        self.resolved[index] = symbol
+        return symbol
+
+    def open_scope(self):
+        self.scopes.append([])
+
+    def close_scope(self):
+        bindings = self.bindings
+        for code in self.scopes.pop():
+            bindings[code].pop()
+
+    # resuelve un uso de un nombre; devuelve el símbolo o None si es una función que todavía no se define (o un error)
+    def use(self, index):
+        token = self.tokens[index]
+        code = self.intern(token['value'])
+        symbol = self.lookup(code)
+        if symbol == -1:
+            symbol = self.functions.get(code, -1)
+        if symbol != -1:
+            self.resolved[index] = symbol
+            return self.symbols[symbol]
+        if token['value'].startswith('$'):
+            self.pending.append((index, code))
+        else:
+            self.error(token['line'], f"variable '{token['value']}' is not declared")
+        return None
+
+    def analyze(self, program):
+        """Check a Program node; returns the list of semantic errors"""
+        # recorrido con una pila explícita (los bloques muy anidados no agotan la recursión de Python): cada elemento es la
+        # función que lo procesa y su argumento, así cerrar un ámbito o una función queda en la pila después de su cuerpo
+        work = [(self.statement, node) for node in reversed(program.body)]
+        while work:
+            handler, item = work.pop()
+            handler(item, work)
+        for index, code in self.pending:
+            symbol = self.functions.get(code, -1)
+            if symbol == -1:
+                token = self.tokens[index]
+                self.error(token['line'], f"function '{token['value']}' is not defined")
+            else:
+                self.resolved[index] = symbol
+        self.pending = []
+        # los errores de las funciones usadas antes de definirse se encuentran al final del recorrido, se ordenan por línea
+        self.reported.sort(key=lambda entry: entry[0])
+        self.errors = [message for _, message in self.reported]
+        return self.errors
+
+    def statement(self, node, work):
+        getattr(self, 'check_' + type(node).__name__)(node, work)
+
+    # agrega a la pila un bloque con su propio ámbito; after (opcional) se procesa al cerrarlo
+    def block(self, body, work, after=None):
+        if after is not None:
+            work.append((self.statement, after))
+        work.append((self.close_scope_item, None))
+        work.extend((self.statement, node) for node in reversed(body))
+        self.open_scope()
+
+    def close_scope_item(self, _, work):
+        self.close_scope()
+
+    def check_VarDecl(self, node, work):
+        variable_type = self.tokens[node.type]['value']
+        # el valor se revisa antes de declarar, así int @a = @a; usa el @a de afuera
+        if node.value is not None:
+            value_type = self.expression(node.value)
+            if not assignable(variable_type, value_type):
+                self.error(self.line(node.name), f"cannot assign {value_type} to {variable_type} variable "
+                                                 f"'{self.tokens[node.name]['value']}'")
+        self.declare(node.name, 'variable', variable_type)
+
+    def check_Assign(self, node, work):
+        symbol = self.use(node.name)
+        value_type = self.expression(node.value)
+        if symbol is None:
+            return
+        name = self.tokens[node.name]['value']
+        if symbol.kind == 'function':
+            self.error(self.line(node.name), f"cannot assign to function '{name}'")
+            return
+        if self.tokens[node.op]['value'] != '=':
+            value_type = self.binary_type(self.tokens[node.op]['value'][0], symbol.type, value_type, node.op)
+        if not assignable(symbol.type, value_type):
+            self.error(self.line(node.name), f"cannot assign {value_type} to {symbol.type} variable '{name}'")
+
+    def check_ExprStatement(self, node, work):
+        self.expression(node.value)
+
+    def check_FunctionDef(self, node, work):
+        token = self.tokens[node.name]
+        code = self.intern(token['value'])
+        returns = self.tokens[node.returns]['value']
+        if code in self.functions:
+            previous = self.symbols[self.functions[code]]
+            self.error(token['line'], f"function '{token['value']}' is already defined (line {previous.line})")
+            symbol = self.functions[code]
+        else:
+            symbol = len(self.symbols)
+            self.symbols.append(Symbol(code, 'function', returns, len(self.functions), global_frame, 1, token['line']))
+            self.functions[code] = symbol
+        self.resolved[node.name] = symbol
+        # el cuerpo se revisa en su propio marco; al terminar se regresa al marco de afuera
+        work.append((self.close_function, (node, self.function, self.local_slots, self.has_return)))
+        work.append((self.close_scope_item, None))
+        work.extend((self.statement, statement) for statement in reversed(node.body))
+        self.function = symbol
+        self.local_slots = {}
+        self.has_return = False
+        self.open_scope()
+        for param_type, param_name in node.params:
+            self.declare(param_name, 'parameter', self.tokens[param_type]['value'])
+
+    def close_function(self, state, work):
+        node, function, local_slots, has_return = state
+        returns = self.symbols[self.function].type
+        if returns != 'void' and not self.has_return:
+            self.error(self.line(node.name), f"function '{self.tokens[node.name]['value']}' returns {returns} but has no "
+                                             f"return statement")
+        self.function, self.local_slots, self.has_return = function, local_slots, has_return
+
+    def check_If(self, node, work):
+        self.condition(node.test)
+        self.block(node.body, work, node.orelse)
+
+    def check_Else(self, node, work):
+        self.block(node.body, work)
+
+    def check_While(self, node, work):
+        self.condition(node.test)
+        self.block(node.body, work)
+
+    def check_Range(self, node, work):
+        for value in (node.start, node.end, node.step):
+            value_type = self.expression(value)
+            if value_type not in numeric_types and value_type is not None:
+                self.error(self.line(value), f"range bounds must be numbers, not {value_type}")
+        self.block(node.body, work)
+
+    def check_Repeat(self, node, work):
+        self.block(node.body, work)
+
+    # cada case tiene su propio ámbito
+    def check_Choose(self, node, work):
+        self.expression(node.subject)
+        work.extend((self.statement, case) for case in reversed(node.cases))
+
+    def check_Case(self, node, work):
+        self.expression(node.value)
+        self.block(node.body, work)
+
+    def check_Print(self, node, work):
+        self.expression(node.value)
+
+    def check_Return(self, node, work):
+        value_type = self.expression(node.value)
+        line = self.line(node.value)
+        if self.function == global_frame:
+            self.error(line, "return outside of a function")
+            return
+        self.has_return = True
+        function = self.symbols[self.function]
+        name = self.names[function.name]
+        if function.type == 'void':
+            self.error(line, f"function '{name}' returns void but return has a value")
+        elif not assignable(function.type, value_type):
+            self.error(line, f"function '{name}' returns {function.type}, not {value_type}")
+
+    # las condiciones de if y while aceptan cualquier valor (la máquina virtual usa su valor de verdad), sólo se resuelven
+    # sus nombres
+    def condition(self, test):
+        self.expression(test)
+
+    # línea de una expresión: la de su primer token
+    def line(self, item):
+        while isinstance(item, BinOp):
+            item = item.left
+        if isinstance(item, Constant):
+            return item.line
+        return self.tokens[item]['line']
+
+    # tipo de una hoja: un literal, true/false, una variable o una función (su tipo de retorno); None si no se conoce
+    def leaf_type(self, item):
+        if isinstance(item, Constant):
+            kind = item.kind
+        else:
+            kind = self.tokens[item]['type']
+            if kind == 'identificador':
+                symbol = self.use(item)
+                return symbol.type if symbol is not None else None
+        if kind == 'palabra_clave':
+            return 'bool'
+        return literal_types.get(kind)
+
+    def binary_type(self, symbol, left, right, op_index):
+        if symbol in ('and', 'or'):
+            return left if left == right else None
+        if symbol in comparison_operators:
+            return 'bool'
+        if symbol not in arithmetic_operators:
+            self.error(self.tokens[op_index]['line'], f"unknown operator '{symbol}'")
+            return None
+        if symbol == '+' and 'string' in (left, right):
+            return 'string'
+        if left is None or right is None:
+            return None
+        for operand in (left, right):
+            if operand not in numeric_types:
+                self.error(self.tokens[op_index]['line'], f"operator '{symbol}' cannot be applied to {operand}")
+                return None
+        return 'float' if 'float' in (left, right) else 'int'
+
+    # tipo de una expresión, en posorden con una pila explícita como en Compiler.expression
+    def expression(self, root):
+        types = []
+        stack = [(root, False)]
+        while stack:
+            item, visited = stack.pop()
+            if not isinstance(item, BinOp):
+                types.append(self.leaf_type(item))
+            elif visited:
+                right = types.pop()
+                types[-1] = self.binary_type(self.tokens[item.op]['value'], types[-1], right, item.op)
+            else:
+                stack.append((item, True))
+                stack.append((item.right, False))
+                stack.append((item.left, False))
+        return types[0]
+
+def check_program(tree, tokens):
+    """Run the semantic pass over a Program syntax tree; returns the SemanticAnalyzer with its results"""
+    analyzer = SemanticAnalyzer(tokens)
+    analyzer.analyze(tree)
+    return analyzer
+
+# analiza un código fuente completo; el análisis semántico sólo se hace si no hay errores léxicos ni de sintaxis
+def check_source(text):
+    """Lex, parse and check source text, returning a result dict"""
+    result = lexic_analyzer(text, 'table', partial=True)
+    parser = Parser(result['tokens'], build_ast=True, recover=True)
+    result['parsed'] = parser.parse() and 'errors' not in result
+    result['syntax_errors'] = parser.errors
+    result['semantic_errors'] = []
+    if result['parsed']:
+        analyzer = check_program(parser.ast, result['tokens'])
+        result['semantic_errors'] = analyzer.errors
+        result['symbols'] = analyzer.symbols
+        result['names'] = analyzer.names
+        result['resolved'] = analyzer.resolved
+    result['checked'] = result['parsed'] and not result['semantic_errors']
+    return result
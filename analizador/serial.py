@@ -0,0 +1,302 @@
+"""Versioned binary format for analysis results."""
+import hashlib
+import json
+import mmap
+import struct
+from array import array
+
+from .lexer import TokenTable
+from .parser import (Assign, BinOp, Case, Choose, Constant, Else, ExprStatement, FunctionDef, If, Node, Print, Program, Range, Repeat,
+                     Return, VarDecl, While)
+from .tokens import token_codes, token_types
+
+# Formato binario para guardar y volver a cargar los resultados del análisis (tokens, errores y árbol de sintaxis):
+#   encabezado de tamaño fijo: firma, versión, banderas, hash SHA-256 del código fuente y la ubicación de cada sección
+#   los registros de los tokens, guardados por columnas de tamaño fijo (como en TokenTable): tipo (1 byte), línea (4 bytes),
+#   índice del valor en la tabla de textos (4 bytes) y posición en el código (4 u 8 bytes)
+#   tabla de textos sin repetidos: posiciones de inicio de cada texto y los textos en UTF-8
+#   árbol de sintaxis (opcional) como una secuencia de enteros
+#   metadatos en JSON: tipos de token, errores léxicos y de sintaxis y si el análisis fue válido
+# Al estar por columnas, guardar y cargar son copias directas de arreglos; y como la columna de líneas está ordenada, un
+# lector con mmap puede buscar un rango de líneas con búsqueda binaria sin leer el archivo completo
+serial_magic = b'LXPR'
+# versión 2: el árbol puede tener los nodos de optimize() y textos; se siguen leyendo los archivos de la versión 1
+serial_version = 2
+serial_header = struct.Struct('<4sHH32s' + 'Q' * 12)
+serial_wide_offsets = 1
+serial_has_ast = 2
+
+# clases de nodos del árbol, el código de cada una es su posición
+node_classes = (Program, VarDecl, Assign, ExprStatement, FunctionDef, If, Else, While, Range, Choose, Case, Print, Return,
+                BinOp, Constant, Repeat)
+node_codes = {node_class: code for code, node_class in enumerate(node_classes)}
+# marcas de la codificación del árbol: los enteros >= 0 son índices de tokens; los textos (de los nodos Constant) se guardan
+# la primera vez como su longitud seguida de sus caracteres y las siguientes como el número de texto
+ast_none, ast_list, ast_tuple, ast_text, ast_text_ref, ast_node_base = -1, -2, -3, -4, -5, -16
+
+# convierte el árbol en una secuencia de enteros en preorden, sin recursión
+def encode_ast(root):
+    """Encode a syntax tree as an array of ints"""
+    values = array('i')
+    texts = {}
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if item is None:
+            values.append(ast_none)
+        elif isinstance(item, Node):
+            values.append(ast_node_base - node_codes[type(item)])
+            stack.extend(reversed([getattr(item, name) for name in item.__slots__]))
+        elif isinstance(item, (list, tuple)):
+            values.append(ast_list if isinstance(item, list) else ast_tuple)
+            values.append(len(item))
+            stack.extend(reversed(item))
+        elif isinstance(item, str):
+            if item in texts:
+                values.append(ast_text_ref)
+                values.append(texts[item])
+            else:
+                texts[item] = len(texts)
+                values.append(ast_text)
+                values.append(len(item))
+                values.extend(map(ord, item))
+        else:
+            values.append(item)
+    return values
+
+# reconstruye el árbol: cada nodo o lista abierta espera un número fijo de elementos y se cierra al completarlos
+def decode_ast(values):
+    """Rebuild a syntax tree from encode_ast() output"""
+    frames = [[None, 1, []]]
+    texts = []
+    index = 0
+    while index < len(values):
+        value = values[index]
+        index += 1
+        if value >= 0:
+            item = value
+        elif value == ast_none:
+            item = None
+        elif value == ast_text:
+            length = values[index]
+            item = ''.join(map(chr, values[index + 1:index + 1 + length]))
+            texts.append(item)
+            index += 1 + length
+        elif value == ast_text_ref:
+            item = texts[values[index]]
+            index += 1
+        else:
+            if value in (ast_list, ast_tuple):
+                builder = list if value == ast_list else tuple
+                count = values[index]
+                index += 1
+            else:
+                builder = node_classes[ast_node_base - value]
+                count = len(builder.__slots__)
+            if count:
+                frames.append([builder, count, []])
+                continue
+            item = builder()
+        # se agrega el elemento terminado a quien lo contiene, cerrando los que se completen
+        while True:
+            frame = frames[-1]
+            frame[2].append(item)
+            frame[1] -= 1
+            if frame[1] or len(frames) == 1:
+                break
+            frames.pop()
+            builder, _, items = frame
+            item = builder(items) if builder in (list, tuple) else builder(*items)
+    return frames[0][2][0] if frames[0][2] else None
+
+def source_hash(source):
+    if source is None:
+        return bytes(32)
+    if not isinstance(source, (bytes, bytearray, memoryview)):
+        source = (source if isinstance(source, str) else '\n'.join(source)).encode('utf-8')
+    return hashlib.sha256(source).digest()
+
+# guarda un resultado de lexic_analyzer o analyze_source (con 'ast' si se agregó el árbol de Parser(build_ast=True))
+def dump(file_path, result, source=None):
+    """Write an analysis result to a binary file; source (optional) is hashed into the header"""
+    tokens = result.get('tokens', ())
+    pool_index = {}
+    if isinstance(tokens, TokenTable):
+        kinds, lines, starts = tokens.kinds, tokens.lines, tokens.starts
+        values = (tokens.value(index) for index in range(len(tokens)))
+    else:
+        kinds = array('B', [token_codes[token['type']] for token in tokens])
+        lines = array('I', [token['line'] for token in tokens])
+        starts = array('I', bytes(4 * len(tokens)))
+        values = (token['value'] for token in tokens)
+    value_ids = array('I', [pool_index.setdefault(value, len(pool_index)) for value in values])
+
+    encoded = [value.encode('utf-8') for value in pool_index]
+    pool_offsets = array('Q', [0])
+    total = 0
+    for value in encoded:
+        total += len(value)
+        pool_offsets.append(total)
+
+    flags = serial_wide_offsets if starts.typecode == 'Q' else 0
+    ast_values = array('i')
+    if result.get('ast') is not None:
+        flags |= serial_has_ast
+        ast_values = encode_ast(result['ast'])
+
+    metadata = {key: value for key, value in result.items() if key not in ('tokens', 'ast')}
+    metadata['token_types'] = token_types
+    meta_bytes = json.dumps(metadata, separators=(',', ':')).encode('utf-8')
+
+    # las secciones se escriben una después de otra; el encabezado guarda dónde empieza cada una
+    sections = [kinds.tobytes(), lines.tobytes(), value_ids.tobytes(), starts.tobytes(), pool_offsets.tobytes(),
+                b''.join(encoded), ast_values.tobytes(), meta_bytes]
+    offsets = []
+    position = serial_header.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+    header = serial_header.pack(serial_magic, serial_version, flags, source_hash(source), len(kinds), len(pool_index),
+                                *offsets[:7], len(ast_values), offsets[7], len(meta_bytes))
+    with open(file_path, 'wb') as file:
+        file.write(header)
+        for section in sections:
+            file.write(section)
+
+# lector de un archivo binario mapeado en memoria: los tokens, textos y el árbol sólo se decodifican cuando se piden
+class TokenFile:
+    """Random-access reader of a file written by dump()"""
+
+    def __init__(self, file_path):
+        self.file = open(file_path, 'rb')
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # un archivo vacío no se puede mapear
+            self.buffer = None
+        if self.buffer is None or len(self.buffer) < serial_header.size or \
+                self.buffer[:len(serial_magic)] != serial_magic:
+            self.close()
+            raise ValueError(f"{file_path}: not an analysis file")
+        (_, version, self.flags, self.source_hash, self.token_count, self.pool_count, self.kinds_offset,
+         self.lines_offset, self.values_offset, self.starts_offset, self.pool_offsets_offset, self.blob_offset,
+         self.ast_offset, self.ast_count, self.meta_offset, self.meta_size) = serial_header.unpack_from(self.buffer)
+        if not 1 <= version <= serial_version:
+            self.close()
+            raise ValueError(f"{file_path}: unsupported format version {version}, expected {serial_version}")
+        self.start_format = struct.Struct('<Q' if self.flags & serial_wide_offsets else '<I')
+        self.metadata = json.loads(self.buffer[self.meta_offset:self.meta_offset + self.meta_size].decode('utf-8'))
+        self.token_types = self.metadata['token_types']
+        self.strings = {}
+
+    def __len__(self):
+        return self.token_count
+
+    def column(self, typecode, offset, first=0, last=None):
+        """array with the values of one record column between two token indexes"""
+        values = array(typecode)
+        last = self.token_count if last is None else last
+        values.frombytes(self.buffer[offset + first * values.itemsize:offset + last * values.itemsize])
+        return values
+
+    def pool(self):
+        """Every distinct token value, indexed by value id"""
+        offsets = self.column('Q', self.pool_offsets_offset, 0, self.pool_count + 1)
+        blob = self.buffer[self.blob_offset:self.blob_offset + offsets[-1]]
+        return [blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+    def value(self, value_id):
+        text = self.strings.get(value_id)
+        if text is None:
+            start, end = struct.unpack_from('<QQ', self.buffer, self.pool_offsets_offset + value_id * 8)
+            text = self.buffer[self.blob_offset + start:self.blob_offset + end].decode('utf-8')
+            self.strings[value_id] = text
+        return text
+
+    def line(self, index):
+        return struct.unpack_from('<I', self.buffer, self.lines_offset + index * 4)[0]
+
+    def token(self, index):
+        """Token dict at index; 'start' is the offset in the source when it was known"""
+        value_id = struct.unpack_from('<I', self.buffer, self.values_offset + index * 4)[0]
+        return {
+            'line': self.line(index),
+            'type': self.token_types[self.buffer[self.kinds_offset + index]],
+            'value': self.value(value_id),
+            'start': self.start_format.unpack_from(self.buffer, self.starts_offset + index * self.start_format.size)[0],
+        }
+
+    def __iter__(self):
+        for index in range(self.token_count):
+            yield self.token(index)
+
+    def tokens(self, first=0, last=None):
+        """Token dicts (line, type, value) between two token indexes, decoded a column at a time"""
+        last = self.token_count if last is None else last
+        types = self.token_types
+        if last - first > self.pool_count:
+            pool = self.pool()
+            values = [pool[value_id] for value_id in self.column('I', self.values_offset, first, last)]
+        else:
+            values = [self.value(value_id) for value_id in self.column('I', self.values_offset, first, last)]
+        return [
+            {'line': line, 'type': types[kind], 'value': value}
+            for kind, line, value in zip(self.column('B', self.kinds_offset, first, last),
+                                         self.column('I', self.lines_offset, first, last), values)
+        ]
+
+    # primer token con línea >= line, por búsqueda binaria sobre la columna de líneas
+    def first_token_of(self, line):
+        low, high = 0, self.token_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.line(middle) < line:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def lines(self, first_line, last_line):
+        """Tokens whose line is between first_line and last_line (inclusive)"""
+        return self.tokens(self.first_token_of(first_line), self.first_token_of(last_line + 1))
+
+    def ast(self):
+        if not self.flags & serial_has_ast:
+            return None
+        values = array('i')
+        values.frombytes(self.buffer[self.ast_offset:self.ast_offset + self.ast_count * values.itemsize])
+        return decode_ast(values)
+
+    def close(self):
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def load(file_path):
+    """Read a file written by dump() back into a result dict"""
+    with TokenFile(file_path) as token_file:
+        result = {key: value for key, value in token_file.metadata.items() if key != 'token_types'}
+        result['tokens'] = token_file.tokens()
+        ast = token_file.ast()
+        if ast is not None:
+            result['ast'] = ast
+        result['source_hash'] = token_file.source_hash.hex()
+    return result
+
+# exporta un archivo binario a JSON Lines: primero una línea con los datos generales y después una por token
+def export_jsonl(file_path, output):
+    """Write the contents of a dump() file as JSON Lines to an open text file"""
+    with TokenFile(file_path) as token_file:
+        summary = {key: value for key, value in token_file.metadata.items() if key != 'token_types'}
+        summary['source_hash'] = token_file.source_hash.hex()
+        summary['tokens'] = len(token_file)
+        output.write(json.dumps(summary, ensure_ascii=False) + '\n')
+        for token in token_file:
+            output.write(json.dumps(token, ensure_ascii=False) + '\n')
@@ -0,0 +1,479 @@
+"""JSON-RPC analysis daemon and asyncio analysis service."""
+import asyncio
+import hashlib
+import io
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .incremental import syntax_error_regex
+from .parser import analyze_source
+
+# SERVIDOR DE ANÁLISIS
+# Un proceso que se queda abierto y recibe peticiones JSON-RPC 2.0, una por línea, por la entrada estándar o por un socket
+# Unix. Así los editores y los hooks no pagan el arranque del intérprete ni la compilación de las expresiones en cada
+# análisis. Los resultados recientes se guardan en memoria, con la llave del hash del contenido
+rpc_parse_error = -32700
+rpc_invalid_request = -32600
+rpc_method_not_found = -32601
+rpc_invalid_params = -32602
+rpc_internal_error = -32603
+
+class RPCError(Exception):
+    def __init__(self, code, message, request_id=None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.request_id = request_id
+
+# valida una línea JSON-RPC y devuelve (id, si es notificación, método, parámetros)
+def parse_request(line):
+    try:
+        request = json.loads(line)
+    except ValueError:
+        raise RPCError(rpc_parse_error, "invalid JSON")
+    if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+        raise RPCError(rpc_invalid_request, "expected an object with a 'method'")
+    request_id = request.get('id')
+    params = request.get('params', {})
+    if not isinstance(params, dict):
+        # el error lleva el id para que el cliente sepa a qué petición corresponde
+        raise RPCError(rpc_invalid_params, "params must be an object", request_id)
+    return request_id, 'id' not in request, request['method'], params
+
+# percentil de una lista ya ordenada, por el método del rango más cercano
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+# contenido de la petición: el texto en 'text' o la ruta de un archivo en 'path'
+def request_content(params):
+    if isinstance(params.get('text'), str):
+        return params['text'].encode('utf-8')
+    if isinstance(params.get('path'), str):
+        try:
+            with open(params['path'], 'rb') as file:
+                return file.read()
+        except OSError as e:
+            raise RPCError(rpc_invalid_params, f"cannot read file: {e}")
+    raise RPCError(rpc_invalid_params, "expected a 'text' or 'path' parameter")
+
+# respuestas de los métodos analyze, tokens y diagnostics a partir del resultado de analyze_source
+def analysis_summary(result):
+    return {
+        'parsed': result['parsed'],
+        'tokens': len(result['tokens']),
+        'errors': result.get('errors', []),
+        'syntax_errors': result['syntax_errors'],
+    }
+
+def analysis_tokens(result):
+    return {'tokens': result['tokens']}
+
+# errores léxicos y de sintaxis en una sola lista, con la línea separada del mensaje
+def analysis_diagnostics(result):
+    found = [{'line': error['line'], 'source': 'lexer', 'message': error['error']}
+             for error in result.get('errors', [])]
+    for error in result['syntax_errors']:
+        match = syntax_error_regex.match(error)
+        line = match.group(1) if match else None
+        found.append({
+            'line': int(line) if line and line.isdigit() else None,
+            'source': 'parser',
+            'message': match.group(2) if match else error,
+        })
+    return {'diagnostics': found}
+
+analysis_views = {'analyze': analysis_summary, 'tokens': analysis_tokens, 'diagnostics': analysis_diagnostics}
+
+class AnalysisServer:
+    """JSON-RPC request handler with an in-memory LRU of recent analysis results"""
+
+    def __init__(self, cache_size=128, latency_window=1024):
+        self.cache_size = cache_size
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.latencies = {}
+        self.latency_window = latency_window
+        self.running = True
+        # el servidor por socket atiende cada conexión en su propio hilo
+        self.lock = threading.Lock()
+        self.methods = {
+            'analyze': self.analyze,
+            'tokens': self.tokens,
+            'diagnostics': self.diagnostics,
+            'stats': self.stats,
+            'shutdown': self.shutdown,
+        }
+
+    def result(self, params):
+        """(analysis result, cached) for the request's content"""
+        content = request_content(params)
+        key = hashlib.sha256(content).digest()
+        result = self.results.get(key)
+        if result is not None:
+            self.results.move_to_end(key)
+            self.hits += 1
+            return result, True
+        self.misses += 1
+        result = analyze_source(content.decode('utf-8', errors='replace'))
+        self.results[key] = result
+        if len(self.results) > self.cache_size:
+            self.results.popitem(last=False)
+        return result, False
+
+    def analyze(self, params):
+        result, cached = self.result(params)
+        return dict(analysis_summary(result), cached=cached)
+
+    def tokens(self, params):
+        result, cached = self.result(params)
+        return dict(analysis_tokens(result), cached=cached)
+
+    def diagnostics(self, params):
+        result, cached = self.result(params)
+        return dict(analysis_diagnostics(result), cached=cached)
+
+    def stats(self, params):
+        methods = {}
+        for method, latencies in self.latencies.items():
+            ordered = sorted(latencies)
+            methods[method] = {
+                'requests': len(ordered),
+                'p50_ms': round(percentile(ordered, 0.50), 3),
+                'p99_ms': round(percentile(ordered, 0.99), 3),
+            }
+        return {'cache_entries': len(self.results), 'cache_hits': self.hits, 'cache_misses': self.misses,
+                'methods': methods}
+
+    def shutdown(self, params):
+        self.running = False
+        return None
+
+    # atiende una línea y devuelve la respuesta como texto JSON, o None si era una notificación (sin 'id'); cada respuesta
+    # lleva en 'elapsed_ms' el tiempo que tomó atenderla
+    def handle_line(self, line):
+        start = time.perf_counter()
+        request_id = None
+        method = None
+        notification = False
+        try:
+            request_id, notification, method, params = parse_request(line)
+            handler = self.methods.get(method)
+            if handler is None:
+                raise RPCError(rpc_method_not_found, f"unknown method '{method}'")
+            with self.lock:
+                result = handler(params)
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+        except RPCError as e:
+            request_id = request_id if e.request_id is None else e.request_id
+            response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': e.code, 'message': e.message}}
+        except Exception as e:
+            response = {'jsonrpc': '2.0', 'id': request_id,
+                        'error': {'code': rpc_internal_error, 'message': f"{type(e).__name__}: {e}"}}
+        elapsed = (time.perf_counter() - start) * 1000
+        with self.lock:
+            if method in self.methods:
+                self.latencies.setdefault(method, deque(maxlen=self.latency_window)).append(elapsed)
+        if notification:
+            return None
+        response['elapsed_ms'] = round(elapsed, 3)
+        return json.dumps(response, ensure_ascii=False)
+
+    # atiende las peticiones de un flujo de texto (la entrada estándar o una conexión) hasta que se cierre o se pida
+    # shutdown
+    def serve_stream(self, input_stream, output_stream):
+        for line in input_stream:
+            if not line.strip():
+                continue
+            response = self.handle_line(line)
+            if response is not None:
+                output_stream.write(response + '\n')
+                output_stream.flush()
+            if not self.running:
+                break
+
+    def serve_unix(self, socket_path):
+        """Serve connections on a Unix socket until a shutdown request"""
+        server_state = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                reader = io.TextIOWrapper(self.rfile, encoding='utf-8', errors='replace')
+                writer = io.TextIOWrapper(self.wfile, encoding='utf-8', write_through=True)
+                server_state.serve_stream(reader, writer)
+                if not server_state.running:
+                    threading.Thread(target=self.server.shutdown).start()
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as server:
+            server.daemon_threads = True
+            try:
+                server.serve_forever()
+            finally:
+                os.unlink(socket_path)
+
+# SERVICIO ASÍNCRONO
+# Atiende muchas conexiones a la vez con asyncio y manda el análisis, que usa el CPU, a un grupo de procesos. Las peticiones
+# esperan en una cola de tamaño fijo: cuando se llena se deja de leer de las conexiones, y así los clientes que envían de más
+# esperan en lugar de llenar la memoria del servidor. Las peticiones iguales (mismo hash del contenido) que llegan mientras
+# una se analiza comparten ese análisis
+rpc_timeout = -32001
+rpc_busy = -32002
+
+# lo que corre en los procesos trabajadores; devuelve sólo la respuesta del método (view), así no se copian los tokens de
+# vuelta al servidor cuando no se pidieron
+def analyze_content(content, view):
+    """analysis_views[view] of analyze_source() for the bytes of a file"""
+    return analysis_views[view](analyze_source(content.decode('utf-8', errors='replace')))
+
+# un análisis pendiente, compartido por las peticiones con el mismo contenido
+class AnalysisJob:
+    def __init__(self, key, content, view, loop):
+        self.key = key
+        self.content = content
+        self.view = view
+        self.future = loop.create_future()
+        self.waiters = 0
+        self.cancelled = False
+        self.work = None
+
+class AnalysisService:
+    """asyncio JSON-RPC front end that analyzes in a process pool with a bounded queue"""
+
+    def __init__(self, workers=None, queue_size=64, timeout=30.0, executor=None, max_request_bytes=64 * 1024 * 1024):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.max_request_bytes = max_request_bytes
+        self.executor = executor
+        self.own_executor = executor is None
+        self.jobs = {}
+        self.queue = None
+        self.dispatchers = []
+        self.server = None
+        self.stopping = None
+        self.closing = False
+        self.latencies = deque(maxlen=1024)
+        self.counts = {'requests': 0, 'analyzed': 0, 'deduplicated': 0, 'timeouts': 0, 'cancelled': 0, 'rejected': 0}
+
+    async def start(self, host='127.0.0.1', port=0, socket_path=None):
+        """Start listening on TCP (host, port) or on a Unix socket; returns the asyncio server"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.stopping = asyncio.Event()
+        # un despachador por trabajador, así en el grupo de procesos nunca hay trabajo esperando que no se pueda cancelar
+        self.dispatchers = [asyncio.create_task(self.dispatch()) for _ in range(self.workers)]
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.server = await asyncio.start_unix_server(self.handle_connection, socket_path,
+                                                          limit=self.max_request_bytes)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, host, port, limit=self.max_request_bytes)
+        return self.server
+
+    async def serve(self, host='127.0.0.1', port=0, socket_path=None):
+        """Serve until a shutdown request"""
+        await self.start(host, port, socket_path)
+        try:
+            await self.stopping.wait()
+        finally:
+            await self.close()
+            if socket_path and os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+    async def close(self):
+        self.closing = True
+        if self.server is not None:
+            self.server.close()
+        for task in self.dispatchers:
+            task.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        for job in list(self.jobs.values()):
+            self.drop(job)
+        if self.own_executor and self.executor is not None:
+            await asyncio.to_thread(self.executor.shutdown, True, cancel_futures=True)
+            self.executor = None
+
+    # toma los análisis de la cola y los corre en el grupo de procesos, uno a la vez por despachador
+    async def dispatch(self):
+        while True:
+            job = await self.queue.get()
+            if job.cancelled:
+                continue
+            job.work = self.executor.submit(analyze_content, job.content, job.view)
+            try:
+                result = await asyncio.wrap_future(job.work)
+            except asyncio.CancelledError:
+                # la cancelación viene de drop() o de close(); sólo en el segundo caso termina el despachador
+                if self.closing or not job.cancelled:
+                    raise
+                continue
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                self.counts['analyzed'] += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                if self.jobs.get(job.key) is job:
+                    del self.jobs[job.key]
+
+    # descarta un análisis que ya nadie espera: si sigue en la cola no se corre, y si ya se envió al grupo de procesos se
+    # cancela cuando todavía no empieza (uno que ya está corriendo termina, pero su resultado se ignora)
+    def drop(self, job):
+        job.cancelled = True
+        if self.jobs.get(job.key) is job:
+            del self.jobs[job.key]
+        if job.work is not None:
+            job.work.cancel()
+        if not job.future.done():
+            job.future.cancel()
+        self.counts['cancelled'] += 1
+
+    def release(self, job):
+        job.waiters -= 1
+        if job.waiters == 0 and not job.future.done():
+            self.drop(job)
+
+    # busca un análisis igual que siga pendiente o encola uno nuevo; espera lugar en la cola hasta el límite de tiempo. Las
+    # peticiones iguales que llegan mientras tanto se unen al análisis antes de que esté en la cola, así que si no alcanza
+    # a entrar se quita de los pendientes y todas reciben el error en ese momento
+    async def acquire(self, content, view, deadline):
+        key = (view, hashlib.sha256(content).digest())
+        job = self.jobs.get(key)
+        if job is not None:
+            self.counts['deduplicated'] += 1
+            job.waiters += 1
+            return job
+        job = AnalysisJob(key, content, view, asyncio.get_running_loop())
+        job.waiters = 1
+        self.jobs[key] = job
+        try:
+            await asyncio.wait_for(self.queue.put(job), max(0, deadline - time.monotonic()))
+        except BaseException as e:
+            job.cancelled = True
+            if self.jobs.get(key) is job:
+                del self.jobs[key]
+            busy = isinstance(e, asyncio.TimeoutError)
+            if busy:
+                self.counts['rejected'] += 1
+                error = RPCError(rpc_busy, "server busy: the request queue stayed full until the timeout")
+            else:
+                error = RPCError(rpc_internal_error, "the request that started this analysis was cancelled")
+            # las demás peticiones que se unieron a este análisis lo esperan en job.future
+            if job.waiters > 1:
+                job.future.set_exception(error)
+            if busy:
+                raise error from None
+            raise
+        return job
+
+    def stats(self):
+        ordered = sorted(self.latencies)
+        return dict(self.counts, queued=self.queue.qsize(), pending=len(self.jobs), workers=self.workers,
+                    p50_ms=round(percentile(ordered, 0.50), 3), p99_ms=round(percentile(ordered, 0.99), 3))
+
+    # Lee las peticiones de una conexión. El análisis de cada una se encola antes de leer la siguiente línea (ahí está la
+    # contrapresión) y la respuesta se escribe desde otra tarea cuando termina. Si el cliente se desconecta, se cancelan
+    # sus peticiones pendientes
+    async def handle_connection(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # la línea es más grande que max_request_bytes; ya no se puede saber dónde empieza la siguiente
+                    await self.respond(writer, time.monotonic(), None, False,
+                                       error=(rpc_invalid_request, "request larger than the size limit"))
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                start = time.monotonic()
+                self.counts['requests'] += 1
+                request_id = None
+                notification = False
+                try:
+                    request_id, notification, method, params = parse_request(line)
+                    if method == 'stats':
+                        await self.respond(writer, start, request_id, notification, result=self.stats())
+                        continue
+                    if method == 'shutdown':
+                        await self.respond(writer, start, request_id, notification, result=None)
+                        self.stopping.set()
+                        break
+                    if method not in analysis_views:
+                        raise RPCError(rpc_method_not_found, f"unknown method '{method}'")
+                    timeout = params.get('timeout', self.timeout)
+                    if not isinstance(timeout, (int, float)) or timeout <= 0:
+                        raise RPCError(rpc_invalid_params, "timeout must be a positive number of seconds")
+                    deadline = start + timeout
+                    # leer un archivo puede tardar, se hace en otro hilo para no detener las demás conexiones
+                    if 'path' in params:
+                        content = await asyncio.to_thread(request_content, params)
+                    else:
+                        content = request_content(params)
+                    job = await self.acquire(content, method, deadline)
+                except RPCError as e:
+                    request_id = request_id if e.request_id is None else e.request_id
+                    await self.respond(writer, start, request_id, notification, error=(e.code, e.message))
+                    continue
+                task = asyncio.create_task(self.answer(writer, start, request_id, notification, method, job, deadline))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                # se libera al terminar la tarea, aunque se cancele antes de empezar
+                task.add_done_callback(lambda _, job=job: self.release(job))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+
+    async def answer(self, writer, start, request_id, notification, method, job, deadline):
+        try:
+            result = await asyncio.wait_for(asyncio.shield(job.future), max(0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self.counts['timeouts'] += 1
+            await self.respond(writer, start, request_id, notification, error=(rpc_timeout, "analysis timed out"))
+        except RPCError as e:
+            # el análisis compartido no entró a la cola
+            if e.code == rpc_busy:
+                self.counts['rejected'] += 1
+            await self.respond(writer, start, request_id, notification, error=(e.code, e.message))
+        except Exception as e:
+            await self.respond(writer, start, request_id, notification,
+                               error=(rpc_internal_error, f"{type(e).__name__}: {e}"))
+        else:
+            await self.respond(writer, start, request_id, notification, result=result)
+
+    async def respond(self, writer, start, request_id, notification, result=None, error=None):
+        elapsed = (time.monotonic() - start) * 1000
+        self.latencies.append(elapsed)
+        if notification or writer.is_closing():
+            return
+        response = {'jsonrpc': '2.0', 'id': request_id}
+        if error:
+            response['error'] = {'code': error[0], 'message': error[1]}
+        else:
+            response['result'] = result
+        response['elapsed_ms'] = round(elapsed, 3)
+        writer.write((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
@@ -0,0 +1,26 @@
+"""Token definitions shared by every lexer engine."""
+
+# Expresiones regulares para cada token, declaradas en un arreglo junto a su nombre de identificación, en orden de prioridad.
+# Se guardan como texto: cada motor las compila (o las convierte en tablas) cuando las necesita, no al importar el paquete
+token_specs = [
+    # (pattern, token_name)
+    (r"\?.*", "comentario"),
+    (r"(\bif\b|\bwhile\b|\bstart\b|\bend\b|\breturn\b|\breturns\b|\belse\b|\belif\b|\bchoose\b|\bcase\b|\brange\b|\bdefine\b|\bint|\bfloat\b|\bstring\b|\bbool\b|\bvoid\b|\bprint\b|\btrue\b|\bfalse\b)", "palabra_clave"),
+    (r"(:|\(|\)|;|\[|\]|\,)", "delimiter"),
+    (r"(@|\$)[a-zA-Z]+[a-zA-Z0-9_]*\b", "identificador"),
+    (r"\-[0-9]+\.[0-9]+", "negativo_decimal"),
+    (r"[0-9]+\.[0-9]+", "decimal"),
+    (r"\-[0-9]+", "negativo"),
+    (r"([0-9]+|\+[0-9]+)", "entero"),
+    (r"(\+\+|\-\-|=)", "asgm_op"),
+    (r"[\+\*-\/\^]", "arit_op"),
+    (r"(<>|><|<=|>=|==|<|>)", "cmp_op"),
+    (r"(\band\b|\bor\b)", "bool_op"),
+    # texto entre comillas del mismo tipo, con escapes (\" \' \\ \n \t); cada caracter es un escape o no lo es, así que la
+    # expresión nunca retrocede y una línea con muchas cadenas se analiza en tiempo lineal
+    (r"\"(?:[^\"\\\n]|\\.)*\"|'(?:[^'\\\n]|\\.)*'", "texto")
+]
+
+# códigos numéricos de cada tipo de token, en el mismo orden de prioridad que token_specs
+token_types = [token_type for _, token_type in token_specs]
+token_codes = {token_type: code for code, token_type in enumerate(token_types)}
@@ -0,0 +1,828 @@
+"""Bytecode compiler, stack virtual machine and constant-folding optimizer."""
+import operator
+import sys
+from array import array
+
+from .lexer import lexic_analyzer, string_value
+from .parser import (Assign, BinOp, Case, Choose, Constant, Else, ExprStatement, FunctionDef, If, Parser, Print, Program,
+                     Range, Repeat, Return, VarDecl, While, iter_nodes)
+
+# COMPILADOR A BYTECODE Y MÁQUINA VIRTUAL
+# El árbol de sintaxis se traduce a un código compacto para una máquina de pila: cada instrucción ocupa dos enteros de un
+# array('i') (el código de operación y su argumento), las constantes van en una tabla aparte y las variables se guardan en
+# ranuras numeradas (las del programa principal son globales y cada función tiene las suyas). El lenguaje no tiene sintaxis
+# para llamar funciones con argumentos, así que un $nombre de función usado como valor la llama con sus parámetros en el
+# valor por defecto de su tipo
+opcode_names = (
+    'LOAD_CONST', 'LOAD_LOCAL', 'STORE_LOCAL', 'LOAD_GLOBAL', 'STORE_GLOBAL', 'BINARY', 'JUMP', 'JUMP_IF_FALSE',
+    'JUMP_IF_FALSE_OR_POP', 'JUMP_IF_TRUE_OR_POP', 'POP', 'PRINT', 'CALL', 'RETURN', 'RANGE_INIT', 'RANGE_NEXT', 'HALT',
+    'REPEAT_NEXT',
+)
+(op_load_const, op_load_local, op_store_local, op_load_global, op_store_global, op_binary, op_jump, op_jump_if_false,
+ op_jump_if_false_or_pop, op_jump_if_true_or_pop, op_pop, op_print, op_call, op_return, op_range_init, op_range_next,
+ op_halt, op_repeat_next) = range(len(opcode_names))
+
+# valor inicial de una variable declarada sin valor, y de los parámetros
+type_defaults = {'int': 0, 'float': 0.0, 'string': '', 'bool': False}
+max_call_depth = 1000
+
+class CompileError(Exception):
+    pass
+
+class ExecutionError(Exception):
+    pass
+
+# división: entre enteros el resultado es entero (truncado hacia cero, como en C)
+def divide(left, right):
+    if isinstance(left, int) and isinstance(right, int) and not isinstance(left, bool):
+        quotient = abs(left) // abs(right)
+        return quotient if (left < 0) == (right < 0) else -quotient
+    return left / right
+
+# potencia: un entero elevado a un exponente enorme no terminaría nunca, se reporta como desbordamiento
+max_power_bits = 1 << 16
+
+def power(left, right):
+    if isinstance(left, int) and isinstance(right, int) and right > 0 and left.bit_length() * right > max_power_bits:
+        raise OverflowError("result too large")
+    result = left ** right
+    # una base negativa con un exponente fraccionario da un número complejo, que el lenguaje no tiene
+    if isinstance(result, complex):
+        raise ValueError("invalid operands for '^'")
+    return result
+
+def add(left, right):
+    # el texto se concatena con cualquier valor
+    if isinstance(left, str) or isinstance(right, str):
+        return format_value(left) + format_value(right)
+    return left + right
+
+# operaciones de la instrucción BINARY, el argumento es la posición en esta tabla
+binary_operators = ('+', '-', '*', '/', '^', '<', '>', '<=', '>=', '<>', '><', '==')
+binary_functions = (add, operator.sub, operator.mul, divide, power, operator.lt, operator.gt, operator.le,
+                    operator.ge, operator.ne, operator.ne, operator.eq)
+binary_codes = {symbol: code for code, symbol in enumerate(binary_operators)}
+# operadores de asignación compuesta
+assignment_operators = {'++': '+', '--': '-'}
+
+# tipos de token que son valores literales y su valor en Python
+literal_kinds = ('entero', 'negativo', 'decimal', 'negativo_decimal', 'texto', 'palabra_clave')
+
+def literal_value(kind, text):
+    if kind in ('entero', 'negativo'):
+        return int(text)
+    if kind in ('decimal', 'negativo_decimal'):
+        return float(text)
+    if kind == 'texto':
+        return string_value(text)
+    return text == 'true'
+
+def format_value(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+class Bytecode:
+    """Compiled program: instruction stream, constant pool, slot counts and function table"""
+
+    def __init__(self):
+        self.code = array('i')
+        # línea del código fuente de cada instrucción, para los errores de ejecución
+        self.lines = array('I')
+        self.constants = []
+        self.global_names = []
+        # por función: nombre, posición de la primera instrucción, número de ranuras y valores iniciales de los parámetros
+        self.functions = []
+
+    def __len__(self):
+        return len(self.code) // 2
+
+    def disassemble(self):
+        """Readable listing of the instructions"""
+        entries = {entry: name for name, entry, _, _ in self.functions}
+        lines = []
+        for position in range(0, len(self.code), 2):
+            if position in entries:
+                lines.append(f"{entries[position]}:")
+            opcode, argument = self.code[position], self.code[position + 1]
+            detail = ''
+            if opcode == op_load_const:
+                detail = f" ({self.constants[argument]!r})"
+            elif opcode in (op_load_global, op_store_global):
+                detail = f" ({self.global_names[argument]})"
+            elif opcode == op_binary:
+                detail = f" ({binary_operators[argument]})"
+            elif opcode == op_call:
+                detail = f" ({self.functions[argument][0]})"
+            elif opcode in (op_jump, op_jump_if_false, op_jump_if_false_or_pop, op_jump_if_true_or_pop, op_range_next,
+                            op_repeat_next):
+                # los destinos de los saltos son posiciones en el arreglo, se muestran como número de instrucción
+                detail = f" (to {argument // 2})"
+            lines.append(f"{position // 2:>6} {self.lines[position // 2]:>5} {opcode_names[opcode]:22} {argument}{detail}")
+        return '\n'.join(lines)
+
+class Compiler:
+    """Translate a syntax tree from Parser(build_ast=True) into Bytecode"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.bytecode = Bytecode()
+        self.constant_index = {}
+        self.global_slots = {}
+        self.function_index = {}
+        # ranuras de la función que se está compilando (None en el programa principal)
+        self.local_slots = None
+        self.slot_count = 0
+        self.line = 0
+
+    def text(self, index):
+        token = self.tokens[index]
+        self.line = token['line']
+        return token['value']
+
+    def emit(self, opcode, argument=0):
+        self.bytecode.code.append(opcode)
+        self.bytecode.code.append(argument)
+        self.bytecode.lines.append(self.line)
+        return len(self.bytecode.code) - 2
+
+    # escribe el destino de un salto emitido antes, cuando ya se conoce
+    def patch(self, position, target=None):
+        self.bytecode.code[position + 1] = len(self.bytecode.code) if target is None else target
+
+    def constant(self, value):
+        key = (type(value), value)
+        if key not in self.constant_index:
+            self.constant_index[key] = len(self.bytecode.constants)
+            self.bytecode.constants.append(value)
+        return self.constant_index[key]
+
+    def global_slot(self, name):
+        if name not in self.global_slots:
+            self.global_slots[name] = len(self.bytecode.global_names)
+            self.bytecode.global_names.append(name)
+        return self.global_slots[name]
+
+    # ranura nueva del marco actual, para una variable local o el estado oculto de un ciclo
+    def new_slot(self):
+        self.slot_count += 1
+        return self.slot_count - 1
+
+    def load_variable(self, name):
+        if self.local_slots is not None and name in self.local_slots:
+            self.emit(op_load_local, self.local_slots[name])
+        else:
+            self.emit(op_load_global, self.global_slot(name))
+
+    def store_variable(self, name, declare=False):
+        if self.local_slots is not None:
+            if declare and name not in self.local_slots:
+                self.local_slots[name] = self.new_slot()
+            if name in self.local_slots:
+                self.emit(op_store_local, self.local_slots[name])
+                return
+        self.emit(op_store_global, self.global_slot(name))
+
+    def compile(self, program):
+        """Compile a Program node; returns the Bytecode"""
+        # las funciones se registran antes, así se pueden usar antes de su definición y de forma recursiva
+        definitions = [node for node in iter_nodes(program) if isinstance(node, FunctionDef)]
+        for definition in definitions:
+            name = self.text(definition.name)
+            if name in self.function_index:
+                raise CompileError(f"Compile error at line {self.line}: function '{name}' is defined twice")
+            self.function_index[name] = len(self.bytecode.functions)
+            self.bytecode.functions.append(None)
+        self.block(program.body)
+        self.emit(op_halt)
+        for definition in definitions:
+            self.function(definition)
+        return self.bytecode
+
+    def function(self, definition):
+        name = self.text(definition.name)
+        self.local_slots = {}
+        self.slot_count = 0
+        defaults = []
+        for param_type, param_name in definition.params:
+            self.local_slots[self.text(param_name)] = self.new_slot()
+            defaults.append(type_defaults[self.text(param_type)])
+        entry = len(self.bytecode.code)
+        self.block(definition.body)
+        # una función que termina sin return devuelve un valor vacío, que la máquina virtual no deja usar
+        self.emit(op_load_const, self.constant(None))
+        self.emit(op_return)
+        self.bytecode.functions[self.function_index[name]] = (name, entry, self.slot_count, tuple(defaults))
+        self.local_slots = None
+
+    # compila las sentencias con una pila explícita (los bloques muy anidados y las cadenas largas de elif no agotan la
+    # recursión de Python): cada elemento es la función que lo procesa y su argumento, así lo que falta de una sentencia
+    # (un salto por escribir) queda en la pila después de su cuerpo
+    def block(self, statements):
+        work = []
+        self.push_block(statements, work)
+        while work:
+            handler, item = work.pop()
+            handler(item, work)
+
+    def push_block(self, statements, work):
+        work.extend((self.statement, node) for node in reversed(statements))
+
+    def statement(self, node, work):
+        getattr(self, 'compile_' + type(node).__name__)(node, work)
+
+    def patch_item(self, position, work):
+        self.patch(position)
+
+    def compile_VarDecl(self, node, work):
+        variable_type = self.text(node.type)
+        if node.value is None:
+            self.emit(op_load_const, self.constant(type_defaults[variable_type]))
+        else:
+            self.expression(node.value)
+        self.store_variable(self.text(node.name), declare=True)
+
+    def compile_Assign(self, node, work):
+        name = self.text(node.name)
+        operation = assignment_operators.get(self.text(node.op))
+        if operation:
+            self.load_variable(name)
+        self.expression(node.value)
+        if operation:
+            self.emit(op_binary, binary_codes[operation])
+        self.store_variable(name)
+
+    def compile_ExprStatement(self, node, work):
+        self.expression(node.value)
+        self.emit(op_pop)
+
+    def compile_FunctionDef(self, node, work):
+        # el cuerpo se compila aparte, después del programa principal
+        pass
+
+    def compile_If(self, node, work):
+        self.expression(node.test)
+        skip_body = self.emit(op_jump_if_false)
+        work.append((self.compile_orelse, (node.orelse, skip_body)))
+        self.push_block(node.body, work)
+
+    # después del cuerpo de un if, el elif o else que le sigue; el cuerpo salta por encima de él
+    def compile_orelse(self, item, work):
+        orelse, skip_body = item
+        if orelse is None:
+            self.patch(skip_body)
+            return
+        skip_orelse = self.emit(op_jump)
+        self.patch(skip_body)
+        work.append((self.patch_item, skip_orelse))
+        if isinstance(orelse, If):
+            work.append((self.compile_If, orelse))
+        else:
+            self.push_block(orelse.body, work)
+
+    # un else suelto (sin if antes) se acepta en el parser como un bloque más
+    def compile_Else(self, node, work):
+        self.push_block(node.body, work)
+
+    def compile_While(self, node, work):
+        loop = len(self.bytecode.code)
+        # con una condición que optimize() dejó como constante verdadera no hace falta evaluarla en cada vuelta
+        if isinstance(node.test, Constant) and literal_value(node.test.kind, node.test.text):
+            work.append((self.close_loop, (loop, None)))
+            self.push_block(node.body, work)
+            return
+        self.expression(node.test)
+        exit_jump = self.emit(op_jump_if_false)
+        work.append((self.close_loop, (loop, exit_jump)))
+        self.push_block(node.body, work)
+
+    # después del cuerpo de un ciclo se regresa a su inicio, y el salto de salida (si hay) llega a la instrucción que sigue
+    def close_loop(self, item, work):
+        loop, exit_jump = item
+        self.emit(op_jump, loop)
+        if exit_jump is not None:
+            self.patch(exit_jump)
+
+    # el estado del ciclo (valor actual, final y paso) queda en la pila mientras se ejecuta el cuerpo
+    def compile_Range(self, node, work):
+        for value in (node.start, node.end, node.step):
+            self.expression(value)
+        self.emit(op_range_init)
+        loop = self.emit(op_range_next)
+        work.append((self.close_loop, (loop, loop)))
+        self.push_block(node.body, work)
+
+    # range con un número de vueltas ya calculado: sólo se cuenta hacia atrás
+    def compile_Repeat(self, node, work):
+        self.emit(op_load_const, self.constant(node.count))
+        loop = self.emit(op_repeat_next)
+        work.append((self.close_loop, (loop, loop)))
+        self.push_block(node.body, work)
+
+    # se ejecuta sólo el primer caso igual a la variable, sin pasar a los siguientes
+    def compile_Choose(self, node, work):
+        name = self.text(node.subject)
+        exits = []
+        work.append((self.patch_exits, exits))
+        work.extend((self.compile_choose_case, (name, case, exits)) for case in reversed(node.cases))
+
+    def compile_choose_case(self, item, work):
+        name, case, exits = item
+        self.load_variable(name)
+        self.expression(case.value)
+        self.emit(op_binary, binary_codes['=='])
+        next_case = self.emit(op_jump_if_false)
+        work.append((self.end_case, (next_case, exits)))
+        self.push_block(case.body, work)
+
+    def end_case(self, item, work):
+        next_case, exits = item
+        exits.append(self.emit(op_jump))
+        self.patch(next_case)
+
+    def patch_exits(self, exits, work):
+        for position in exits:
+            self.patch(position)
+
+    def compile_Print(self, node, work):
+        self.expression(node.value)
+        self.emit(op_print)
+
+    def compile_Return(self, node, work):
+        self.expression(node.value)
+        self.emit(op_return)
+
+    # una hoja es el índice de un token o un Constant creado por optimize()
+    def leaf(self, item):
+        if isinstance(item, Constant):
+            kind, value = item.kind, item.text
+            self.line = item.line
+        else:
+            kind, value = self.tokens[item]['type'], self.text(item)
+        if kind in literal_kinds:
+            self.emit(op_load_const, self.constant(literal_value(kind, value)))
+        elif value in self.function_index:
+            self.emit(op_call, self.function_index[value])
+        else:
+            self.load_variable(value)
+
+    # compila una expresión en posorden con una pila explícita (las expresiones largas no agotan la recursión de Python);
+    # and y or se evalúan en cortocircuito
+    def expression(self, root):
+        stack = [(root, 0, 0)]
+        while stack:
+            item, state, jump = stack.pop()
+            if not isinstance(item, BinOp):
+                self.leaf(item)
+                continue
+            symbol = self.text(item.op)
+            if symbol in ('and', 'or'):
+                if state == 0:
+                    stack.append((item, 1, 0))
+                    stack.append((item.left, 0, 0))
+                elif state == 1:
+                    jump = self.emit(op_jump_if_false_or_pop if symbol == 'and' else op_jump_if_true_or_pop)
+                    stack.append((item, 2, jump))
+                    stack.append((item.right, 0, 0))
+                else:
+                    self.patch(jump)
+            elif state == 0:
+                stack.append((item, 1, 0))
+                stack.append((item.right, 0, 0))
+                stack.append((item.left, 0, 0))
+            else:
+                self.line = self.tokens[item.op]['line']
+                # el lexer acepta como arit_op algunos caracteres que no son operaciones (como '.')
+                if symbol not in binary_codes:
+                    raise CompileError(f"Compile error at line {self.line}: unknown operator '{symbol}'")
+                self.emit(op_binary, binary_codes[symbol])
+
+def compile_program(tree, tokens):
+    """Compile a Program syntax tree (its leaves index into tokens) into Bytecode"""
+    return Compiler(tokens).compile(tree)
+
+# Máquina virtual: un ciclo que lee la instrucción actual y la ejecuta con una cadena de comparaciones, ordenada para que las
+# instrucciones más frecuentes se encuentren primero. Devuelve el número de instrucciones ejecutadas
+def run_bytecode(bytecode, output=None, max_instructions=None):
+    """Execute Bytecode, writing print output to output (default stdout)"""
+    write = (output or sys.stdout).write
+    code = bytecode.code
+    constants = bytecode.constants
+    functions = bytecode.functions
+    binary = binary_functions
+    global_slots = [None] * len(bytecode.global_names)
+    slots = global_slots
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    # marcos de las funciones que se están ejecutando: a dónde regresar, sus ranuras y la altura de la pila al llamarlas
+    frames = []
+    limit = max_instructions
+    executed = 0
+    pc = 0
+    try:
+        while True:
+            opcode = code[pc]
+            argument = code[pc + 1]
+            pc += 2
+            executed += 1
+            if opcode == op_load_local:
+                value = slots[argument]
+                if value is None:
+                    raise ExecutionError("variable used before it was assigned")
+                push(value)
+            elif opcode == op_load_const:
+                push(constants[argument])
+            elif opcode == op_binary:
+                right = pop()
+                stack[-1] = binary[argument](stack[-1], right)
+            elif opcode == op_store_local:
+                slots[argument] = pop()
+            elif opcode == op_load_global:
+                value = global_slots[argument]
+                if value is None:
+                    raise ExecutionError(f"variable '{bytecode.global_names[argument]}' used before it was assigned")
+                push(value)
+            elif opcode == op_store_global:
+                global_slots[argument] = pop()
+            elif opcode == op_jump_if_false:
+                if not pop():
+                    pc = argument
+            elif opcode == op_jump:
+                # sólo los saltos hacia atrás pueden repetir código, ahí se revisa el límite de instrucciones
+                if argument < pc and limit is not None and executed > limit:
+                    raise ExecutionError(f"instruction limit of {limit} exceeded")
+                pc = argument
+            elif opcode == op_range_next:
+                state = stack[-1]
+                current = state[0]
+                if (current < state[1]) if state[2] > 0 else (current > state[1]):
+                    state[0] = current + state[2]
+                else:
+                    pop()
+                    pc = argument
+            elif opcode == op_repeat_next:
+                remaining = stack[-1]
+                if remaining:
+                    stack[-1] = remaining - 1
+                else:
+                    pop()
+                    pc = argument
+            elif opcode == op_jump_if_false_or_pop:
+                if stack[-1]:
+                    pop()
+                else:
+                    pc = argument
+            elif opcode == op_jump_if_true_or_pop:
+                if stack[-1]:
+                    pc = argument
+                else:
+                    pop()
+            elif opcode == op_pop:
+                pop()
+            elif opcode == op_print:
+                write(format_value(pop()) + '\n')
+            elif opcode == op_range_init:
+                step = pop()
+                end = pop()
+                if step == 0:
+                    raise ExecutionError("range step cannot be 0")
+                stack[-1] = [stack[-1], end, step]
+            elif opcode == op_call:
+                if len(frames) >= max_call_depth:
+                    raise ExecutionError(f"maximum call depth of {max_call_depth} exceeded")
+                _, entry, slot_count, defaults = functions[argument]
+                frames.append((pc, slots, len(stack)))
+                slots = list(defaults) + [None] * (slot_count - len(defaults))
+                pc = entry
+            elif opcode == op_return:
+                if not frames:
+                    # return en el programa principal lo termina
+                    return executed
+                value = pop()
+                pc, slots, height = frames.pop()
+                # una función que termina sin return sólo se puede llamar como sentencia, que descarta el valor
+                if value is None and code[pc] != op_pop:
+                    raise ExecutionError("function returned no value")
+                del stack[height:]
+                push(value)
+            elif opcode == op_halt:
+                return executed
+            else:
+                raise ExecutionError(f"invalid opcode {opcode}")
+    except ExecutionError as e:
+        raise ExecutionError(f"Runtime error at line {bytecode.lines[pc // 2 - 1]}: {e}") from None
+    except (ArithmeticError, TypeError, ValueError) as e:
+        if isinstance(e, ZeroDivisionError):
+            message = "division by zero"
+        elif isinstance(e, OverflowError):
+            message = "numeric overflow"
+        elif isinstance(e, ValueError):
+            # por ejemplo un entero demasiado grande para imprimirlo
+            message = str(e)
+        else:
+            message = f"invalid operands: {e}"
+        raise ExecutionError(f"Runtime error at line {bytecode.lines[pc // 2 - 1]}: {message}") from None
+
+# OPTIMIZACIÓN
+# Pasada sobre el árbol de sintaxis después del análisis: calcula las subexpresiones con sólo números y true/false (con las
+# mismas operaciones de la máquina virtual, así el resultado no cambia), simplifica las condiciones con true o false, quita
+# las ramas y ciclos que nunca se ejecutan y el código después de un return, y convierte los range con valores literales
+# enteros en un Repeat con el número de vueltas ya calculado. Se considera que leer una variable no tiene efectos, así que
+# una condición como @a < 3 or true queda en true (y ya no se reporta si @a no tenía valor o si la parte quitada se desbordaba);
+# las llamadas a funciones nunca se quitan
+numeric_kinds = ('entero', 'negativo', 'decimal', 'negativo_decimal')
+max_folded_bits = 1024
+
+# Constant con el tipo de token que le corresponde a un valor
+def constant_node(value, line):
+    if isinstance(value, bool):
+        return Constant('palabra_clave', 'true' if value else 'false', line)
+    if isinstance(value, int):
+        return Constant('entero' if value >= 0 else 'negativo', str(value), line)
+    return Constant('decimal' if value >= 0 else 'negativo_decimal', repr(value), line)
+
+class Optimizer:
+    """Constant folding and dead-code removal over a Parser(build_ast=True) tree"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.functions = set()
+        # cambios hechos, como {'line': línea, 'change': descripción}
+        self.changes = []
+
+    def note(self, line, change):
+        self.changes.append({'line': line, 'change': change})
+
+    # valor de una hoja literal (número, true o false); el segundo elemento es falso si no lo es
+    def literal(self, item):
+        if isinstance(item, Constant):
+            return literal_value(item.kind, item.text), True
+        if isinstance(item, int):
+            token = self.tokens[item]
+            if token['type'] in numeric_kinds or (token['type'] == 'palabra_clave' and token['value'] in ('true', 'false')):
+                return literal_value(token['type'], token['value']), True
+        return None, False
+
+    def line(self, item):
+        while isinstance(item, BinOp):
+            item = item.left
+        if isinstance(item, Constant):
+            return item.line
+        if isinstance(item, int):
+            return self.tokens[item]['line']
+        return 0
+
+    def source(self, item):
+        """Expression text, for the change report"""
+        if isinstance(item, Constant):
+            return item.text
+        if isinstance(item, int):
+            return self.tokens[item]['value']
+        return f"({self.source(item.left)} {self.tokens[item.op]['value']} {self.source(item.right)})"
+
+    # una expresión es pura si no llama funciones (que pueden cambiar variables o imprimir)
+    def pure(self, root):
+        stack = [root]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, BinOp):
+                stack.append(item.left)
+                stack.append(item.right)
+            elif isinstance(item, int) and self.tokens[item]['value'] in self.functions:
+                return False
+        return True
+
+    def optimize(self, program):
+        """Return the optimized Program; the changes are left in self.changes"""
+        self.functions = {self.tokens[node.name]['value'] for node in iter_nodes(program) if isinstance(node, FunctionDef)}
+        return Program(self.block(program.body))
+
+    # Simplifica una expresión en posorden con una pila explícita. En una condición (condition verdadero) sólo importa si
+    # el resultado es verdadero o falso, y eso permite quitar también un true/false que esté a la derecha de and/or
+    def expression(self, root, condition=False):
+        stack = [(root, condition, False)]
+        results = []
+        while stack:
+            item, truth_only, ready = stack.pop()
+            if not isinstance(item, BinOp):
+                results.append(item)
+                continue
+            symbol = self.tokens[item.op]['value']
+            if not ready:
+                logical = truth_only and symbol in ('and', 'or')
+                stack.append((item, truth_only, True))
+                stack.append((item.right, logical, False))
+                stack.append((item.left, logical, False))
+                continue
+            right = results.pop()
+            left = results.pop()
+            results.append(self.combine(item, symbol, left, right, truth_only))
+        return results[0]
+
+    def combine(self, item, symbol, left, right, truth_only):
+        line = self.tokens[item.op]['line']
+        left_value, left_literal = self.literal(left)
+        right_value, right_literal = self.literal(right)
+        original = f"{self.source(left)} {symbol} {self.source(right)}"
+        if symbol in ('and', 'or'):
+            # con el lado izquierdo conocido, and/or da ese valor o el del lado derecho (como en la máquina virtual)
+            if left_literal:
+                keep_left = (not left_value) if symbol == 'and' else bool(left_value)
+                result = left if keep_left else right
+                self.note(line, f"simplified {original} to {self.source(result)}")
+                return result
+            if right_literal and truth_only:
+                if bool(right_value) == (symbol == 'and'):
+                    self.note(line, f"simplified {original} to {self.source(left)}")
+                    return left
+                if self.pure(left):
+                    result = constant_node(bool(right_value), line)
+                    self.note(line, f"simplified {original} to {result.text}")
+                    return result
+        elif left_literal and right_literal and symbol in binary_codes:
+            # un operador que la máquina virtual no conoce no se calcula, el compilador lo reporta
+            try:
+                value = binary_functions[binary_codes[symbol]](left_value, right_value)
+            except (ArithmeticError, TypeError, ValueError):
+                # el error se sigue reportando al ejecutar
+                value = None
+            # los enteros enormes se dejan como expresión, su texto sería más grande que la expresión misma
+            if isinstance(value, (bool, float)) or isinstance(value, int) and value.bit_length() <= max_folded_bits:
+                result = constant_node(value, line)
+                self.note(line, f"folded {original} to {result.text}")
+                return result
+        if left is item.left and right is item.right:
+            return item
+        return BinOp(item.op, left, right)
+
+    def value(self, item):
+        # los valores de un solo token (incluyendo los textos) no cambian
+        return self.expression(item) if isinstance(item, BinOp) else item
+
+    # optimiza las sentencias con una pila explícita, como el compilador: cada elemento es la función que lo procesa y su
+    # argumento, y la versión optimizada de cada sentencia se agrega a la lista de su bloque, que ya está en el árbol nuevo
+    def block(self, statements):
+        optimized = []
+        work = []
+        self.push_block(statements, optimized, work)
+        while work:
+            handler, item = work.pop()
+            handler(item, work)
+        return optimized
+
+    # agrega a la pila las sentencias de un bloque, cuyas versiones optimizadas van a output; lo que sigue a un return nunca
+    # se ejecuta y no se agrega
+    def push_block(self, statements, output, work):
+        end = len(statements)
+        for index, node in enumerate(statements):
+            if isinstance(node, Return):
+                end = index + 1
+                break
+        if end < len(statements):
+            work.append((self.note_item, (self.line(statements[end - 1].value),
+                                          f"removed {len(statements) - end} unreachable statement(s) after return")))
+        work.extend((self.statement, (node, output)) for node in reversed(statements[:end]))
+
+    # una nota que se agrega a la pila para que quede después de las del cuerpo que se procesa antes
+    def note_item(self, item, work):
+        self.note(*item)
+
+    # agrega a output la versión optimizada de una sentencia: ninguna, una o (si se quitó un if) las de una rama
+    def statement(self, item, work):
+        node, output = item
+        kind = type(node)
+        if kind is VarDecl:
+            output.append(VarDecl(node.type, node.name, None if node.value is None else self.value(node.value)))
+        elif kind is Assign:
+            output.append(Assign(node.name, node.op, self.value(node.value)))
+        elif kind is ExprStatement:
+            value = self.value(node.value)
+            if self.pure(value):
+                self.note(self.line(value), "removed statement without effect")
+            else:
+                output.append(ExprStatement(value))
+        elif kind is If:
+            self.if_statement(node, output, work)
+        elif kind is Else:
+            branch = Else([])
+            output.append(branch)
+            self.push_block(node.body, branch.body, work)
+        elif kind is While:
+            test = self.expression(node.test, condition=True)
+            test_value, test_literal = self.literal(test)
+            if test_literal and not test_value:
+                self.note(self.line(test), "removed while loop whose condition is always false")
+            else:
+                loop = While(test, [])
+                output.append(loop)
+                self.push_block(node.body, loop.body, work)
+        elif kind is Range:
+            self.range_statement(node, output, work)
+        elif kind is Choose:
+            choose = Choose(node.subject, [])
+            output.append(choose)
+            work.extend((self.case_statement, (case, choose.cases)) for case in reversed(node.cases))
+        elif kind is FunctionDef:
+            definition = FunctionDef(node.name, node.returns, node.params, [])
+            output.append(definition)
+            self.push_block(node.body, definition.body, work)
+        elif kind is Print:
+            output.append(Print(self.value(node.value)))
+        elif kind is Return:
+            output.append(Return(self.value(node.value)))
+        else:
+            output.append(node)
+
+    def case_statement(self, item, work):
+        node, cases = item
+        case = Case(self.value(node.value), [])
+        cases.append(case)
+        self.push_block(node.body, case.body, work)
+
+    # un if con condición conocida se reemplaza por la rama que sí se ejecuta. Si no, su elif o else se optimiza antes que
+    # su cuerpo
+    def if_statement(self, node, output, work):
+        test = self.expression(node.test, condition=True)
+        test_value, test_literal = self.literal(test)
+        if not test_literal:
+            result = If(test, [], None)
+            output.append(result)
+            self.push_block(node.body, result.body, work)
+            orelse = node.orelse
+            if isinstance(orelse, Else):
+                result.orelse = Else([])
+                self.push_block(orelse.body, result.orelse.body, work)
+            elif orelse is not None:
+                branch = []
+                work.append((self.attach_branch, (result, branch)))
+                work.append((self.statement, (orelse, branch)))
+            return
+        if test_value:
+            self.note(self.line(test), "removed if whose condition is always true, kept its body"
+                      + (" and dropped its elif/else" if node.orelse is not None else ""))
+            self.push_block(node.body, output, work)
+        elif isinstance(node.orelse, If):
+            self.note(self.line(test), "removed branch whose condition is always false")
+            work.append((self.statement, (node.orelse, output)))
+        else:
+            self.note(self.line(test), "removed branch whose condition is always false")
+            if node.orelse is not None:
+                self.push_block(node.orelse.body, output, work)
+
+    # el elif pudo quedar como un if, como sentencias sueltas (se envuelven en un else) o desaparecer
+    def attach_branch(self, item, work):
+        result, branch = item
+        if not branch:
+            result.orelse = None
+        elif len(branch) == 1 and isinstance(branch[0], If):
+            result.orelse = branch[0]
+        else:
+            result.orelse = Else(branch)
+
+    def range_statement(self, node, output, work):
+        start, end, step = (self.value(item) for item in (node.start, node.end, node.step))
+        values = [self.literal(item) for item in (start, end, step)]
+        body = []
+        if all(is_literal and type(value) is int for value, is_literal in values) and values[2][0] != 0:
+            (first, _), (last, _), (step_value, _) = values
+            # vueltas del ciclo de la máquina virtual: mientras el valor no llegue al final, avanzando de step en step
+            distance = last - first if step_value > 0 else first - last
+            count = max(0, -(-distance // abs(step_value)))
+            line = self.line(start)
+            # la nota queda después de las del cuerpo
+            if count == 0:
+                work.append((self.note_item, (line, f"removed range({first}, {last}, {step_value}) that never runs")))
+            else:
+                work.append((self.note_item, (line, f"precomputed range({first}, {last}, {step_value}) as {count} "
+                                                    f"iteration(s)")))
+                output.append(Repeat(count, body))
+        else:
+            output.append(Range(start, end, step, body))
+        self.push_block(node.body, body, work)
+
+def optimize(tree, tokens):
+    """Optimize a Program syntax tree; returns (tree, changes)"""
+    optimizer = Optimizer(tokens)
+    return optimizer.optimize(tree), optimizer.changes
+
+# analiza, compila y ejecuta un código fuente; sólo se ejecuta si no tiene errores léxicos ni de sintaxis
+def run_source(text, output=None, max_instructions=None, optimize_tree=True):
+    """Analyze, optimize, compile and run source text, returning a result dict"""
+    result = lexic_analyzer(text, 'table', partial=True)
+    parser = Parser(result['tokens'], build_ast=True, recover=True)
+    result['parsed'] = parser.parse() and 'errors' not in result
+    result['syntax_errors'] = parser.errors
+    result['executed'] = False
+    if not result['parsed']:
+        return result
+    tree = parser.ast
+    if optimize_tree:
+        tree, result['optimizations'] = optimize(tree, result['tokens'])
+    try:
+        bytecode = compile_program(tree, result['tokens'])
+        result['instructions'] = run_bytecode(bytecode, output, max_instructions)
+        result['executed'] = True
+    except (CompileError, ExecutionError) as e:
+        result['runtime_error'] = str(e)
+    return result
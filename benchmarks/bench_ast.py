@@ -0,0 +1,49 @@
+"""Cost of building the syntax tree: validation-only parse vs Parser(build_ast=True).
+
+Usage: python benchmarks/bench_ast.py [repeat]
+"""
+import sys
+import time
+import tracemalloc
+
+from common import load_analyzer, sample_source
+
+analyzer = load_analyzer()
+
+# mejor tiempo de varias corridas del análisis sintáctico
+def best_time(tokens, build_ast, runs=3):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        parser = analyzer.Parser(tokens, build_ast=build_ast)
+        parsed = parser.parse()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return parser, parsed, best
+
+# memoria que queda ocupada por el árbol (se mide aparte porque tracemalloc vuelve lento el análisis)
+def retained_bytes(tokens):
+    tracemalloc.start()
+    parser = analyzer.Parser(tokens, build_ast=True)
+    parser.parse()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    tokens = analyzer.lexic_analyzer(sample_source(repeat))['tokens']
+    print(f"Tokens: {len(tokens)}")
+    _, parsed, validate_time = best_time(tokens, False)
+    parser, parsed, ast_time = best_time(tokens, True)
+    nodes = sum(1 for _ in analyzer.parser.iter_nodes(parser.ast))
+    del parser
+    retained = retained_bytes(tokens)
+    print(f"{'mode':10} {'valid':>6} {'seconds':>9} {'nodes':>9} {'nodes/s':>11} {'retained MB':>12} {'bytes/node':>11}")
+    print(f"{'validate':10} {str(parsed):>6} {validate_time:>9.3f} {'-':>9} {'-':>11} {'-':>12} {'-':>11}")
+    print(f"{'ast':10} {str(parsed):>6} {ast_time:>9.3f} {nodes:>9} {nodes / ast_time:>11.0f} "
+          f"{retained / 1e6:>12.2f} {retained / nodes:>11.1f}")
+    print(f"Tree building overhead: {(ast_time / validate_time - 1) * 100:.1f}%")
+
+if __name__ == '__main__':
+    main()
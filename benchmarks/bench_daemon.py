@@ -0,0 +1,75 @@
+"""Latency of the warm analysis daemon vs a cold CLI invocation per file.
+
+The daemon ('serve' command) is driven over stdio with JSON-RPC requests for small generated
+programs, first new ones (analyzed) and then the same ones again (served from the LRU). The cold
+path runs 'batch FILE --quiet', which starts an interpreter and compiles everything each time.
+
+Usage: python benchmarks/bench_daemon.py [requests] [cold_runs]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT
+from generator import generate_program
+
+script = os.path.join(ROOT, 'lexer+parser.py')
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def report(name, latencies):
+    ordered = sorted(latencies)
+    print(f"{name:22} {len(ordered):>6} {percentile(ordered, 0.50):>9.2f} {percentile(ordered, 0.99):>9.2f}")
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    cold_runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    # archivos del tamaño de un archivo de código que se edita, unas 50 sentencias
+    programs = [generate_program(50, seed)[0] for seed in range(requests)]
+
+    daemon = subprocess.Popen([sys.executable, script, 'serve', '--cache-size', str(requests)],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding='utf-8')
+
+    def call(request_id, method, params):
+        daemon.stdin.write(json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}) + '\n')
+        daemon.stdin.flush()
+        return json.loads(daemon.stdout.readline())
+
+    try:
+        latencies = {'daemon (new file)': [], 'daemon (cached)': []}
+        server_side = []
+        for name in latencies:
+            for index, text in enumerate(programs):
+                start = time.perf_counter()
+                response = call(index, 'diagnostics', {'text': text})
+                latencies[name].append((time.perf_counter() - start) * 1000)
+                server_side.append(response['elapsed_ms'])
+                assert response['result']['cached'] == (name == 'daemon (cached)')
+        call(-1, 'shutdown', {})
+    finally:
+        daemon.stdin.close()
+        daemon.wait()
+
+    cold = []
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(cold_runs):
+            path = os.path.join(directory, f"program{index}.txt")
+            with open(path, 'w') as file:
+                file.write(programs[index % len(programs)])
+            start = time.perf_counter()
+            subprocess.run([sys.executable, script, 'batch', path, '--quiet', '--jobs', '1'],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            cold.append((time.perf_counter() - start) * 1000)
+
+    print(f"{'path':22} {'count':>6} {'p50 ms':>9} {'p99 ms':>9}")
+    report('cold CLI', cold)
+    for name, values in latencies.items():
+        report(name, values)
+    report('  server time only', server_side)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Generated DFA lexer vs the regex engines, plus the cost of loading vs rebuilding the tables.
+
+Usage: python benchmarks/bench_dfa.py [statements]
+"""
+import sys
+import time
+
+from common import load_analyzer
+from generator import generate_program
+
+analyzer = load_analyzer()
+
+def best_time(function, runs=3):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    text, _ = generate_program(statements)
+    print(f"Source: {len(text) / 1e6:.2f} MB")
+
+    # tiempo de construir las tablas contra cargarlas del módulo generado
+    _, build_time = best_time(lambda: analyzer.lexer.build_dfa(analyzer.token_specs))
+    def load():
+        analyzer.lexer.dfa_tables = None
+        return analyzer.lexer.load_dfa_tables()
+    _, load_time = best_time(load)
+    print(f"DFA tables: build {build_time * 1e3:.1f} ms, load from dfa_tables.py {load_time * 1e3:.1f} ms")
+
+    print(f"{'engine':10} {'tokens':>9} {'seconds':>9} {'tokens/s':>11} {'MB/s':>7}")
+    lines = text.split('\n')
+    for engine in ('legacy', 'scanner', 'dfa'):
+        # el analizador original sólo acepta el código dividido en líneas
+        code = lines if engine == 'legacy' else text
+        result, elapsed = best_time(lambda: analyzer.lexic_analyzer(code, engine))
+        tokens = len(result['tokens'])
+        print(f"{engine:10} {tokens:>9} {elapsed:>9.3f} {tokens / elapsed:>11.0f} {len(text) / 1e6 / elapsed:>7.2f}")
+
+if __name__ == '__main__':
+    main()
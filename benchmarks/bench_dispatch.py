@@ -0,0 +1,70 @@
+"""Statements/s of Parser.statement with the dispatch table vs the previous chain of match() calls.
+
+Usage: python benchmarks/bench_dispatch.py [repeat]
+"""
+import sys
+import time
+
+from common import load_analyzer, sample_source
+
+analyzer = load_analyzer()
+
+# parser con la versión anterior de statement(), que prueba cada palabra clave una por una
+class ChainParser(analyzer.Parser):
+    def statement(self):
+        while self.current_token and self.current_token['type'] == 'comentario':
+            self.advance()
+            if not self.current_token:
+                return True
+        if not self.current_token:
+            return self.error("Unexpected end of file, missing 'end'")
+        next_token = self.peek()
+        if (self.current_token['type'] == 'palabra_clave' and
+                self.current_token['value'] in ('int', 'float', 'string', 'bool')):
+            if next_token and next_token['type'] == 'identificador':
+                return self.variable_declaration()
+        if self.match('palabra_clave', 'define'):
+            return self.function_declaration()
+        if self.match('palabra_clave', 'if'):
+            return self.if_statement()
+        if self.match('palabra_clave', 'while'):
+            return self.while_statement()
+        if self.match('palabra_clave', 'range'):
+            return self.range_statement()
+        if self.match('palabra_clave', 'choose'):
+            return self.choose_statement()
+        if self.match('palabra_clave', 'else'):
+            return self.else_statement()
+        if self.match('palabra_clave', 'print'):
+            return self.print_statement()
+        if self.match('palabra_clave', 'return'):
+            return self.return_statement()
+        return self.expression_statement()
+
+def best_time(parser_class, tokens, runs=5):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        parsed = parser_class(tokens).parse()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return parsed, best
+
+def count_statements(tokens):
+    parser = analyzer.Parser(tokens, build_ast=True)
+    parser.parse()
+    return sum(1 for node in analyzer.parser.iter_nodes(parser.ast)
+               if not isinstance(node, (analyzer.parser.Program, analyzer.parser.BinOp)))
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    tokens = analyzer.lexic_analyzer(sample_source(repeat))['tokens']
+    statements = count_statements(tokens)
+    print(f"Tokens: {len(tokens)}  statements: {statements}")
+    print(f"{'dispatch':10} {'valid':>6} {'seconds':>9} {'statements/s':>13}")
+    for name, parser_class in (('chain', ChainParser), ('table', analyzer.Parser)):
+        parsed, elapsed = best_time(parser_class, tokens)
+        print(f"{name:10} {str(parsed):>6} {elapsed:>9.3f} {statements / elapsed:>13.0f}")
+
+if __name__ == '__main__':
+    main()
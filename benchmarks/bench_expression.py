@@ -0,0 +1,45 @@
+"""Parse time and depth limits of Parser.expression on very long and deeply nested expressions.
+
+Usage: python benchmarks/bench_expression.py [max_terms]
+"""
+import sys
+import time
+
+from common import load_analyzer
+
+analyzer = load_analyzer()
+
+operators = ['+', '-', '*', '/', '^', '<', 'and', 'or']
+
+# expresión plana de n términos alternando operadores
+def long_expression(terms):
+    parts = ['@x0']
+    for i in range(1, terms):
+        parts.append(operators[i % len(operators)])
+        parts.append(f'@x{i % 97}' if i % 3 else str(i))
+    return ' '.join(parts)
+
+# expresión con n niveles de paréntesis anidados
+def nested_expression(depth):
+    return '(' * depth + '1' + ' + 2)' * depth
+
+def measure(code):
+    tokens = analyzer.lexic_analyzer(code)['tokens']
+    parser = analyzer.Parser(tokens)
+    start = time.perf_counter()
+    ok = parser.expression()
+    elapsed = time.perf_counter() - start
+    return ok, len(tokens), elapsed
+
+def main():
+    max_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{'shape':8} {'size':>8} {'tokens':>9} {'valid':>6} {'seconds':>9} {'tokens/s':>11}")
+    size = 1000
+    while size <= max_terms:
+        for shape, build in (('flat', long_expression), ('nested', nested_expression)):
+            ok, count, elapsed = measure(build(size))
+            print(f"{shape:8} {size:>8} {count:>9} {str(ok):>6} {elapsed:>9.3f} {count / elapsed:>11.0f}")
+        size *= 10
+
+if __name__ == '__main__':
+    main()
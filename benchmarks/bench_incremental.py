@@ -0,0 +1,44 @@
+"""Edit-to-diagnostics latency of IncrementalDocument as the file grows.
+
+Usage: python benchmarks/bench_incremental.py
+"""
+import time
+
+from common import load_analyzer
+
+analyzer = load_analyzer()
+
+# función con un cuerpo de varias sentencias, se repite para obtener archivos de distintos tamaños
+FUNCTION = """define $f{n} returns int(int @a, int @b):
+start
+    int @x = @a + {n};
+    if(@x < @b):
+    start
+        print(@x);
+    end
+    return @x;
+end"""
+
+def build(functions):
+    return '\n'.join(FUNCTION.format(n=n) for n in range(functions)).split('\n')
+
+def main():
+    print(f"{'lines':>8} {'full ms':>9} {'edit ms':>9}")
+    for functions in (100, 1000, 10000, 50000):
+        lines = build(functions)
+        start = time.perf_counter()
+        document = analyzer.IncrementalDocument(lines)
+        full = time.perf_counter() - start
+
+        # se edita repetidamente una sentencia dentro del if de la función central
+        target = (functions // 2) * 9 + 6
+        repeats = 200
+        start = time.perf_counter()
+        for index in range(repeats):
+            document.apply_edit(target, target, f"        @x = @x + {index};")
+        edit = (time.perf_counter() - start) / repeats
+        assert not document.diagnostics()['syntax_errors']
+        print(f"{len(lines):>8} {full * 1e3:>9.1f} {edit * 1e3:>9.3f}")
+
+if __name__ == '__main__':
+    main()
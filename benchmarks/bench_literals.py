@@ -0,0 +1,71 @@
+"""String and comment literals: lines with thousands of literals and multi-line literals.
+
+Each line is one print statement joining N strings with +, mixing both quote types and escapes.
+The time per literal should stay flat as N grows. For comparison, the previous texto pattern,
+(\"|\').*(\"|\'), is matched at every literal start: it runs to the end of the line and
+backtracks, so it returns one token for the whole line and its cost grows with the line length.
+
+Usage: python benchmarks/bench_literals.py [literals per line, e.g. 1000,2000,4000,8000]
+"""
+import re
+import sys
+import time
+
+from common import load_analyzer
+
+analyzer = load_analyzer()
+
+old_string_regex = re.compile(r"(\"|\').*(\"|\')")
+literal_samples = ('"plain text"', "'single quoted'", r'"escaped \"quote\" and \\ slash"', r"'tab\tand\nnewline'")
+
+def best_time(function, runs=3):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def string_line(literals):
+    return 'print(' + ' + '.join(literal_samples[index % len(literal_samples)] for index in range(literals)) + ');'
+
+# código con comentarios de bloque y cadenas que ocupan varias líneas, para el modo multiline
+def multiline_source(blocks, lines_per_block=20):
+    comment = '?* ' + '\n'.join(f"block comment line {index}" for index in range(lines_per_block)) + ' *?'
+    string = '"' + '\\n\n'.join(f"string line {index}" for index in range(lines_per_block)) + '"'
+    return '\n'.join(f"{comment}\nstring @s = {string};\nprint(@s);" for _ in range(blocks))
+
+def main():
+    sizes = [int(size) for size in sys.argv[1].split(',')] if len(sys.argv) > 1 else [1000, 2000, 4000, 8000]
+
+    print(f"{'literals':>9} {'engine':10} {'tokens':>7} {'ms':>9} {'us/literal':>11}")
+    for literals in sizes:
+        line = string_line(literals)
+        for engine in ('scanner', 'table', 'dfa', 'legacy'):
+            # el analizador original sólo acepta el código dividido en líneas
+            code = [line] if engine == 'legacy' else line
+            result, elapsed = best_time(lambda: analyzer.lexic_analyzer(code, engine))
+            if 'errors' in result:
+                raise RuntimeError(f"{engine}: {result['errors'][0]['error']}")
+            print(f"{literals:>9} {engine:10} {len(result['tokens']):>7} {elapsed * 1e3:>9.2f} "
+                  f"{elapsed / literals * 1e6:>11.3f}")
+        starts = [match.start() for match in re.finditer(r'(?<=\()["\']|(?<=\+ )["\']', line)]
+        _, elapsed = best_time(lambda: [old_string_regex.match(line, start) for start in starts], runs=1)
+        print(f"{literals:>9} {'old regex':10} {1:>7} {elapsed * 1e3:>9.2f} {elapsed / literals * 1e6:>11.3f}")
+
+    text = multiline_source(2000)
+    print(f"\nMulti-line literals: {len(text) / 1e6:.2f} MB")
+    for engine in analyzer.lexer.multiline_engines:
+        result, elapsed = best_time(lambda: analyzer.lexic_analyzer(text, engine, multiline=True))
+        if 'errors' in result:
+            raise RuntimeError(f"{engine}: {result['errors'][0]['error']}")
+        print(f"{engine:10} {len(result['tokens']):>7} tokens {elapsed * 1e3:>9.2f} ms "
+              f"{len(text) / 1e6 / elapsed:>7.2f} MB/s")
+
+    # un literal sin cerrar se reporta como tal en lugar de cortarse en el siguiente espacio
+    result = analyzer.lexic_analyzer('string @s = "never closed;', partial=True)
+    print(f"\nUnterminated literal: Line {result['errors'][0]['line']}: {result['errors'][0]['error']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Effect of the optimization pass: VM execution of literal-heavy loops and serialized tree size.
+
+Usage: python benchmarks/bench_optimizer.py [iterations] [statements]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+
+from common import load_analyzer
+from generator import generate_program
+
+analyzer = load_analyzer()
+
+# ciclo con aritmética literal, condiciones con true/false, ramas muertas y un range literal, como en los programas
+# generados
+loop_program = """
+int @i = 0;
+int @total = 0;
+int @mult = 3;
+while(@i < {n} and true):
+start
+    @i = @i + 1;
+    @total = @total + 2 * 3 + 10 / 2 - 1;
+    if(@mult < 12 or true):
+    start
+        @total = @total + 60 * 60 - 3500;
+    end
+    if(1 > 2):
+    start
+        print("never");
+    end
+    range(0, 4, 1):
+    start
+        @total ++ 1 ^ 2;
+    end
+end
+print(@total);
+"""
+
+def parse(text):
+    lexed = analyzer.lexic_analyzer(text, 'table')
+    parser = analyzer.Parser(lexed['tokens'], build_ast=True)
+    if not parser.parse():
+        raise RuntimeError(parser.errors)
+    return parser.ast, lexed['tokens']
+
+def execute(tree, tokens):
+    bytecode = analyzer.compile_program(tree, tokens)
+    output = io.StringIO()
+    start = time.perf_counter()
+    executed = analyzer.run_bytecode(bytecode, output)
+    return executed, time.perf_counter() - start, output.getvalue()
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    tree, tokens = parse(loop_program.replace('{n}', str(iterations)))
+    start = time.perf_counter()
+    optimized, changes = analyzer.optimize(tree, tokens)
+    optimize_time = time.perf_counter() - start
+    plain = execute(tree, tokens)
+    fast = execute(optimized, tokens)
+    assert plain[2] == fast[2]
+    print(f"Loop program: {len(changes)} changes in {optimize_time * 1e3:.2f} ms")
+    print(f"{'tree':10} {'instructions':>13} {'seconds':>8}")
+    print(f"{'original':10} {plain[0]:>13} {plain[1]:>8.3f}")
+    print(f"{'optimized':10} {fast[0]:>13} {fast[1]:>8.3f}  ({plain[1] / fast[1]:.2f}x faster)")
+
+    # tamaño del árbol guardado en el formato binario, para un programa generado
+    text, _ = generate_program(statements)
+    tree, tokens = parse(text)
+    start = time.perf_counter()
+    optimized, changes = analyzer.optimize(tree, tokens)
+    optimize_time = time.perf_counter() - start
+    nodes = sum(1 for _ in analyzer.parser.iter_nodes(tree))
+    optimized_nodes = sum(1 for _ in analyzer.parser.iter_nodes(optimized))
+    with tempfile.TemporaryDirectory() as directory:
+        sizes = []
+        for name, root in (('original', tree), ('optimized', optimized)):
+            path = os.path.join(directory, name + '.lxp')
+            analyzer.dump(path, {'tokens': tokens, 'ast': root})
+            sizes.append(os.path.getsize(path))
+    print(f"\nGenerated program ({statements} statements): {len(changes)} changes in {optimize_time:.2f}s")
+    encoded = [len(analyzer.serial.encode_ast(root)) * 4 / 1e3 for root in (tree, optimized)]
+    print(f"nodes {nodes} -> {optimized_nodes}, encoded tree {encoded[0]:.1f} KB -> {encoded[1]:.1f} KB, "
+          f"file {sizes[0] / 1e6:.2f} MB -> {sizes[1] / 1e6:.2f} MB")
+
+if __name__ == '__main__':
+    main()
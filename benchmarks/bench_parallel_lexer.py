@@ -0,0 +1,34 @@
+"""Sequential vs parallel lexing of one large file.
+
+Usage: python benchmarks/bench_parallel_lexer.py [repeat] [workers]
+"""
+import os
+import sys
+import time
+
+from common import load_analyzer, sample_source
+
+analyzer = load_analyzer()
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    source = sample_source(repeat)
+    print(f"Source: {len(source) / 1e6:.1f} MB, {workers} workers")
+
+    start = time.perf_counter()
+    sequential = analyzer.lexic_analyzer(source)
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = analyzer.parallel_lexic_analyzer(source, workers)
+    parallel_time = time.perf_counter() - start
+
+    assert parallel == sequential, "parallel result differs from the sequential one"
+    tokens = len(sequential['tokens'])
+    print(f"sequential: {sequential_time:.2f}s ({tokens / sequential_time:,.0f} tokens/s)")
+    print(f"parallel:   {parallel_time:.2f}s ({tokens / parallel_time:,.0f} tokens/s), "
+          f"speedup {sequential_time / parallel_time:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Semantic pass on programs with many distinct identifiers.
+
+Each program declares N distinct variables, half of them inside start ... end blocks that shadow
+an outer name, and defines a function every 100 declarations that reads its parameters and the
+globals. Only the semantic pass is timed (the source is lexed and parsed once, outside the
+measurement); the time per identifier should stay flat as N doubles.
+
+Usage: python benchmarks/bench_semantic.py [identifiers, e.g. 25000,50000,100000,200000]
+"""
+import sys
+import time
+
+from common import load_analyzer
+
+analyzer = load_analyzer()
+
+def best_time(function, runs=3):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def identifier_program(identifiers):
+    lines = ['int @v0 = 0;']
+    for index in range(1, identifiers):
+        if index % 100 == 0:
+            lines.append(f"define $f{index} returns int(int @p, float @q):")
+            lines.append('start')
+            lines.append(f"    float @r = @p * @q + @v{index - 1};")
+            lines.append(f"    return @p + @v{index - 2};")
+            lines.append('end')
+            lines.append(f"int @v{index} = $f{index};")
+        elif index % 2:
+            lines.append(f"int @v{index} = @v{index - 1} + 1;")
+        else:
+            # un bloque que declara una variable nueva y otra que oculta a la anterior
+            lines.append(f"if(@v{index - 1} > 0):")
+            lines.append('start')
+            lines.append(f"    int @v{index - 1} = 2;")
+            lines.append(f"    int @w{index} = @v{index - 1} * 2;")
+            lines.append('end')
+            lines.append(f"int @v{index} = @v{index - 1};")
+    return '\n'.join(lines)
+
+def main():
+    sizes = [int(size) for size in sys.argv[1].split(',')] if len(sys.argv) > 1 else [25000, 50000, 100000, 200000]
+
+    print(f"{'identifiers':>11} {'distinct':>9} {'symbols':>8} {'ms':>9} {'us/identifier':>14} {'growth':>7}")
+    previous = None
+    for identifiers in sizes:
+        result = analyzer.lexic_analyzer(identifier_program(identifiers), 'table')
+        parser = analyzer.Parser(result['tokens'], build_ast=True)
+        if not parser.parse():
+            raise RuntimeError(parser.errors[0])
+        checker, elapsed = best_time(lambda: analyzer.check_program(parser.ast, result['tokens']))
+        if checker.errors:
+            raise RuntimeError(checker.errors[0])
+        per_identifier = elapsed / identifiers * 1e6
+        growth = f"{per_identifier / previous:.2f}x" if previous else '-'
+        print(f"{identifiers:>11} {len(checker.names):>9} {len(checker.symbols):>8} {elapsed * 1e3:>9.1f} "
+              f"{per_identifier:>14.3f} {growth:>7}")
+        previous = per_identifier
+
+if __name__ == '__main__':
+    main()
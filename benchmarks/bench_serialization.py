@@ -0,0 +1,75 @@
+"""Binary result format vs printed token text and JSON: write/read time, size and line-range lookups.
+
+Usage: python benchmarks/bench_serialization.py [statements]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from common import load_analyzer
+from generator import generate_program
+
+analyzer = load_analyzer()
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+def write_text(path, tokens):
+    # el formato impreso que usa el modo interactivo
+    with open(path, 'w') as file:
+        for token in tokens:
+            file.write(f"Line {token['line']}: {token['type']:20} -> {token['value']}\n")
+
+def write_json(path, result):
+    with open(path, 'w') as file:
+        json.dump({key: value for key, value in result.items() if key != 'ast'}, file)
+
+def read_json(path):
+    with open(path) as file:
+        return json.load(file)
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    text, _ = generate_program(statements)
+    result = analyzer.analyze_source(text)
+    parser = analyzer.Parser(result['tokens'], build_ast=True)
+    parser.parse()
+    result['ast'] = parser.ast
+    tokens = result['tokens']
+    lines = text.count('\n')
+    print(f"Tokens: {len(tokens)}  lines: {lines}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {name: os.path.join(directory, name)
+                 for name in ('tokens.txt', 'result.json', 'result.lxp', 'result_ast.lxp')}
+        tokens_only = {key: value for key, value in result.items() if key != 'ast'}
+        _, text_write = timed(lambda: write_text(paths['tokens.txt'], tokens))
+        _, json_write = timed(lambda: write_json(paths['result.json'], result))
+        _, json_read = timed(lambda: read_json(paths['result.json']))
+        _, binary_write = timed(lambda: analyzer.dump(paths['result.lxp'], tokens_only, text))
+        loaded, binary_read = timed(lambda: analyzer.load(paths['result.lxp']))
+        assert loaded['tokens'] == tokens
+        # el árbol de sintaxis no tiene equivalente en los otros formatos, se mide aparte
+        _, ast_write = timed(lambda: analyzer.dump(paths['result_ast.lxp'], result, text))
+        _, ast_read = timed(lambda: analyzer.load(paths['result_ast.lxp']))
+
+        print(f"{'format':12} {'MB':>7} {'write s':>8} {'read s':>8}")
+        print(f"{'text':12} {os.path.getsize(paths['tokens.txt']) / 1e6:>7.2f} {text_write:>8.3f} {'-':>8}")
+        print(f"{'json':12} {os.path.getsize(paths['result.json']) / 1e6:>7.2f} {json_write:>8.3f} {json_read:>8.3f}")
+        print(f"{'binary':12} {os.path.getsize(paths['result.lxp']) / 1e6:>7.2f} {binary_write:>8.3f} "
+              f"{binary_read:>8.3f}")
+        print(f"{'binary+ast':12} {os.path.getsize(paths['result_ast.lxp']) / 1e6:>7.2f} {ast_write:>8.3f} "
+              f"{ast_read:>8.3f}")
+
+        # lectura de un rango de líneas con el lector mapeado en memoria, sin cargar el resto del archivo
+        with analyzer.TokenFile(paths['result.lxp']) as token_file:
+            middle = lines // 2
+            found, seek_time = timed(lambda: token_file.lines(middle, middle + 50))
+        print(f"Lines {middle}-{middle + 50}: {len(found)} tokens in {seek_time * 1e3:.2f} ms")
+
+if __name__ == '__main__':
+    main()
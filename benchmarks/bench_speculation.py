@@ -0,0 +1,76 @@
+"""Cost of speculative parsing (Parser.mark/reset/attempt) on adversarial inputs of doubling size.
+
+Each family puts a long expression where the parser has to choose between alternatives: print,
+return and range values, and declarations missing '=' whose probe fails at the last token and
+rewinds. Reports microseconds per token and the growth against the previous size (about 1.0x means
+linear), with the token list and the streaming mode, and with and without the packrat memo (each
+alternative is tried at most once per position, so the memo only adds its bookkeeping).
+
+Usage: python benchmarks/bench_speculation.py [max_size]
+"""
+import sys
+import time
+
+from common import load_analyzer
+
+analyzer = load_analyzer()
+
+# expresión larga con n términos y paréntesis anidados cada pocos términos
+def long_expression(terms):
+    parts = []
+    for index in range(terms):
+        if index:
+            parts.append('+' if index % 2 else '*')
+        parts.append('(' if index % 5 == 0 else '')
+        parts.append(f'@x{index % 7}' if index % 3 else str(index))
+    parts.append(')' * ((terms + 4) // 5))
+    return ' '.join(parts)
+
+def print_family(size):
+    return f"print({long_expression(size)});\n"
+
+def return_family(size):
+    return f"define $f returns int():\nstart\nreturn {long_expression(size)};\nend\n"
+
+def range_family(size):
+    expression = long_expression(size // 3 or 1)
+    return f"range({expression}, {expression}, {expression}):\nstart\nprint(@i);\nend\n"
+
+# declaración sin '=': la prueba de la expresión recorre el paréntesis sin cerrar hasta el ';' y regresa al inicio
+def probe_family(size):
+    return f"int @v ({long_expression(size)};\n"
+
+families = (('print', print_family), ('return', return_family), ('range', range_family), ('probe', probe_family))
+
+# mejor tiempo de tres corridas
+def measure(tokens, stream, memoize):
+    best = None
+    for _ in range(3):
+        parser = analyzer.Parser(iter(tokens) if stream else tokens, recover=True, memoize=memoize)
+        start = time.perf_counter()
+        parser.parse()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, parser
+
+def main():
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else 64000
+    print(f"{'family':8} {'mode':7} {'tokens':>8} {'us/token':>9} {'growth':>7} {'memo us/token':>14}")
+    for name, build in families:
+        for stream in (False, True):
+            previous = None
+            size = 1000
+            while size <= max_size:
+                tokens = analyzer.lexic_analyzer(build(size))['tokens']
+                elapsed, parser = measure(tokens, stream, False)
+                memo_elapsed, memo_parser = measure(tokens, stream, True)
+                assert parser.errors == memo_parser.errors
+                per_token = elapsed / len(tokens) * 1e6
+                growth = f"{per_token / previous:.2f}x" if previous else '-'
+                previous = per_token
+                print(f"{name:8} {'stream' if stream else 'list':7} {len(tokens):>8} {per_token:>9.2f} {growth:>7} "
+                      f"{memo_elapsed / len(tokens) * 1e6:>14.2f}")
+                size *= 2
+
+if __name__ == '__main__':
+    main()
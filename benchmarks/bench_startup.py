@@ -0,0 +1,76 @@
+"""Import time and cold start of the analyzer in fresh interpreters.
+
+Every case runs in a new Python process, like a short-lived editor or git hook invocation, and
+the best of several runs is reported next to the bare interpreter start. --compare also times a
+single-file version of the analyzer loaded by its path, for example one saved with
+git show <rev>:lexer+parser.py > old.py
+
+Usage: python benchmarks/bench_startup.py [--runs 10] [--compare old.py]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from common import ROOT
+
+example = os.path.join(ROOT, 'code1.txt')
+
+# carga por su ruta un archivo que no se puede importar por nombre (como lexer+parser.py)
+load_by_path = ("import importlib.util; spec = importlib.util.spec_from_file_location('analyzer', {path!r}); "
+                "analyzer = importlib.util.module_from_spec(spec); spec.loader.exec_module(analyzer); ")
+
+def package_cases():
+    return [
+        ('interpreter', [sys.executable, '-c', 'pass']),
+        ('import analizador', [sys.executable, '-c', 'import analizador']),
+        ('lex one line', [sys.executable, '-c', "import analizador; analizador.lexic_analyzer('int @a = 1;')"]),
+        ('analyze file', [sys.executable, '-c', f"import analizador; analizador.analyze_source(open({example!r}).read())"]),
+        ('cli batch', [sys.executable, '-m', 'analizador', 'batch', example, '--quiet', '--jobs', '1']),
+        ('lexer+parser.py batch', [sys.executable, os.path.join(ROOT, 'lexer+parser.py'), 'batch', example, '--quiet',
+                                   '--jobs', '1']),
+    ]
+
+def single_file_cases(path):
+    load = load_by_path.format(path=os.path.abspath(path))
+    return [
+        ('single file: import', [sys.executable, '-c', load]),
+        ('single file: lex one line', [sys.executable, '-c', load + "analyzer.lexic_analyzer('int @a = 1;')"]),
+        ('single file: analyze file', [sys.executable, '-c',
+                                       load + f"analyzer.analyze_source(open({example!r}).read())"]),
+        ('single file: cli batch', [sys.executable, path, 'batch', example, '--quiet', '--jobs', '1']),
+    ]
+
+# mejor tiempo de varias corridas; la primera sólo deja listos los .pyc y no se cuenta (se quita PYTHONDONTWRITEBYTECODE
+# para medir como un paquete instalado, que ya tiene su código compilado)
+def cold_start(command, runs):
+    environment = dict(os.environ, PYTHONPATH=ROOT)
+    environment.pop('PYTHONDONTWRITEBYTECODE', None)
+    subprocess.run(command, cwd=ROOT, env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument('--runs', type=int, default=10, help="runs per case (the best one is reported)")
+    argument_parser.add_argument('--compare', default=None, help="single-file analyzer to time as well")
+    arguments = argument_parser.parse_args()
+
+    cases = package_cases()
+    if arguments.compare:
+        cases += single_file_cases(arguments.compare)
+    interpreter = None
+    print(f"{'case':28} {'ms':>8} {'over interpreter ms':>20}")
+    for name, command in cases:
+        elapsed = cold_start(command, arguments.runs) * 1e3
+        interpreter = elapsed if interpreter is None else interpreter
+        print(f"{name:28} {elapsed:>8.1f} {elapsed - interpreter:>20.1f}")
+
+if __name__ == '__main__':
+    main()
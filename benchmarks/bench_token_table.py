@@ -0,0 +1,35 @@
+"""Memory and speed comparison: list of token dicts vs TokenTable.
+
+Usage: python benchmarks/bench_token_table.py [repeat]
+"""
+import sys
+import time
+import tracemalloc
+
+from common import load_analyzer, sample_source
+
+analyzer = load_analyzer()
+
+# mide el tiempo y la memoria reservada mientras se construye la tabla de tokens
+def measure(engine, code):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = analyzer.lexic_analyzer(code, engine)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result['tokens'], elapsed, current, peak
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    source = sample_source(repeat)
+    print(f"Source: {len(source) / 1e6:.2f} MB")
+    print(f"{'engine':10} {'tokens':>10} {'seconds':>9} {'retained MB':>12} {'peak MB':>9} {'bytes/token':>12}")
+    for engine in ('scanner', 'table'):
+        tokens, elapsed, current, peak = measure(engine, source)
+        print(f"{engine:10} {len(tokens):>10} {elapsed:>9.3f} {current / 1e6:>12.2f} {peak / 1e6:>9.2f} "
+              f"{current / len(tokens):>12.1f}")
+        del tokens
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Bytecode VM throughput on loop-heavy programs, in executed instructions per second.
+
+Usage: python benchmarks/bench_vm.py [scale]
+"""
+import io
+import sys
+import time
+
+from common import load_analyzer
+
+analyzer = load_analyzer()
+
+# programas con ciclos cerrados; {n} se reemplaza según la escala
+programs = {
+    'while counter': """
+int @i = 0;
+int @total = 0;
+while(@i < {n}):
+start
+    @i = @i + 1;
+    @total = @total + @i * 2 - 1;
+end
+print(@total);
+""",
+    'nested range': """
+int @total = 0;
+range(0, {root}, 1):
+start
+    range(0, {root}, 1):
+    start
+        @total ++ 3;
+    end
+end
+print(@total);
+""",
+    'choose in loop': """
+int @i = 0;
+int @hits = 0;
+while(@i < {n}):
+start
+    @i = @i + 1;
+    int @k = @i - @i / 4 * 4;
+    choose(@k):
+    start
+        case 0:
+            @hits = @hits + 1;
+        case 1:
+            @hits = @hits + 2;
+        case 2:
+            @hits = @hits - 1;
+    end
+end
+print(@hits);
+""",
+    'function calls': """
+int @calls = 0;
+int @last = 0;
+define $tick returns int():
+start
+    @calls = @calls + 1;
+    return @calls;
+end
+range(0, {n}, 1):
+start
+    @last = $tick;
+end
+print(@last);
+""",
+}
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    root = int(scale ** 0.5)
+    print(f"{'program':16} {'instructions':>13} {'seconds':>8} {'instr/s':>12} {'compile ms':>11}")
+    for name, template in programs.items():
+        text = template.replace('{n}', str(scale)).replace('{root}', str(root))
+        lexed = analyzer.lexic_analyzer(text, 'table')
+        parser = analyzer.Parser(lexed['tokens'], build_ast=True)
+        if not parser.parse():
+            raise RuntimeError(f"{name}: {parser.errors}")
+        start = time.perf_counter()
+        bytecode = analyzer.compile_program(parser.ast, lexed['tokens'])
+        compile_time = time.perf_counter() - start
+        output = io.StringIO()
+        start = time.perf_counter()
+        executed = analyzer.run_bytecode(bytecode, output)
+        elapsed = time.perf_counter() - start
+        print(f"{name:16} {executed:>13} {elapsed:>8.3f} {executed / elapsed:>12.0f} {compile_time * 1e3:>11.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+"""Helpers shared by the benchmark scripts."""
+import importlib
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# el analizador es el paquete analizador de la raíz del repositorio, se importa sin necesidad de instalarlo
+def load_analyzer():
+    """Import the analizador package from the repository root"""
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    return importlib.import_module('analizador')
+
+# código de ejemplo repetido varias veces para obtener entradas grandes
+def sample_source(repeat, file_name='code1.txt'):
+    """Return the text of an example file repeated ``repeat`` times"""
+    with open(os.path.join(ROOT, file_name), 'r') as file:
+        text = file.read()
+    return '\n'.join([text] * repeat)
@@ -0,0 +1,162 @@
+"""Seeded random program generator for the analyzer's language.
+
+The programs are valid for the current Parser: every statement kind (declarations, assignments,
+if/elif/else, while, range, choose/case, define ... returns, print, return and comments) with
+nested blocks and expressions of configurable length.
+
+Usage: python benchmarks/generator.py [statements] [seed] > program.txt
+"""
+import random
+import sys
+
+variable_types = ('int', 'float', 'string', 'bool')
+arithmetic_operators = ('+', '-', '*', '/', '^')
+comparison_operators = ('<', '>', '<>', '><', '<=', '>=')
+boolean_operators = ('and', 'or')
+words = ('hola', 'mundo', 'lexer', 'parser', 'token', 'bloque', 'valor')
+
+class ProgramGenerator:
+    """Build random programs; the same seed always gives the same program"""
+
+    def __init__(self, seed=0, max_depth=3, max_terms=8):
+        self.random = random.Random(seed)
+        self.max_depth = max_depth
+        self.max_terms = max_terms
+        self.variables = ['@a', '@b', '@c']
+        self.functions = 0
+        self.statements = 0
+
+    def number(self):
+        choice = self.random.random()
+        if choice < 0.6:
+            return str(self.random.randint(0, 999))
+        if choice < 0.8:
+            return f"{self.random.randint(0, 99)}.{self.random.randint(0, 99)}"
+        if choice < 0.9:
+            return str(-self.random.randint(1, 99))
+        return f"-{self.random.randint(0, 99)}.{self.random.randint(1, 99)}"
+
+    def operand(self):
+        if self.random.random() < 0.5:
+            return self.random.choice(self.variables)
+        return self.number()
+
+    def text(self):
+        quote = self.random.choice('"\'')
+        return quote + ' '.join(self.random.sample(words, self.random.randint(1, 3))) + quote
+
+    # expresión aritmética de varios términos, con paréntesis
+    def arithmetic(self, terms=None):
+        terms = terms or self.random.randint(1, self.max_terms)
+        parts = [self.operand()]
+        open_parens = 0
+        for _ in range(terms - 1):
+            parts.append(self.random.choice(arithmetic_operators))
+            if self.random.random() < 0.15:
+                parts.append('(')
+                open_parens += 1
+            parts.append(self.operand())
+            if open_parens and self.random.random() < 0.3:
+                parts.append(')')
+                open_parens -= 1
+        parts.extend(')' * open_parens)
+        return ' '.join(parts).replace('( ', '(').replace(' )', ')')
+
+    def condition(self):
+        parts = []
+        for index in range(self.random.randint(1, 3)):
+            if index:
+                parts.append(self.random.choice(boolean_operators))
+            if self.random.random() < 0.1:
+                parts.append(self.random.choice(('true', 'false')))
+            else:
+                parts.append(f"{self.arithmetic(2)} {self.random.choice(comparison_operators)} {self.arithmetic(2)}")
+        return ' '.join(parts)
+
+    def new_variable(self):
+        name = f"@v{len(self.variables)}"
+        self.variables.append(name)
+        return name
+
+    def block(self, depth, indent):
+        lines = [indent + 'start']
+        for _ in range(self.random.randint(1, 4)):
+            lines.extend(self.statement(depth + 1, indent + '    '))
+        lines.append(indent + 'end')
+        return lines
+
+    # devuelve las líneas de una sentencia; los bloques sólo se anidan hasta max_depth
+    def statement(self, depth=0, indent=''):
+        self.statements += 1
+        kinds = ['declaration', 'assignment', 'print', 'comment']
+        if depth < self.max_depth:
+            kinds += ['if', 'while', 'range', 'choose']
+            if depth == 0:
+                kinds.append('define')
+        kind = self.random.choice(kinds)
+        if kind == 'declaration':
+            variable_type = self.random.choice(variable_types)
+            if variable_type == 'string':
+                value = self.text()
+            elif variable_type == 'bool':
+                value = self.random.choice(('true', 'false'))
+            else:
+                value = self.arithmetic()
+            return [f"{indent}{variable_type} {self.new_variable()} = {value};"]
+        if kind == 'assignment':
+            return [f"{indent}{self.random.choice(self.variables)} = {self.arithmetic()};"]
+        if kind == 'print':
+            value = self.random.choice((self.text(), self.arithmetic(), f"({self.arithmetic()})"))
+            return [f"{indent}print({value});"]
+        if kind == 'comment':
+            self.statements -= 1
+            return [f"{indent}? {' '.join(self.random.sample(words, 3))}"]
+        if kind == 'if':
+            lines = [f"{indent}if({self.condition()}):"] + self.block(depth, indent)
+            while self.random.random() < 0.3:
+                lines.append(f"{indent}elif({self.condition()}):")
+                lines.extend(self.block(depth, indent))
+            if self.random.random() < 0.4:
+                lines.append(f"{indent}else:")
+                lines.extend(self.block(depth, indent))
+            return lines
+        if kind == 'while':
+            return [f"{indent}while({self.condition()}):"] + self.block(depth, indent)
+        if kind == 'range':
+            start, end, step = (self.operand() for _ in range(3))
+            return [f"{indent}range({start}, {end}, {step}):"] + self.block(depth, indent)
+        if kind == 'choose':
+            lines = [f"{indent}choose({self.random.choice(self.variables)}):", indent + 'start']
+            for _ in range(self.random.randint(1, 3)):
+                value = self.random.choice((self.number(), self.text(), 'true', 'false'))
+                lines.append(f"{indent}    case {value}:")
+                for _ in range(self.random.randint(1, 2)):
+                    lines.extend(self.statement(depth + 2, indent + '        '))
+            lines.append(indent + 'end')
+            return lines
+        # define
+        self.functions += 1
+        params = ', '.join(f"{self.random.choice(variable_types)} @p{i}" for i in range(self.random.randint(0, 3)))
+        return_type = self.random.choice(variable_types + ('void',))
+        lines = [f"{indent}define $f{self.functions} returns {return_type}({params}):"] + self.block(depth, indent)
+        lines.insert(-1, f"{indent}    return {self.arithmetic()};")
+        self.statements += 1
+        return lines
+
+    def program(self, statements):
+        """Return program text with about ``statements`` statements, counting nested ones"""
+        lines = []
+        while self.statements < statements:
+            lines.extend(self.statement())
+        return '\n'.join(lines) + '\n'
+
+def generate_program(statements, seed=0, **options):
+    """Return (text, statement_count) of a random program"""
+    generator = ProgramGenerator(seed, **options)
+    text = generator.program(statements)
+    return text, generator.statements
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate_program(count, seed)[0])
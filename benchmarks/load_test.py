@@ -0,0 +1,133 @@
+"""Load test for the asyncio analysis service ('service' command).
+
+Starts a local instance on a temporary Unix socket (or uses one given with --socket/--port),
+opens many concurrent connections that send pipelined 'diagnostics' requests for generated
+programs, some of them identical so they are deduplicated, and reports throughput, p50/p99
+latency and errors. It then opens connections that send large requests and disconnect right
+away, and prints the service counters (analyzed, deduplicated, cancelled, rejected...).
+
+Usage:
+    python benchmarks/load_test.py [--clients 32] [--requests 20] [--duplicates 0.3] [--workers 4]
+                                   [--queue-size 64] [--timeout 30] [--socket PATH | --port PORT]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT
+from generator import generate_program
+
+script = os.path.join(ROOT, 'lexer+parser.py')
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+async def connect(args):
+    if args.port:
+        return await asyncio.open_connection('127.0.0.1', args.port, limit=2 ** 24)
+    return await asyncio.open_unix_connection(args.socket, limit=2 ** 24)
+
+async def call(args, method, params=None):
+    reader, writer = await connect(args)
+    writer.write((json.dumps({'jsonrpc': '2.0', 'id': 0, 'method': method, 'params': params or {}}) + '\n').encode())
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    writer.close()
+    return response
+
+# un cliente: envía todas sus peticiones sin esperar respuesta (en tubería) y luego lee las respuestas
+async def client(args, programs, random_source, latencies, errors):
+    reader, writer = await connect(args)
+    sent = {}
+    for request_id in range(args.requests):
+        text = random_source.choice(programs)
+        sent[request_id] = time.perf_counter()
+        request = {'jsonrpc': '2.0', 'id': request_id, 'method': 'diagnostics',
+                   'params': {'text': text, 'timeout': args.timeout}}
+        writer.write((json.dumps(request) + '\n').encode())
+        await writer.drain()
+    for _ in range(args.requests):
+        response = json.loads(await reader.readline())
+        latencies.append((time.perf_counter() - sent[response['id']]) * 1000)
+        if 'error' in response:
+            errors[response['error']['message']] = errors.get(response['error']['message'], 0) + 1
+    writer.close()
+
+# clientes que piden un análisis grande y se desconectan sin esperar la respuesta
+async def abandon(args, text, count):
+    for index in range(count):
+        reader, writer = await connect(args)
+        writer.write((json.dumps({'jsonrpc': '2.0', 'id': index, 'method': 'analyze',
+                                  'params': {'text': text + f"\n? {index}"}}) + '\n').encode())
+        await writer.drain()
+        writer.close()
+    # espera a que el servicio note las desconexiones y descarte lo que quedó pendiente
+    for _ in range(100):
+        await asyncio.sleep(0.1)
+        if not (await call(args, 'stats'))['result']['pending']:
+            break
+
+async def run(args):
+    random_source = random.Random(args.seed)
+    # una parte de las peticiones repite programas, así hay peticiones iguales al mismo tiempo
+    distinct = max(1, int(args.clients * args.requests * (1 - args.duplicates)))
+    programs = [generate_program(args.statements, seed)[0] for seed in range(distinct)]
+    latencies = []
+    errors = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, programs, random.Random(random_source.random()), latencies, errors)
+                           for _ in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    ordered = sorted(latencies)
+    print(f"{len(ordered)} requests from {args.clients} clients in {elapsed:.2f}s "
+          f"({len(ordered) / elapsed:.0f} req/s), p50 {percentile(ordered, 0.5):.1f} ms, "
+          f"p99 {percentile(ordered, 0.99):.1f} ms")
+    for message, count in errors.items():
+        print(f"  {count} errors: {message}")
+
+    await abandon(args, generate_program(20000, -1)[0], args.workers * 2)
+    stats = (await call(args, 'stats'))['result']
+    print("Service counters: " + ', '.join(f"{key} {value}" for key, value in stats.items()))
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(description="Load test the asyncio analysis service")
+    argument_parser.add_argument('--clients', type=int, default=32)
+    argument_parser.add_argument('--requests', type=int, default=20, help="requests per client")
+    argument_parser.add_argument('--statements', type=int, default=200, help="statements per generated program")
+    argument_parser.add_argument('--duplicates', type=float, default=0.3, help="fraction of repeated programs")
+    argument_parser.add_argument('--seed', type=int, default=0)
+    argument_parser.add_argument('--workers', type=int, default=4)
+    argument_parser.add_argument('--queue-size', type=int, default=64)
+    argument_parser.add_argument('--timeout', type=float, default=30.0)
+    argument_parser.add_argument('--socket', default=None, help="socket of a running service")
+    argument_parser.add_argument('--port', type=int, default=None, help="TCP port of a running service")
+    args = argument_parser.parse_args(argv)
+
+    if args.socket or args.port:
+        asyncio.run(run(args))
+        return 0
+    with tempfile.TemporaryDirectory() as directory:
+        args.socket = os.path.join(directory, 'service.sock')
+        service = subprocess.Popen([sys.executable, script, 'service', '--socket', args.socket,
+                                    '--workers', str(args.workers), '--queue-size', str(args.queue_size)])
+        try:
+            while not os.path.exists(args.socket):
+                if service.poll() is not None:
+                    raise RuntimeError("the service exited before listening")
+                time.sleep(0.05)
+            asyncio.run(run(args))
+            asyncio.run(call(args, 'shutdown'))
+            service.wait(timeout=30)
+        finally:
+            if service.poll() is None:
+                service.kill()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
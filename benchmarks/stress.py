@@ -0,0 +1,190 @@
+"""Stress test: pathological inputs whose time and memory must grow linearly.
+
+Each case generates an adversarial source at several doubling sizes, times the analysis (best of
+--runs) and measures its peak memory with tracemalloc, then fits log(cost) = slope * log(size) + c
+by least squares. A slope of 1 is linear growth, 2 is quadratic. A case fails when its time or
+memory slope is above --threshold, when a run takes longer than --max-seconds (the larger sizes
+are not run) or when the result is not the expected one (for example a RecursionError). The exit
+status is 1 if any case failed.
+
+Usage:
+    python benchmarks/stress.py [--steps 4] [--scale 1.0] [--runs 3] [--threshold 1.3]
+                                [--max-seconds 10] [--only name,...]
+"""
+import argparse
+import io
+import math
+import sys
+import time
+import tracemalloc
+
+from common import load_analyzer
+
+analyzer = load_analyzer()
+
+# FUENTES ADVERSARIAS
+# una sola línea muy larga con sentencias válidas
+def long_line(size):
+    return ' '.join(['int @a = 10 + 2.5;'] * (size // 6))
+
+# una línea con muchos lexemas no reconocidos seguidos
+def unrecognized_line(size):
+    return ' '.join(['#x'] * size)
+
+# una línea con muchas cadenas, con escapes y de los dos tipos de comillas
+def string_line(size):
+    literals = ('"plain"', "'single'", r'"with \"escaped\" quotes"', r"'tab\t'")
+    return 'print(' + ' + '.join(literals[index % len(literals)] for index in range(size)) + ');'
+
+# muchos comentarios de bloque sin cerrar en modo multiline: cada uno buscaría el *? hasta el final del texto
+def unclosed_comments(size):
+    return '\n'.join(['?* never closed'] * size)
+
+def nested_parentheses(size):
+    return 'int @a = ' + '(' * size + '1' + ')' * size + ';'
+
+# bloques anidados muy profundo: ni el parser ni los pasos que recorren el árbol deben agotar la pila
+def deep_blocks(size):
+    return 'int @a = 1;\n' + 'if(@a < 2):\nstart\n' * size + 'print(@a);\n' + 'end\n' * size
+
+# una cadena muy larga de elif: en el árbol cada elif es el orelse del anterior
+def elif_chain(size):
+    branches = ''.join(f"elif(@a < {index}):\nstart\nprint({index});\nend\n" for index in range(size))
+    return 'int @a = 1;\nif(@a < 0):\nstart\nprint(0);\nend\n' + branches + 'else:\nstart\nprint(-1);\nend\n'
+
+# una expresión con muchos operandos: el árbol es tan profundo como la expresión es larga
+def long_expression(size):
+    return 'int @a = ' + ' + '.join(['1'] * size) + ';\nprint(@a);'
+
+# COMPROBACIONES DEL RESULTADO, reciben el resultado y el tamaño de la fuente
+def lexed(result, size):
+    return 'tokens' in result and 'errors' not in result
+
+# un error por cada lexema no reconocido o comentario sin cerrar
+def error_per_item(result, size):
+    return len(result.get('errors', ())) == size
+
+def parsed(result, size):
+    return result['parsed']
+
+def executed(result, size):
+    return result['executed']
+
+def run_quietly(text):
+    return analyzer.run_source(text, io.StringIO())
+
+# casos: (nombre, tamaño base, fuente, análisis, resultado esperado); el tamaño es el número de tokens, lexemas, cadenas,
+# niveles o comentarios según el caso. El motor 'legacy' no se incluye: es el analizador original, que corta la línea en
+# cada token, y se conserva tal cual como referencia de rendimiento (en una línea larga crece de forma cuadrática)
+cases = [
+    ('long line: scanner', 20000, long_line, lambda text: analyzer.lexic_analyzer(text, 'scanner'), lexed),
+    ('long line: table', 20000, long_line, lambda text: analyzer.lexic_analyzer(text, 'table'), lexed),
+    ('long line: dfa', 20000, long_line, lambda text: analyzer.lexic_analyzer(text, 'dfa'), lexed),
+    ('unrecognized lexemes: scanner', 10000, unrecognized_line,
+     lambda text: analyzer.lexic_analyzer(text, 'scanner', partial=True), error_per_item),
+    ('unrecognized lexemes: dfa', 10000, unrecognized_line,
+     lambda text: analyzer.lexic_analyzer(text, 'dfa', partial=True), error_per_item),
+    ('string-dense line: scanner', 5000, string_line, lambda text: analyzer.lexic_analyzer(text, 'scanner'), lexed),
+    ('string-dense line: dfa', 5000, string_line, lambda text: analyzer.lexic_analyzer(text, 'dfa'), lexed),
+    ('unclosed block comments', 5000, unclosed_comments,
+     lambda text: analyzer.lexic_analyzer(text, 'scanner', partial=True, multiline=True), error_per_item),
+    ('nested parentheses', 20000, nested_parentheses, analyzer.analyze_source, parsed),
+    ('nested blocks', 5000, deep_blocks, analyzer.analyze_source, parsed),
+    ('nested blocks: run', 5000, deep_blocks, run_quietly, executed),
+    ('nested blocks: semantic', 5000, deep_blocks, analyzer.check_source, parsed),
+    ('elif chain', 5000, elif_chain, analyzer.analyze_source, parsed),
+    ('elif chain: run', 5000, elif_chain, run_quietly, executed),
+    ('long expression: semantic', 20000, long_expression, analyzer.check_source, parsed),
+]
+
+def best_time(function, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def peak_memory(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+# pendiente de la recta de mínimos cuadrados de log(costo) contra log(tamaño)
+def scaling_slope(sizes, costs):
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(cost, 1e-9)) for cost in costs]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+# mide un caso en tamaños que se duplican; devuelve la descripción del problema, o None si escala linealmente
+def run_case(base, source, analyze, check, arguments):
+    sizes, times, memories = [], [], []
+    problem = None
+    for step in range(arguments.steps):
+        size = max(1, int(base * arguments.scale)) << step
+        text = source(size)
+        try:
+            result, elapsed = best_time(lambda: analyze(text), arguments.runs)
+        except RecursionError:
+            problem = f"RecursionError at size {size}"
+            break
+        if not check(result, size):
+            problem = f"unexpected result at size {size}"
+            break
+        memory = peak_memory(lambda: analyze(text))
+        sizes.append(size)
+        times.append(elapsed)
+        memories.append(memory)
+        print(f"  {size:>9} {elapsed * 1e3:>10.1f} ms {memory / 1e6:>9.2f} MB", flush=True)
+        if elapsed > arguments.max_seconds:
+            problem = f"{elapsed:.1f}s at size {size}, over --max-seconds"
+            break
+    if len(sizes) >= 2:
+        time_slope = scaling_slope(sizes, times)
+        memory_slope = scaling_slope(sizes, memories)
+        print(f"  slope: time {time_slope:.2f}, memory {memory_slope:.2f}")
+        if problem is None and time_slope > arguments.threshold:
+            problem = f"time grows as size^{time_slope:.2f}"
+        if problem is None and memory_slope > arguments.threshold:
+            problem = f"memory grows as size^{memory_slope:.2f}"
+    return problem
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argument_parser.add_argument('--steps', type=int, default=4, help="number of doubling sizes per case")
+    argument_parser.add_argument('--scale', type=float, default=1.0, help="multiplier for the base size of every case")
+    argument_parser.add_argument('--runs', type=int, default=3, help="runs per size (the best one is used)")
+    argument_parser.add_argument('--threshold', type=float, default=1.3, help="largest accepted log-log slope")
+    argument_parser.add_argument('--max-seconds', type=float, default=10.0, help="longest accepted single run")
+    argument_parser.add_argument('--only', default=None, help="comma-separated case names (or prefixes) to run")
+    arguments = argument_parser.parse_args()
+    if arguments.steps < 2:
+        argument_parser.error("--steps must be at least 2 to fit a slope")
+
+    selected = cases
+    if arguments.only:
+        prefixes = [prefix.strip() for prefix in arguments.only.split(',')]
+        selected = [case for case in cases if any(case[0].startswith(prefix) for prefix in prefixes)]
+
+    failures = []
+    for name, base, source, analyze, check in selected:
+        print(name)
+        problem = run_case(base, source, analyze, check, arguments)
+        if problem:
+            print(f"  FAIL: {problem}")
+            failures.append((name, problem))
+
+    print(f"\n{len(selected) - len(failures)} of {len(selected)} cases scale linearly")
+    for name, problem in failures:
+        print(f"  {name}: {problem}")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
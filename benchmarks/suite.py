@@ -0,0 +1,123 @@
+"""Benchmark suite over generated programs of several sizes.
+
+Reports lexer tokens/s, parser statements/s, end-to-end MB/s and peak memory. Results can be
+saved as a JSON baseline and compared against one; metrics that got worse than the threshold
+are flagged and the exit status is 1.
+
+Usage:
+    python benchmarks/suite.py [--sizes 1000,10000,100000] [--seed 0] [--runs 3]
+                               [--save baseline.json] [--compare baseline.json] [--threshold 0.1]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from common import load_analyzer
+from generator import generate_program
+
+analyzer = load_analyzer()
+
+baseline_version = 1
+# métricas que se reportan; para las de velocidad un valor mayor es mejor, para la memoria uno menor
+metrics = (
+    ('lexer_tokens_per_s', 'tokens/s', True),
+    ('parser_statements_per_s', 'stmts/s', True),
+    ('end_to_end_mb_per_s', 'MB/s', True),
+    ('peak_memory_mb', 'peak MB', False),
+)
+
+# mejor tiempo de varias corridas de una función
+def best_time(function, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def measure(size, seed, runs):
+    text, statements = generate_program(size, seed)
+    megabytes = len(text.encode('utf-8')) / 1e6
+    lex_result, lex_time = best_time(lambda: analyzer.lexic_analyzer(text), runs)
+    tokens = lex_result['tokens']
+    parsed, parse_time = best_time(lambda: analyzer.Parser(tokens).parse(), runs)
+    if not parsed:
+        raise RuntimeError(f"generated program (size {size}, seed {seed}) did not parse")
+    _, total_time = best_time(lambda: analyzer.analyze_source(text), runs)
+    # la memoria se mide en una corrida aparte porque tracemalloc vuelve lento el análisis
+    tracemalloc.start()
+    analyzer.analyze_source(text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'statements': statements,
+        'tokens': len(tokens),
+        'megabytes': round(megabytes, 3),
+        'lexer_tokens_per_s': len(tokens) / lex_time,
+        'parser_statements_per_s': statements / parse_time,
+        'end_to_end_mb_per_s': megabytes / total_time,
+        'peak_memory_mb': peak / 1e6,
+    }
+
+# compara contra una línea base y devuelve las métricas que empeoraron más que el umbral
+def regressions(results, baseline, threshold):
+    found = []
+    for size, current in results.items():
+        previous = baseline['results'].get(size)
+        if previous is None:
+            continue
+        for name, label, higher_is_better in metrics:
+            if name not in previous:
+                continue
+            change = (current[name] - previous[name]) / previous[name]
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                found.append((size, label, previous[name], current[name], change))
+    return found
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(description="Benchmark the analyzer on generated programs")
+    argument_parser.add_argument('--sizes', default='1000,10000,100000', help="comma-separated statement counts")
+    argument_parser.add_argument('--seed', type=int, default=0)
+    argument_parser.add_argument('--runs', type=int, default=3, help="runs per measurement, the best one is kept")
+    argument_parser.add_argument('--save', metavar='FILE', help="write the results as a JSON baseline")
+    argument_parser.add_argument('--compare', metavar='FILE', help="compare against a saved JSON baseline")
+    argument_parser.add_argument('--threshold', type=float, default=0.10,
+                                 help="relative change that counts as a regression (default 0.10)")
+    args = argument_parser.parse_args(argv)
+
+    results = {}
+    print(f"{'size':>8} {'tokens':>9} {'MB':>7} " + ' '.join(f"{label:>11}" for _, label, _ in metrics))
+    for size in (int(value) for value in args.sizes.split(',')):
+        result = measure(size, args.seed, args.runs)
+        results[str(size)] = result
+        print(f"{size:>8} {result['tokens']:>9} {result['megabytes']:>7.2f} " +
+              ' '.join(f"{result[name]:>11.2f}" if name.endswith('mb') or name.startswith('end_to_end')
+                       else f"{result[name]:>11.0f}" for name, _, _ in metrics))
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump({'version': baseline_version, 'seed': args.seed, 'python': platform.python_version(),
+                       'results': results}, file, indent=2)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline.get('version') != baseline_version or baseline.get('seed') != args.seed:
+            print("Baseline was recorded with a different format or seed, not comparable")
+            return 2
+        found = regressions(results, baseline, args.threshold)
+        for size, label, previous, current, change in found:
+            print(f"REGRESSION size {size}: {label} {previous:.2f} -> {current:.2f} ({change:+.1%})")
+        if found:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+from analizador import run_batch
+from analizador.batch import analyze_files, expand_paths
+
+
+def write_files(directory):
+    (directory / 'nested').mkdir()
+    (directory / 'good.txt').write_text('int @a = 1;\nprint(@a);\n')
+    (directory / 'nested' / 'also_good.txt').write_text('print(2);\n')
+    (directory / 'bad.txt').write_text('int @a = ;\n#x\n')
+    (directory / 'notes.md').write_text('int @a = ;\n')
+
+
+def test_expand_paths_walks_directories_and_globs(tmp_path):
+    write_files(tmp_path)
+    files = expand_paths([str(tmp_path), str(tmp_path / '*.txt')])
+    assert [path[len(str(tmp_path)) + 1:] for path in files] == ['bad.txt', 'good.txt', 'nested/also_good.txt']
+
+
+def test_batch_reports_every_file(tmp_path, capsys):
+    write_files(tmp_path)
+    for jobs, cache in ((1, None), (2, None), (2, str(tmp_path / 'cache.db'))):
+        assert run_batch([str(tmp_path)], jobs=jobs, chunksize=1, cache_path=cache) == 1
+        output = capsys.readouterr()
+        assert f"{tmp_path / 'good.txt'}: ok (10 tokens)" in output.out
+        assert f"{tmp_path / 'nested' / 'also_good.txt'}: ok (5 tokens)" in output.out
+        assert f"{tmp_path / 'bad.txt'}: lexical errors found\n  Line 2: Unrecognized token: '#x'" in output.out
+        assert "Syntax error at line 1: Expected expression or string after '='" in output.out
+        assert output.err.startswith("3 files, 1 with errors, 19 tokens")
+    assert run_batch([str(tmp_path / 'good.txt')], quiet=True) == 0
+    assert capsys.readouterr().out == ''
+    (tmp_path / 'empty').mkdir()
+    assert run_batch([str(tmp_path / 'empty')]) == 2
+
+
+def test_unreadable_files_are_reported(tmp_path, capsys):
+    summary, = analyze_files([str(tmp_path / 'missing.txt')])
+    assert summary['read_error'] and not summary['parsed']
+    assert run_batch([str(tmp_path / 'missing.txt')]) == 1
+    assert f"{tmp_path / 'missing.txt'}: cannot read file" in capsys.readouterr().out
@@ -0,0 +1,47 @@
+import inspect
+
+from analizador import AnalysisCache, analyze_source
+from analizador import cache as cache_module
+from analizador import lexer
+
+
+def test_cached_result_matches_a_fresh_analysis(tmp_path):
+    content = b"int @a = 1;\nprint(@a + 2);\n"
+    with AnalysisCache(str(tmp_path / 'cache.db')) as cache:
+        assert cache.analyze(content) == analyze_source(content.decode())
+        assert cache.analyze(content) == analyze_source(content.decode())
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_a_hit_does_not_open_a_write_transaction(tmp_path):
+    with AnalysisCache(str(tmp_path / 'cache.db')) as cache:
+        cache.analyze(b"print(1);")
+        assert cache.get(b"print(1);") is not None
+        assert not cache.connection.in_transaction
+
+
+def test_fingerprint_follows_the_module_sources(monkeypatch):
+    original = cache_module.analyzer_fingerprint()
+    getsource = inspect.getsource
+
+    def edited(module):
+        source = getsource(module)
+        return source + '\n# edited\n' if module is lexer else source
+
+    monkeypatch.setattr(cache_module.inspect, 'getsource', edited)
+    assert cache_module.analyzer_fingerprint() != original
+
+
+def test_size_bound_counts_rows_written_by_other_connections(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    programs = [f"int @v{index} = {index};\nprint(@v{index});\n".encode() for index in range(40)]
+    with AnalysisCache(path) as sizing:
+        sizing.analyze(programs[0])
+        entry = sizing.total_bytes()
+    with AnalysisCache(path, max_bytes=entry * 10) as first, AnalysisCache(path, max_bytes=entry * 10) as second:
+        for index, content in enumerate(programs):
+            (first if index % 2 else second).analyze(content)
+        assert first.total_bytes() <= entry * 10 + entry
+        # las entradas más recientes siguen guardadas y las más viejas se eliminaron
+        assert first.get(programs[-1]) is not None
+        assert first.get(programs[1]) is None
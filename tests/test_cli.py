@@ -0,0 +1,25 @@
+from analizador import main
+
+
+def test_missing_files_are_reported_without_a_traceback(tmp_path, capsys):
+    missing = str(tmp_path / 'missing.txt')
+    for command in (['run', missing], ['run', missing, '--disassemble'], ['optimize', missing], ['check', missing],
+                    ['check', missing, '--symbols'], ['dump', missing, str(tmp_path / 'out.lxp')], ['profile', missing],
+                    ['profile', missing, '--json'], ['jsonl', missing]):
+        assert main(command) == 1, command
+        output = capsys.readouterr()
+        assert output.err == f"error: {missing}: No such file or directory\n", command
+        assert output.out == ''
+
+
+def test_directories_are_reported_as_unreadable(tmp_path, capsys):
+    assert main(['run', str(tmp_path)]) == 1
+    assert capsys.readouterr().err == f"error: {tmp_path}: Is a directory\n"
+
+
+def test_dump_reports_an_output_it_cannot_write(tmp_path, capsys):
+    source = tmp_path / 'source.txt'
+    source.write_text('print(1);\n')
+    output = str(tmp_path / 'missing' / 'out.lxp')
+    assert main(['dump', str(source), output]) == 1
+    assert capsys.readouterr().err == f"error: {output}: No such file or directory\n"
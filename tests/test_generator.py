@@ -0,0 +1,18 @@
+from analizador import analyze_source
+from benchmarks.generator import generate_program
+
+
+def test_generated_programs_parse():
+    for seed in range(20):
+        text, statements = generate_program(200, seed)
+        result = analyze_source(text)
+        assert result['parsed'], (seed, result.get('errors'), result['syntax_errors'])
+        assert statements >= 200
+
+
+def test_same_seed_gives_the_same_program():
+    assert generate_program(100, 7) == generate_program(100, 7)
+    assert generate_program(100, 7)[0] != generate_program(100, 8)[0]
+    # max_depth y max_terms cambian la forma del programa, no su validez
+    text, _ = generate_program(100, 7, max_depth=6, max_terms=20)
+    assert analyze_source(text)['parsed']
@@ -0,0 +1,74 @@
+import random
+
+from analizador import IncrementalDocument, Parser, lexic_analyzer
+
+document = """int @a = 1;
+define $f returns int(int @p):
+start
+    int @x = @p + 1;
+    if(@x < 3):
+    start
+        print(@x);
+    end
+    elif(@x < 5):
+    start
+        print(5);
+    end
+    return @x;
+end
+while(@a < 3):
+start
+    @a ++ 1;
+    choose(@a):
+    start
+        case 1:
+            print("one");
+        case 2:
+            print(2);
+    end
+end
+print(@a);""".split('\n')
+
+# líneas que se insertan al azar: válidas, con errores de sintaxis o léxicos y de las que cambian la estructura de bloques
+edits = ['int @b = 2;', 'print(@b);', '@a = @a +;', 'int @c 3;', 'start', 'end', 'else:', '', '#bad', 'if(@a < 1):',
+         'elif(true):', '    print(1);', 'return 1;', 'case 3:', 'range(0, 3, 1):', '"open', '@a = (1 + 2;']
+
+
+def fresh_parse(lines):
+    lexed = lexic_analyzer(lines, partial=True)
+    return lexed, Parser(lexed['tokens']).parse()
+
+
+def test_edits_match_a_fresh_analysis():
+    for seed in range(60):
+        rng = random.Random(seed)
+        incremental = IncrementalDocument(list(document))
+        for _ in range(6):
+            first = rng.randint(1, len(incremental.lines) + 1)
+            last = rng.choice([first - 1, min(len(incremental.lines), first + rng.randint(0, 2))])
+            text = '\n'.join(rng.choice(edits) for _ in range(rng.randint(1, 3)))
+            diagnostics = incremental.apply_edit(first, last, text)
+            fresh = IncrementalDocument(list(incremental.lines))
+            assert diagnostics == fresh.diagnostics(), (seed, incremental.lines)
+            assert incremental.tokens() == fresh.tokens()
+            lexed, parsed = fresh_parse(incremental.lines)
+            assert incremental.tokens() == lexed['tokens']
+            assert (not diagnostics['syntax_errors']) == parsed, (seed, incremental.lines)
+
+
+def test_fixing_an_error_clears_it():
+    incremental = IncrementalDocument(list(document))
+    assert incremental.diagnostics() == {'errors': [], 'syntax_errors': []}
+    diagnostics = incremental.apply_edit(4, 4, '    int @x = @p +;')
+    assert diagnostics['syntax_errors'] == ["Syntax error at line 4: Expected expression or string after '='",
+                                            "Syntax error at line 4: Expected valid expression after operator"]
+    assert incremental.apply_edit(4, 4, '    int @x = @p + 2;') == {'errors': [], 'syntax_errors': []}
+
+
+def test_deleting_and_inserting_lines_shifts_later_errors():
+    incremental = IncrementalDocument(list(document))
+    incremental.apply_edit(27, 27, 'print(@a;')
+    incremental.apply_edit(1, 0, 'int @z = 0;\nint @y = 1;')
+    assert incremental.diagnostics()['syntax_errors'] == ["Syntax error at line 29: Expected ')"]
+    incremental.apply_edit(1, 2, None)
+    assert incremental.diagnostics() == IncrementalDocument(list(incremental.lines)).diagnostics()
@@ -0,0 +1,185 @@
+import glob
+import os
+import random
+
+from analizador import Parser, lexer, lexic_analyzer
+from analizador.lexer import build_dfa, load_dfa_tables, mmap_lexic_analyzer, scan_literal, string_value
+from analizador.tokens import token_specs
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# piezas con las que se arman líneas al azar: tokens de cada tipo, espacios y lexemas no reconocidos
+pieces = ['int', '@a', '@b_2', '$f', '=', '++', '--', '+', '-', '*', '/', '^', '<', '<=', '<>', '><', '==', 'and', 'or',
+          '1', '-2', '3.5', '-0.25', '"text"', "'q'", '"esc \\" q"', '(', ')', ';', ',', ':', 'true', 'print', 'start',
+          'end', '? comment', '#', '@', 'é', 'intx', ' ', '  ', '\t', '"open', 'x']
+
+
+def random_lines(seed):
+    rng = random.Random(seed)
+    return [''.join(rng.choice(pieces) + rng.choice(['', ' ']) for _ in range(rng.randint(0, 12)))
+            for _ in range(rng.randint(1, 4))]
+
+
+def lexed(lines, engine):
+    result = lexic_analyzer(lines, engine, partial=True)
+    if engine == 'table' and 'tokens' in result:
+        result['tokens'] = result['tokens'].to_dicts()
+    return result
+
+
+def test_scanner_engine_matches_the_legacy_lexer():
+    sources = [random_lines(seed) for seed in range(300)]
+    for path in sorted(glob.glob(os.path.join(root, '*.txt'))):
+        with open(path, encoding='utf-8') as file:
+            sources.append(file.read().split('\n'))
+    for lines in sources:
+        assert lexed(lines, 'scanner') == lexed(lines, 'legacy'), lines
+
+
+def mapped(tmp_path, content):
+    path = tmp_path / 'source.txt'
+    path.write_bytes(content)
+    result = mmap_lexic_analyzer(str(path))
+    if 'tokens' in result:
+        tokens = result['tokens']
+        result['tokens'] = tokens.to_dicts()
+        tokens.close()
+    return result
+
+
+def test_mmap_engine_matches_the_text_scanner_on_non_ascii_input(tmp_path):
+    sources = [
+        '@xé = 1;',
+        'int @a = 1;\nprint("ñandú €");\nprint(@a);',
+        'int\xa0@a = 2;\r\nprint(@a);',
+        'print(1);\x1cprint(2);',
+        '#ñ @b\n$fé returns',
+    ]
+    for text in sources:
+        expected = lexic_analyzer(text.split('\n'), 'scanner', partial=True)
+        result = mapped(tmp_path, text.encode('utf-8'))
+        assert result.get('errors') == expected.get('errors'), text
+        if 'tokens' in result:
+            assert result['tokens'] == expected['tokens'], text
+
+
+def test_mmap_engine_reports_a_non_ascii_lexeme_as_one_error(tmp_path):
+    assert mapped(tmp_path, '@xé'.encode('utf-8')) == lexic_analyzer(['@xé'], 'scanner')
+
+
+def test_unclosed_block_comments_report_one_error_each():
+    text = '?* a\n?* b *? int @a = 1;\n?* c\nprint(@a);'
+    for engine in ('scanner', 'table'):
+        result = lexic_analyzer(text, engine, partial=True, multiline=True)
+        assert result['errors'] == [{'line': 3, 'error': 'Unterminated block comment: ?* c'}]
+        assert [token['value'] for token in result['tokens']][:2] == ['?* a\n?* b *?', 'int']
+    result = lexic_analyzer('\n'.join(['?* never closed'] * 500), 'scanner', partial=True, multiline=True)
+    assert [error['line'] for error in result['errors']] == list(range(1, 501))
+
+
+# texto que cuenta cuántos caracteres se copian al cortarlo
+class CountingText(str):
+    copied = 0
+
+    def __getitem__(self, key):
+        value = str.__getitem__(self, key)
+        self.copied += len(value)
+        return value
+
+
+def test_scanners_slice_each_lexeme_once():
+    text = CountingText(' '.join(['int @a = 10 + 2.5;'] * 2000) + ' #x' * 100)
+    for engine in ('scanner', 'dfa'):
+        text.copied = 0
+        result = lexic_analyzer(text, engine, partial=True)
+        assert len(result['errors']) == 100
+        assert text.copied <= len(text), engine
+
+
+def test_unclosed_block_comments_are_searched_once(monkeypatch):
+    searches = []
+    scan_literal = lexer.scan_literal
+
+    def counting(text, pos, end):
+        searches.append(pos)
+        return scan_literal(text, pos, end)
+
+    monkeypatch.setattr(lexer, 'scan_literal', counting)
+    result = lexic_analyzer('\n'.join(['?* never closed'] * 500), 'scanner', partial=True, multiline=True)
+    assert len(result['errors']) == 500
+    assert searches == [0]
+
+
+def test_token_table_reads_like_the_token_dicts():
+    with open(os.path.join(root, 'code1.txt'), encoding='utf-8') as file:
+        text = file.read()
+    tokens = lexic_analyzer(text)['tokens']
+    table = lexic_analyzer(text, 'table')['tokens']
+    assert len(table) == len(tokens)
+    assert table.to_dicts() == tokens
+    assert list(table) == tokens
+    assert table[-1] == tokens[-1] and table[-1]['value'] == tokens[-1]['value']
+    assert table.type_counts() == {token_type: sum(token['type'] == token_type for token in tokens)
+                                   for token_type in {token['type'] for token in tokens}}
+    histogram = table.line_histogram()
+    assert sum(histogram) == len(tokens)
+    assert histogram[tokens[0]['line']] == sum(token['line'] == tokens[0]['line'] for token in tokens)
+
+
+def test_token_table_feeds_the_parser():
+    for seed in range(50):
+        lines = random_lines(seed)
+        listed = Parser(lexic_analyzer(lines, partial=True)['tokens'], recover=True)
+        tabled = Parser(lexic_analyzer(lines, 'table', partial=True)['tokens'], recover=True)
+        assert tabled.parse() == listed.parse()
+        assert tabled.errors == listed.errors
+
+
+def test_dfa_engine_matches_the_scanner():
+    sources = [random_lines(seed) for seed in range(300)]
+    for path in sorted(glob.glob(os.path.join(root, '*.txt'))):
+        with open(path, encoding='utf-8') as file:
+            sources.append(file.read().split('\n'))
+    for lines in sources:
+        assert lexed(lines, 'dfa') == lexed(lines, 'scanner'), lines
+
+
+def test_generated_dfa_tables_are_up_to_date():
+    # si dfa_tables.py quedó desactualizado load_dfa_tables lo ignora, así que las tablas tienen que venir del módulo
+    from analizador import dfa_tables
+    assert dfa_tables.fingerprint == build_dfa(token_specs)['fingerprint']
+    assert load_dfa_tables()['rows'] == dfa_tables.rows
+
+
+def test_literals_with_escapes_and_several_lines():
+    text = 'print("a\\"b");\nprint("x\ny");\n?* c\nd *? print(1);'
+    result = lexic_analyzer(text, partial=True, multiline=True)
+    assert 'errors' not in result
+    literals = [(token['line'], token['type'], token['value']) for token in result['tokens']
+                if token['type'] in ('texto', 'comentario')]
+    assert literals == [(1, 'texto', '"a\\"b"'), (2, 'texto', '"x\ny"'), (4, 'comentario', '?* c\nd *?')]
+    assert [token['line'] for token in result['tokens']][-5:] == [5] * 5
+    assert string_value(r'"a\\n\"\q"') == 'a\\n"\\q'
+
+
+def test_unclosed_string_reports_the_rest_of_the_line():
+    result = lexic_analyzer('print("x y);\nprint(1);', partial=True)
+    assert result['errors'] == [{'line': 1, 'error': 'Unterminated string: "x y);'}]
+    assert [token['value'] for token in result['tokens']] == ['print', '(', 'print', '(', '1', ')', ';']
+
+
+# texto que cuenta cuántos caracteres recorren sus búsquedas
+class SearchedText(str):
+    searched = 0
+
+    def find(self, sub, start, end):
+        found = str.find(self, sub, start, end)
+        self.searched += (end if found == -1 else found) - start
+        return found
+
+
+def test_string_with_many_escapes_is_scanned_in_one_pass():
+    for closed in (True, False):
+        text = SearchedText('"' + '\\"' * 20000 + ('"' if closed else ''))
+        assert scan_literal(text, 0, len(text)) == (len(text) if closed else -1)
+        assert text.searched <= 2 * len(text)
@@ -0,0 +1,23 @@
+import importlib
+import os
+import subprocess
+import sys
+
+import analizador
+
+
+def test_every_export_resolves_to_its_module():
+    for name, module in analizador.export_modules.items():
+        assert getattr(analizador, name) is getattr(importlib.import_module(f'analizador.{module}'), name)
+
+
+def test_internals_are_reached_through_their_module():
+    assert not hasattr(analizador, 'scan_source')
+    assert analizador.lexer.scan_source is importlib.import_module('analizador.lexer').scan_source
+
+
+def test_import_loads_no_submodule():
+    code = "import sys, analizador; print(sorted(name for name in sys.modules if name.startswith('analizador.')))"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+    assert output.strip() == '[]'
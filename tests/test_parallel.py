@@ -0,0 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from analizador import lexic_analyzer, parallel_lexic_analyzer
+from analizador.parallel import split_chunks
+
+text = '\n'.join(f"int @v{index} = {index} + 2.5;\n\nprint(@v{index});" for index in range(200))
+
+
+def test_chunks_cover_every_line_once():
+    lines = text.split('\n')
+    for chunks in range(1, 12):
+        for code in (text, lines):
+            pieces = split_chunks(code, chunks)
+            assert '\n'.join(piece for piece, _ in pieces) == text
+            offset = 0
+            for piece, first_line in pieces:
+                assert first_line == text.count('\n', 0, offset) + 1
+                offset += len(piece) + 1
+
+
+def test_parallel_lexing_matches_a_single_process():
+    with ThreadPoolExecutor(4) as executor:
+        for workers in range(2, 9):
+            for code in (text, text.split('\n'), text.replace('@v7 ', '#bad ')):
+                assert parallel_lexic_analyzer(code, workers, min_chunk_bytes=64, executor=executor) == \
+                    lexic_analyzer(code)
+
+
+def test_parallel_lexing_in_worker_processes():
+    assert parallel_lexic_analyzer(text, 2, min_chunk_bytes=64) == lexic_analyzer(text)
@@ -0,0 +1,272 @@
+import io
+import os
+
+import pytest
+
+from analizador import (Parser, analyze_source, analyze_stream, iter_tokens, lexic_analyzer, profile_source,
+                        run_source)
+from analizador.parser import (Else, If, Profile, build_dispatch_table, iter_nodes, statement_grammar, statement_table,
+                               symbol_codes)
+
+
+def parse(text, **options):
+    parser = Parser(lexic_analyzer(text)['tokens'], **options)
+    return parser.parse(), parser
+
+
+def nested_blocks(depth):
+    return 'int @a = 1;\n' + 'if(@a < 2):\nstart\n' * depth + 'print(@a);\n' + 'end\n' * depth
+
+
+def elif_chain(branches):
+    text = 'int @a = 1;\nif(@a < 0):\nstart\nprint(0);\nend\n'
+    text += ''.join(f"elif(@a < {index}):\nstart\nprint({index});\nend\n" for index in range(1, branches + 1))
+    return text + 'else:\nstart\nprint(-1);\nend\n'
+
+
+def test_deep_nesting_parses_without_a_limit():
+    for options in ({}, {'recover': True}, {'build_ast': True}, {'build_ast': True, 'recover': True}):
+        parsed, parser = parse(nested_blocks(2000), **options)
+        assert parsed, parser.errors
+
+
+def test_long_elif_chain_builds_a_linked_tree():
+    parsed, parser = parse(elif_chain(500), build_ast=True)
+    assert parsed, parser.errors
+    node = parser.ast.body[1]
+    branches = 0
+    while isinstance(node.orelse, If):
+        node = node.orelse
+        branches += 1
+    assert branches == 500
+    assert isinstance(node.orelse, Else)
+
+
+def test_else_followed_by_elif_is_still_accepted():
+    text = ('int @a = 1;\nif(@a < 0):\nstart\nend\nelif(@a < 1):\nstart\nend\nelse:\nstart\nend\n'
+            'elif(@a < 2):\nstart\nend\n')
+    parsed, parser = parse(text, build_ast=True)
+    assert parsed, parser.errors
+
+
+def test_error_inside_deep_nesting_is_reported_once_and_recovered():
+    text = nested_blocks(1000).replace('print(@a);', 'int @b = ;\nprint(@a);')
+    result = analyze_source(text + 'int @c = ;\n')
+    assert result['syntax_errors'] == [
+        "Syntax error at line 2002: Expected expression or string after '='",
+        "Syntax error at line 3004: Expected expression or string after '='",
+    ]
+
+
+def test_missing_end_inside_nested_blocks():
+    result = analyze_source('int @a = 1;\nwhile(@a < 2):\nstart\nif(@a < 1):\nstart\nprint(@a);\n')
+    assert result['syntax_errors'] == ["Syntax error at line unknown: Unexpected end of file, missing 'end'"]
+
+
+def test_deep_nesting_and_elif_chains_run():
+    output = io.StringIO()
+    assert run_source(nested_blocks(2000), output)['executed']
+    assert output.getvalue() == '1\n'
+    output = io.StringIO()
+    assert run_source(elif_chain(2000).replace('int @a = 1;', 'int @a = 1500;'), output)['executed']
+    assert output.getvalue() == '1501\n'
+
+
+def test_missing_equals_probe_rewinds_in_list_and_stream_modes():
+    for text, message in (('int @v 1 + 2;', "Expected = before assingment"),
+                          ('int @v (1 + 2;', "Expected ';' after declaration")):
+        tokens = lexic_analyzer(text)['tokens']
+        for source in (tokens, iter(tokens)):
+            parser = Parser(source, recover=True)
+            assert not parser.parse()
+            assert parser.errors == [f"Syntax error at line 1: {message}"]
+
+
+def test_reset_returns_to_the_mark_and_drops_later_errors():
+    tokens = lexic_analyzer('print(1 + 2);')['tokens']
+    for source in (tokens, iter(tokens)):
+        parser = Parser(source)
+        parser.advance()
+        position = parser.mark()
+        parser.advance()
+        parser.advance()
+        parser.error("probe")
+        parser.reset(position)
+        assert parser.errors == []
+        assert parser.current_token['value'] == '('
+        assert parser.marks == 0
+
+
+def test_packrat_memo_does_not_parse_a_backtracked_production_again():
+    for text, succeeds in (('1 + ;', False), ('1 + 2 * 3;', True)):
+        tokens = lexic_analyzer(text)['tokens']
+        for memoize, calls_expected in ((False, 2), (True, 1)):
+            for source in (tokens, iter(tokens)):
+                parser = Parser(source, memoize=memoize)
+                calls = []
+
+                def counting(expression=parser.expression, parser=parser):
+                    calls.append(parser.token_index)
+                    return expression()
+                parser.expression = counting
+                results = []
+                for _ in range(2):
+                    position = parser.mark()
+                    results.append((parser.attempt('expression'), parser.token_index, list(parser.expression_rpn)))
+                    parser.reset(position)
+                assert results[0] == results[1] and results[0][0] == succeeds
+                assert calls == [0] * calls_expected
+                assert parser.memo_hits == (1 if memoize else 0) and parser.errors == []
+
+
+def test_packrat_memo_keeps_the_parse_result():
+    for text in example_sources() + ['int @v 1 + 2;\nint @w (1 + 2;\nint @x = 1;']:
+        tokens = lexic_analyzer(text, partial=True)['tokens']
+        plain = Parser(tokens, build_ast=True, recover=True)
+        memoized = Parser(tokens, build_ast=True, recover=True, memoize=True)
+        assert (memoized.parse(), memoized.errors) == (plain.parse(), plain.errors)
+        assert repr(memoized.ast) == repr(plain.ast)
+
+
+def example_sources():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sources = []
+    for name in ('code1.txt', 'code2.txt', 'codigoejemplo.txt', 'codigoerror.txt'):
+        with open(os.path.join(root, name), encoding='utf-8') as file:
+            sources.append(file.read())
+    return sources + [nested_blocks(50), elif_chain(20), 'int @a = ;\nprint(@a);\nint @b 2;\nend\nprint(1);']
+
+
+def test_iter_tokens_matches_the_token_table():
+    for text in example_sources():
+        errors = []
+        tokens = list(iter_tokens(io.StringIO(text), errors))
+        result = lexic_analyzer(text, partial=True)
+        assert tokens == result['tokens']
+        assert errors == result.get('errors', [])
+
+
+def test_streaming_parser_matches_the_list_parser():
+    for text in example_sources():
+        tokens = lexic_analyzer(text, partial=True)['tokens']
+        for options in ({}, {'recover': True}, {'build_ast': True}, {'build_ast': True, 'recover': True}):
+            listed = Parser(tokens, **options)
+            streamed = Parser(iter(tokens), **options)
+            assert streamed.parse() == listed.parse()
+            assert streamed.errors == listed.errors
+            assert repr(streamed.ast) == repr(listed.ast)
+
+
+def test_analyze_stream_stops_reading_at_the_first_error():
+    def lines():
+        yield 'int @a = 1;\n'
+        yield 'int @b = ;\n'
+        yield 'print(@a);\n'
+        raise AssertionError("read past the statement after the error")
+
+    result = analyze_stream(lines())
+    assert not result['parsed']
+    assert result['syntax_errors'] == ["Syntax error at line 2: Expected expression or string after '='"]
+
+
+# escribe una expresión del árbol con todos sus paréntesis, para ver cómo quedó agrupada
+def grouped(node, tokens):
+    if isinstance(node, int):
+        return tokens[node]['value']
+    return f"({grouped(node.left, tokens)} {tokens[node.op]['value']} {grouped(node.right, tokens)})"
+
+
+def test_expressions_group_by_precedence():
+    cases = {
+        'int @a = 1 + 2 * 3 ^ 2 ^ 2 - 4;': '((1 + (2 * (3 ^ (2 ^ 2)))) - 4)',
+        'bool @a = 1 < 2 and @b or true;': '(((1 < 2) and @b) or true)',
+        'int @a = (1 + 2) * 3 / 4;': '(((1 + 2) * 3) / 4)',
+    }
+    for text, expected in cases.items():
+        tokens = lexic_analyzer(text)['tokens']
+        parser = Parser(tokens, build_ast=True)
+        assert parser.parse(), parser.errors
+        assert grouped(parser.ast.body[0].value, tokens) == expected
+
+
+def test_deeply_parenthesized_expressions_parse():
+    text = 'int @a = ' + '(' * 5000 + '1 + 2' + ')' * 5000 + ';\nprint(@a);'
+    for options in ({}, {'build_ast': True}):
+        parsed, parser = parse(text, **options)
+        assert parsed, parser.errors
+    output = io.StringIO()
+    assert run_source(text, output)['executed'] and output.getvalue() == '3\n'
+    # un paréntesis sin cerrar se reporta igual sin importar la profundidad
+    unclosed = analyze_source('int @a = ' + '(' * 5000 + '1;')['syntax_errors']
+    assert unclosed == analyze_source('int @a = ((1;')['syntax_errors']
+    assert unclosed[0] == 'Syntax error at line 1: Missing closing parenthesis'
+
+
+def test_syntax_tree_has_a_node_per_statement():
+    text = ('int @a = 1;\ndefine $f returns int(int @p):\nstart\n    return @p;\nend\nwhile(@a < 3):\nstart\n'
+            '    @a ++ 1;\nend\nrange(0, 3, 1):\nstart\n    print("x");\nend\nchoose(@a):\nstart\n    case 1:\n'
+            '        print(1);\nend\nprint($f);')
+    tokens = lexic_analyzer(text)['tokens']
+    parser = Parser(tokens, build_ast=True)
+    assert parser.parse(), parser.errors
+    assert [type(node).__name__ for node in iter_nodes(parser.ast)] == [
+        'Program', 'VarDecl', 'FunctionDef', 'Return', 'While', 'BinOp', 'Assign', 'Range', 'Print', 'Choose', 'Case',
+        'Print', 'Print']
+    # las hojas son índices en la tabla de tokens y los nodos no tienen __dict__
+    declaration = parser.ast.body[0]
+    assert [tokens[index]['value'] for index in (declaration.type, declaration.name, declaration.value)] == ['int', '@a', '1']
+    assert not any(hasattr(node, '__dict__') for node in iter_nodes(parser.ast))
+
+
+def test_parse_without_build_ast_keeps_no_tree():
+    parsed, parser = parse('int @a = 1;\nprint(@a);')
+    assert parsed and parser.ast is None
+
+
+def test_dispatch_table_covers_every_first_token():
+    for production, first_set, consume in statement_grammar:
+        for kind, value in first_set:
+            assert statement_table[symbol_codes[(kind, value)]] == (getattr(Parser, production), consume), value
+    assert statement_table[0] is None
+
+
+def test_grammar_conflicts_are_rejected():
+    conflicting = statement_grammar + (('print_statement', [('palabra_clave', 'if')], True),)
+    with pytest.raises(ValueError, match="'if' starts both if_statement and print_statement"):
+        build_dispatch_table(conflicting)
+
+
+def test_recovery_reports_every_syntax_error():
+    text = 'int @a = ;\nprint(1;\nint @b 2;\nwhile(@a < ):\nstart\nend\nprint(@a);'
+    assert analyze_source(text)['syntax_errors'] == [
+        "Syntax error at line 1: Expected expression or string after '='",
+        "Syntax error at line 2: Expected ')",
+        "Syntax error at line 3: Expected = before assingment",
+        "Syntax error at line 4: Expected valid expression after operator",
+    ]
+    # sin recuperación el análisis se detiene en el primer error
+    parsed, parser = parse(text)
+    assert not parsed and parser.errors == ["Syntax error at line 1: Expected expression or string after '='"]
+
+
+def test_recovery_stops_at_max_errors():
+    text = '\n'.join(['int @a = ;'] * 150)
+    assert len(analyze_source(text)['syntax_errors']) == 100
+    parsed, parser = parse(text, recover=True, max_errors=2)
+    assert not parsed and len(parser.errors) == 2
+
+
+def test_profile_counts_tokens_and_productions():
+    text = 'int @a = 1;\nprint(@a);\n#x\nint @b = ;'
+    profile = profile_source(text).to_dict()
+    tokens = lexic_analyzer(text, partial=True)['tokens']
+    assert profile['unrecognized'] == 1
+    assert sum(counts['matches'] for counts in profile['lexer'].values()) == len(tokens)
+    assert profile['lexer']['palabra_clave']['matches'] == 3
+    assert profile['parser']['variable_declaration'] | {'seconds': 0} == {
+        'calls': 2, 'seconds': 0, 'failures': 1, 'backtracks': 0}
+    assert profile['parser']['print_statement']['calls'] == 1
+    # un parser medido llega al mismo resultado que uno sin medir
+    measured = Profile().attach(Parser(tokens, recover=True))
+    plain = Parser(tokens, recover=True)
+    assert (measured.parse(), measured.errors) == (plain.parse(), plain.errors)
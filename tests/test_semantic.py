@@ -0,0 +1,55 @@
+from analizador import Parser, check_source, lexic_analyzer
+from analizador.semantic import check_program, global_frame
+from analizador.vm import Compiler
+
+program = """int @a = 1;
+if(@a < 2):
+start
+    int @a = 2;
+    int @b = @a;
+end
+int @c = @a;
+define $f returns int(int @p, float @q):
+start
+    int @r = @p;
+    if(@r < 1):
+    start
+        int @r = 3;
+        int @s = @r;
+    end
+    @a = @r;
+    return @p;
+end
+print($f);
+"""
+
+
+def test_slots_follow_the_compiler_allocation():
+    tokens = lexic_analyzer(program, 'table')['tokens']
+    parser = Parser(tokens, build_ast=True)
+    assert parser.parse(), parser.errors
+    analyzer = check_program(parser.ast, tokens)
+    assert analyzer.errors == []
+    compiler = Compiler(tokens)
+    bytecode = compiler.compile(parser.ast)
+
+    variables = [symbol for symbol in analyzer.symbols if symbol.kind != 'function']
+    globals_ = {analyzer.names[symbol.name]: symbol.slot for symbol in variables if symbol.frame == global_frame}
+    assert globals_ == {name: slot for slot, name in enumerate(bytecode.global_names)}
+    # la variable del bloque que oculta a @a comparte su ranura global
+    assert [symbol.slot for symbol in variables if analyzer.names[symbol.name] == '@a'] == [0, 0]
+
+    locals_ = {analyzer.names[symbol.name]: symbol.slot for symbol in variables if symbol.frame != global_frame}
+    assert locals_ == {'@p': 0, '@q': 1, '@r': 2, '@s': 3}
+    assert bytecode.functions[0][2] == len(locals_)
+
+
+def test_unknown_operator_is_reported():
+    result = check_source('int @a = 1 . 2;\nint @b = @a;')
+    assert result['parsed']
+    assert result['semantic_errors'] == ["Semantic error at line 1: unknown operator '.'"]
+
+
+def test_comparisons_and_logic_keep_their_types():
+    result = check_source('bool @a = 1 <> 2;\nbool @b = @a and true;\nint @c = 1 >< 2;')
+    assert result['semantic_errors'] == ["Semantic error at line 3: cannot assign bool to int variable '@c'"]
@@ -0,0 +1,51 @@
+import io
+import json
+import os
+
+from analizador import Parser, TokenFile, analyze_source, dump, export_jsonl, lexic_analyzer, load
+from analizador.serial import source_hash
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def example():
+    with open(os.path.join(root, 'code1.txt'), encoding='utf-8') as file:
+        return file.read()
+
+
+def test_dump_and_load_round_trip(tmp_path):
+    text = example()
+    result = analyze_source(text)
+    path = str(tmp_path / 'result.lxp')
+    dump(path, result, text)
+    loaded = load(path)
+    assert loaded.pop('source_hash') == source_hash(text).hex()
+    assert loaded == result
+
+
+def test_syntax_tree_and_token_table_round_trip(tmp_path):
+    text = example()
+    for engine in ('scanner', 'table'):
+        tokens = lexic_analyzer(text, engine)['tokens']
+        parser = Parser(tokens, build_ast=True)
+        assert parser.parse(), parser.errors
+        path = str(tmp_path / f'{engine}.lxp')
+        dump(path, {'tokens': tokens, 'ast': parser.ast})
+        loaded = load(path)
+        assert loaded['tokens'] == (tokens.to_dicts() if engine == 'table' else tokens)
+        assert repr(loaded['ast']) == repr(parser.ast)
+
+
+def test_token_file_reads_line_ranges(tmp_path):
+    text = example()
+    tokens = lexic_analyzer(text)['tokens']
+    path = str(tmp_path / 'result.lxp')
+    dump(path, {'tokens': tokens})
+    with TokenFile(path) as token_file:
+        assert len(token_file) == len(tokens)
+        assert token_file.lines(10, 20) == [token for token in tokens if 10 <= token['line'] <= 20]
+    output = io.StringIO()
+    export_jsonl(path, output)
+    lines = output.getvalue().splitlines()
+    assert json.loads(lines[0])['tokens'] == len(tokens)
+    assert [json.loads(line)['value'] for line in lines[1:]] == [token['value'] for token in tokens]
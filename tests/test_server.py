@@ -0,0 +1,173 @@
+import asyncio
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from analizador import AnalysisServer, AnalysisService, analyze_source
+from analizador import server as server_module
+from analizador.server import rpc_busy, rpc_invalid_params, rpc_method_not_found, rpc_parse_error, rpc_timeout
+
+text = 'int @a = ;\nprint(@a);\n#x\n'
+
+
+def request(method, request_id=1, **params):
+    return json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params})
+
+
+def test_server_answers_from_its_cache():
+    server = AnalysisServer()
+    expected = analyze_source(text)
+    first = json.loads(server.handle_line(request('analyze', text=text)))
+    assert first['id'] == 1
+    assert first['result'] == {'parsed': False, 'tokens': len(expected['tokens']), 'errors': expected['errors'],
+                               'syntax_errors': expected['syntax_errors'], 'cached': False}
+    tokens = json.loads(server.handle_line(request('tokens', 2, text=text)))['result']
+    assert tokens == {'tokens': expected['tokens'], 'cached': True}
+    diagnostics = json.loads(server.handle_line(request('diagnostics', 3, text=text)))['result']['diagnostics']
+    assert diagnostics == [
+        {'line': 3, 'source': 'lexer', 'message': "Unrecognized token: '#x'"},
+        {'line': 1, 'source': 'parser', 'message': "Expected expression or string after '='"},
+    ]
+    stats = json.loads(server.handle_line(request('stats', 4)))['result']
+    assert (stats['cache_entries'], stats['cache_hits'], stats['cache_misses']) == (1, 2, 1)
+    assert stats['methods']['analyze']['requests'] == 1
+
+
+def test_server_reports_protocol_errors():
+    server = AnalysisServer()
+    errors = [json.loads(server.handle_line(line)) for line in
+              ('{not json', request('compile', 5), request('analyze', 6), '{"id": 7, "method": "analyze", "params": []}')]
+    assert [(error['id'], error['error']['code']) for error in errors] == [
+        (None, rpc_parse_error), (5, rpc_method_not_found), (6, rpc_invalid_params), (7, rpc_invalid_params)]
+    # las notificaciones no llevan respuesta
+    assert server.handle_line(json.dumps({'method': 'analyze', 'params': {'text': text}})) is None
+
+
+def test_serve_stream_stops_at_shutdown(tmp_path):
+    path = tmp_path / 'source.txt'
+    path.write_text(text)
+    lines = [request('analyze', path=str(path)), '', request('shutdown', 2), request('stats', 3)]
+    output = io.StringIO()
+    AnalysisServer().serve_stream(io.StringIO('\n'.join(lines) + '\n'), output)
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [response['id'] for response in responses] == [1, 2]
+    assert responses[0]['result']['errors'] == [{'line': 3, 'error': "Unrecognized token: '#x'"}]
+
+
+# corre un cliente contra un AnalysisService con hilos en lugar de procesos, así las pruebas pueden sustituir el análisis
+def run_service(client, monkeypatch=None, analysis=None, **options):
+    if analysis is not None:
+        monkeypatch.setattr(server_module, 'analyze_content', analysis)
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=options.get('workers', 1)) as executor:
+            service = AnalysisService(executor=executor, **options)
+            server = await service.start()
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+            async def call(line):
+                writer.write((line + '\n').encode())
+                await writer.drain()
+                return json.loads(await reader.readline())
+            try:
+                return await client(service, writer, reader, call)
+            finally:
+                writer.close()
+                await service.close()
+    return asyncio.run(main())
+
+
+def test_service_answers_requests():
+    async def client(service, writer, reader, call):
+        analyzed = await call(request('analyze', text=text))
+        diagnostics = await call(request('diagnostics', 2, text=text))
+        unknown = await call(request('compile', 3, text=text))
+        stats = await call(request('stats', 4))
+        return analyzed, diagnostics, unknown, stats
+
+    analyzed, diagnostics, unknown, stats = run_service(client)
+    assert analyzed['result'] == server_module.analysis_summary(analyze_source(text))
+    assert len(diagnostics['result']['diagnostics']) == 2
+    assert unknown['error']['code'] == rpc_method_not_found
+    assert (stats['result']['requests'], stats['result']['analyzed']) == (4, 2)
+
+
+# análisis que espera a que la prueba lo deje continuar
+def blocking_analysis(release):
+    def analysis(content, view):
+        release.wait(5)
+        return server_module.analysis_views[view](analyze_source(content.decode()))
+    return analysis
+
+
+def test_identical_requests_share_one_analysis(monkeypatch):
+    release = threading.Event()
+
+    async def client(service, writer, reader, call):
+        writer.write((request('analyze', 1, text=text) + '\n' + request('analyze', 2, text=text) + '\n').encode())
+        await writer.drain()
+        while service.counts['requests'] < 2:
+            await asyncio.sleep(0.01)
+        release.set()
+        return [json.loads(await reader.readline()) for _ in range(2)], service.counts
+
+    responses, counts = run_service(client, monkeypatch, blocking_analysis(release))
+    assert sorted(response['id'] for response in responses) == [1, 2]
+    assert responses[0]['result'] == responses[1]['result']
+    assert (counts['analyzed'], counts['deduplicated']) == (1, 1)
+
+
+def test_full_queue_and_slow_analysis_are_reported(monkeypatch):
+    release = threading.Event()
+
+    async def client(service, writer, reader, call):
+        # la primera petición ocupa al trabajador y la segunda llena la cola; la tercera no encuentra lugar
+        writer.write((request('analyze', 1, text='print(1);', timeout=1.0) + '\n' +
+                      request('analyze', 2, text='print(2);') + '\n').encode())
+        await writer.drain()
+        busy = await call(request('analyze', 3, text='print(3);', timeout=0.2))
+        timed_out = json.loads(await reader.readline())
+        release.set()
+        answered = json.loads(await reader.readline())
+        return busy, timed_out, answered
+
+    busy, timed_out, answered = run_service(client, monkeypatch, blocking_analysis(release), queue_size=1)
+    assert (busy['id'], busy['error']['code']) == (3, rpc_busy)
+    assert (timed_out['id'], timed_out['error']['code']) == (1, rpc_timeout)
+    assert answered['id'] == 2 and 'result' in answered
+
+
+def test_identical_requests_waiting_for_a_full_queue_fail_together(monkeypatch):
+    release = threading.Event()
+
+    async def client(service, writer, reader, call):
+        writer.write((request('analyze', 1, text='print(1);') + '\n' + request('analyze', 2, text='print(2);') + '\n')
+                     .encode())
+        # la tercera petición espera lugar en la cola y la cuarta, igual, se une a su análisis desde otra conexión
+        writer.write((request('analyze', 3, text=text, timeout=0.3) + '\n').encode())
+        await writer.drain()
+        while service.counts['requests'] < 3:
+            await asyncio.sleep(0.01)
+        port = service.server.sockets[0].getsockname()[1]
+        other_reader, other_writer = await asyncio.open_connection('127.0.0.1', port)
+        start = time.monotonic()
+        other_writer.write((request('analyze', 4, text=text, timeout=10) + '\n').encode())
+        await other_writer.drain()
+        first = json.loads(await reader.readline())
+        second = json.loads(await other_reader.readline())
+        elapsed = time.monotonic() - start
+        other_writer.close()
+        release.set()
+        return first, second, elapsed, dict(service.counts), sorted(job.content for job in service.jobs.values())
+
+    first, second, elapsed, counts, pending = run_service(client, monkeypatch, blocking_analysis(release),
+                                                          queue_size=1)
+    assert (first['id'], first['error']['code']) == (3, rpc_busy)
+    assert (second['id'], second['error']['code']) == (4, rpc_busy)
+    assert elapsed < 2
+    assert (counts['deduplicated'], counts['rejected'], counts['cancelled']) == (1, 2, 0)
+    # el análisis que no entró a la cola ya no está pendiente
+    assert pending == [b'print(1);', b'print(2);']
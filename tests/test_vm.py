@@ -0,0 +1,130 @@
+import io
+
+from analizador import Parser, lexic_analyzer, optimize, run_source
+from analizador.parser import Repeat
+
+
+def run(text, **options):
+    output = io.StringIO()
+    result = run_source(text, output, **options)
+    return result, output.getvalue()
+
+
+def test_arithmetic_and_comparisons():
+    result, output = run('int @a = 7;\nint @b = @a * 3 - 1;\nprint(@b);\nprint(@a / 2);\nprint(2 ^ 10);\n'
+                         'float @f = @a / 2.0;\nprint(@f);\nprint(1 < 2 and 3 < 2);')
+    assert result['executed'], result
+    assert output == '20\n3\n1024\n3.5\nfalse\n'
+
+
+def test_control_flow():
+    result, output = run('int @i = 0;\nwhile(@i < 3):\nstart\nprint(@i);\n@i ++ 1;\nend\n'
+                         'range(0, 6, 2):\nstart\nprint("r");\nend\n'
+                         'if(@i < 3):\nstart\nprint(1);\nend\nelif(@i < 4):\nstart\nprint(2);\nend\n'
+                         'else:\nstart\nprint(3);\nend\n'
+                         'choose(@i):\nstart\ncase 2:\nprint("two");\ncase 3:\nprint("three");\n'
+                         'case 3:\nprint("again");\nend')
+    assert result['executed'], result
+    assert output == '0\n1\n2\nr\nr\nr\n2\nthree\n'
+
+
+def test_functions_read_and_write_globals():
+    result, output = run('int @calls = 0;\ndefine $tick returns int():\nstart\n@calls = @calls + 1;\n'
+                         'return @calls * 10;\nend\nint @x = $tick;\nint @y = $tick;\nprint(@x + @y);\n'
+                         'print(@calls);')
+    assert result['executed'], result
+    assert output == '30\n2\n'
+
+
+def test_block_variables_of_the_main_program_are_globals():
+    result, output = run('int @a = 1;\nif(@a < 2):\nstart\nint @a = 5;\nprint(@a);\nend\nprint(@a);')
+    assert output == '5\n5\n'
+
+
+def test_runtime_errors_report_the_line():
+    assert run('int @a = 0;\nprint(1 / @a);')[0]['runtime_error'] == "Runtime error at line 2: division by zero"
+    result, _ = run('define $loop returns int():\nstart\nreturn $loop;\nend\nprint($loop);')
+    assert result['runtime_error'] == "Runtime error at line 3: maximum call depth of 1000 exceeded"
+    result, _ = run('while(true):\nstart\nprint(1);\nend', max_instructions=1000)
+    assert not result['executed']
+    assert result['runtime_error'] == "Runtime error at line 3: instruction limit of 1000 exceeded"
+
+
+def test_negative_base_with_fractional_exponent_is_an_error():
+    for text in ('print(-8 ^ 0.5);', 'float @a = -8.0;\nprint(1);\nprint(@a ^ 0.5);'):
+        line = text.count('\n') + 1
+        for optimize_tree in (True, False):
+            result, output = run(text, optimize_tree=optimize_tree)
+            assert result['runtime_error'] == f"Runtime error at line {line}: invalid operands for '^'", text
+            assert 'j' not in output
+    assert run('print(-8 ^ 2);\nprint(-8.0 ^ 2.0);\nprint(4 ^ 0.5);')[1] == '64\n64.0\n2.0\n'
+
+
+def test_using_a_function_without_return_is_an_error():
+    text = 'define $f returns int():\nstart\nprint(1);\nend\nint @x = 0;\n@x = $f;\nprint(@x);'
+    result, output = run(text)
+    assert result['runtime_error'] == "Runtime error at line 6: function returned no value"
+    assert output == '1\n'
+    result, output = run(text.replace('@x = $f;', 'print($f);'))
+    assert result['runtime_error'] == "Runtime error at line 6: function returned no value"
+    assert 'None' not in output
+
+
+def test_programs_with_syntax_errors_are_not_run():
+    result, output = run('int @a = ;\nprint(1);')
+    assert not result['parsed'] and not result['executed']
+    assert output == ''
+
+
+def test_unknown_operator_is_a_compile_error():
+    source = 'int @a = 1;\nint @x = @a . 2;\nprint(@x);'
+    result = run_source(source, io.StringIO(), optimize_tree=False)
+    assert result['parsed']
+    assert not result['executed']
+    assert result['runtime_error'] == "Compile error at line 2: unknown operator '.'"
+
+
+def test_unknown_operator_is_not_folded():
+    result = run_source('int @x = 4 . 2;\nprint(@x);', io.StringIO())
+    assert result['optimizations'] == []
+    assert result['runtime_error'] == "Compile error at line 1: unknown operator '.'"
+
+
+def optimized(text):
+    tokens = lexic_analyzer(text, 'table')['tokens']
+    parser = Parser(tokens, build_ast=True)
+    assert parser.parse(), parser.errors
+    return optimize(parser.ast, tokens)
+
+
+def test_optimizer_folds_and_removes_dead_code():
+    tree, changes = optimized('int @a = 2 * 3 + 1;\nprint(@a);')
+    assert [change['change'] for change in changes] == ['folded 2 * 3 to 6', 'folded 6 + 1 to 7']
+    tree, changes = optimized('if(false):\nstart\nprint(1);\nend\nelse:\nstart\nprint(2);\nend\n'
+                              'while(false):\nstart\nprint(3);\nend')
+    assert [type(node).__name__ for node in tree.body] == ['Print']
+    tree, changes = optimized('range(0, 10, 3):\nstart\nprint(1);\nend')
+    assert isinstance(tree.body[0], Repeat) and tree.body[0].count == 4
+    tree, changes = optimized('define $f returns int():\nstart\nreturn 1;\nprint(9);\nend\nprint($f);')
+    assert len(tree.body[0].body) == 1
+
+
+def test_optimized_programs_print_the_same_output():
+    sources = [
+        'int @a = 2 * 3 + 1;\nprint(@a);\nprint(@a / 2 ^ 2);',
+        'int @a = 1;\nif(@a < 3 or true):\nstart\nprint(1);\nend\nelif(false):\nstart\nprint(2);\nend',
+        'range(0, 10, 3):\nstart\nrange(5, 0, -2):\nstart\nprint(1);\nend\nend',
+        'define $f returns float(float @x):\nstart\nreturn 1 / 2.0 + @x;\nprint(9);\nend\nprint($f);',
+        'int @n = 2;\nchoose(@n):\nstart\ncase 1 + 1:\nprint("two");\ncase 2:\nprint("again");\nend',
+    ]
+    for text in sources:
+        plain, plain_output = run(text, optimize_tree=False)
+        fast, fast_output = run(text)
+        assert plain['executed'] and fast['executed'], text
+        assert fast_output == plain_output, text
+        assert fast['instructions'] <= plain['instructions'], text
+
+
+def test_folding_keeps_runtime_errors():
+    for text in ('print(10 ^ 100000);', 'print(1 / 0);'):
+        assert run(text)[0]['runtime_error'] == run(text, optimize_tree=False)[0]['runtime_error'], text